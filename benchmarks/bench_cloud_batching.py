@@ -0,0 +1,42 @@
+"""Completed cloud calls under a fixed rate limit, with and without micro-batching.
+
+Run with: PYTHONPATH=src python benchmarks/bench_cloud_batching.py
+
+Fires bursts of concurrent `complete` calls at a client limited to
+`RATE_LIMIT` requests per minute and counts how many succeed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from jarvis_assistant.cloud.client import CloudClient
+
+RATE_LIMIT = 30
+BURSTS = 40
+BURST_SIZE = 12
+
+
+async def measure(batch_window_seconds: float) -> tuple[int, int, float]:
+    client = CloudClient(timeout_seconds=5.0, max_per_minute=RATE_LIMIT, batch_window_seconds=batch_window_seconds)
+    completed = 0
+    start = time.perf_counter()
+    for burst in range(BURSTS):
+        results = await asyncio.gather(
+            *(client.complete(f"burst {burst} prompt {i}", provider="openai") for i in range(BURST_SIZE)),
+            return_exceptions=True,
+        )
+        completed += sum(not isinstance(result, BaseException) for result in results)
+    return completed, BURSTS * BURST_SIZE, time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'batch_window_ms':>15} {'completed':>10} {'attempted':>10} {'seconds':>8}")
+    for window in (0.0, 0.005, 0.02):
+        completed, attempted, seconds = asyncio.run(measure(window))
+        print(f"{window * 1000:>15.0f} {completed:>10} {attempted:>10} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
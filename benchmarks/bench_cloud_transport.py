@@ -0,0 +1,91 @@
+"""Cloud completion throughput and latency with and without connection reuse.
+
+Run with: PYTHONPATH=src python benchmarks/bench_cloud_transport.py
+
+Talks to the local StubProviderServer, which adds `HANDSHAKE_SECONDS` to
+every new connection (standing in for TCP+TLS setup to a remote provider)
+and `LATENCY_SECONDS` plus jitter to every request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from jarvis_assistant.cloud.client import CloudClient
+from jarvis_assistant.cloud.stub_server import StubProviderServer
+from jarvis_assistant.cloud.transport import HttpRequest, HttpTransport
+
+REQUESTS = 400
+CONCURRENCY = 16
+HANDSHAKE_SECONDS = 0.03
+LATENCY_SECONDS = 0.01
+JITTER_SECONDS = 0.005
+
+
+async def measure(server: StubProviderServer, transport: HttpTransport) -> tuple[float, float, float]:
+    client = CloudClient(timeout_seconds=10.0, max_per_minute=REQUESTS * 2, endpoint=server.url, transport=transport)
+    slots = asyncio.Semaphore(CONCURRENCY)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        async with slots:
+            start = time.perf_counter()
+            await client.complete(f"prompt {index}", provider="stub")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    latencies.sort()
+    return REQUESTS / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+async def measure_pipelined(server: StubProviderServer, depth: int) -> tuple[float, float, float]:
+    """Same number of requests in flight as `measure`, on CONCURRENCY / depth connections."""
+
+    transport = HttpTransport(max_connections_per_host=CONCURRENCY // depth)
+    slots = asyncio.Semaphore(CONCURRENCY // depth)
+    latencies: list[float] = []
+
+    async def batch(offset: int) -> None:
+        requests = [
+            HttpRequest("POST", f"{server.url}/v1/complete", f'{{"prompt": "prompt {offset + i}"}}'.encode())
+            for i in range(depth)
+        ]
+        async with slots:
+            start = time.perf_counter()
+            await transport.pipeline(requests)
+            latencies.extend([(time.perf_counter() - start) * 1000] * depth)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(batch(offset) for offset in range(0, REQUESTS, depth)))
+    elapsed = time.perf_counter() - start
+    transport.close()
+    latencies.sort()
+    return REQUESTS / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+async def main() -> None:
+    server = StubProviderServer(
+        latency_seconds=LATENCY_SECONDS, jitter_seconds=JITTER_SECONDS, handshake_seconds=HANDSHAKE_SECONDS, seed=0
+    )
+    async with server:
+        runs = {
+            "connection per call": lambda: measure(server, HttpTransport(CONCURRENCY, max_idle_per_host=0)),
+            "pooled keep-alive": lambda: measure(server, HttpTransport(CONCURRENCY)),
+            "pipelined depth=4": lambda: measure_pipelined(server, depth=4),
+        }
+        print(f"{'transport':<22} {'req_per_s':>10} {'p50_ms':>8} {'p99_ms':>8} {'connections':>12}")
+        for name, run in runs.items():
+            opened = server.connections
+            throughput, p50, p99 = await run()
+            print(f"{name:<22} {throughput:>10.0f} {p50:>8.2f} {p99:>8.2f} {server.connections - opened:>12}")
+    # Let the transports' closed sockets finish tearing down before the loop stops.
+    await asyncio.sleep(0.05)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""Measures cloud prompt assembly from the in-memory context ring buffer.
+
+Compares reading history back from SQLite and re-tokenizing it on every
+request with packing pre-tokenized turns from `ContextAssembler`.
+
+Run with: PYTHONPATH=src python benchmarks/bench_context_assembly.py
+"""
+
+from __future__ import annotations
+
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.memory.context_assembler import ContextAssembler, make_turn
+from jarvis_assistant.memory.store import MemoryStore
+
+REQUESTS = 500
+HISTORY_SIZES = (64, 256, 1_024)
+QUERY = "remind me what we decided about the deployment pipeline rollback"
+
+
+def sqlite_assembly(store: MemoryStore, limit: int, budget: int) -> str:
+    turns = [make_turn(row["text"], row["result"].get("message", "")) for row in store.recent_interactions(limit)]
+    kept: list[str] = []
+    for turn in reversed(turns):
+        if turn.tokens > budget:
+            break
+        kept.append(turn.rendered)
+        budget -= turn.tokens
+    return "\n".join(reversed(kept)) + f"\n\nUser: {QUERY}"
+
+
+def percentile_us(samples: list[float], pct: float) -> float:
+    return statistics.quantiles(samples, n=100)[int(pct) - 1] * 1e6
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(AppConfig(sqlite_path=Path(tmp) / "memory.db"))
+        history = [
+            (f"request {i} about the {'deployment pipeline' if i % 17 == 0 else 'weather'}", f"answer number {i}")
+            for i in range(max(HISTORY_SIZES))
+        ]
+        store.write_batch([(text, "general_reasoning", {"message": reply}) for text, reply in history], {})
+        for size in HISTORY_SIZES:
+            assembler = ContextAssembler(max_turns=size, token_budget=384)
+            assembler.warm(store.recent_interactions(size))
+            for name, build in (
+                ("sqlite", lambda: sqlite_assembly(store, size, 384)),
+                ("ring", lambda: assembler.build_prompt(QUERY)),
+            ):
+                samples = []
+                for _ in range(REQUESTS):
+                    started = time.perf_counter()
+                    build()
+                    samples.append(time.perf_counter() - started)
+                print(
+                    f"turns={size:<5} {name:<6} p50_us={percentile_us(samples, 50):8.1f} "
+                    f"p99_us={percentile_us(samples, 99):8.1f}"
+                )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Per-intent handle_text latency with and without the compiled-plan fast path.
+
+Run with: PYTHONPATH=src python benchmarks/bench_fast_path.py
+
+Process launching is stubbed out so `open_app` measures pipeline overhead only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import jarvis_assistant.automation.executor as executor_module
+from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.core.container import ServiceContainer
+
+REQUESTS = 300
+SAMPLES = {
+    "open_app": "open browser",
+    "close_app": "close editor",
+    "create_reminder": "remind me to stretch",
+}
+
+
+def build_config(root: Path, fast_path: bool) -> AppConfig:
+    return AppConfig(
+        log_level="WARNING",
+        log_file=root / "jarvis.log",
+        sqlite_path=root / "memory.db",
+        request_rate_limit_per_minute=1_000_000,
+        automation_rate_limit_per_minute=1_000_000,
+        plugin_rate_limit_per_minute=1_000_000,
+        fast_path_enabled=fast_path,
+    )
+
+
+async def measure(container: ServiceContainer, text: str) -> tuple[float, float]:
+    assistant = container.build_assistant()
+    latencies = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        await assistant.handle_text(text)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main() -> None:
+    executor_module.subprocess = SimpleNamespace(Popen=lambda args: None)  # type: ignore[assignment]
+    print(f"{'intent':<16} {'before_p50_us':>14} {'after_p50_us':>13} {'before_p99_us':>14} {'after_p99_us':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for intent, text in SAMPLES.items():
+            row = []
+            for fast_path in (False, True):
+                container = ServiceContainer(build_config(Path(tmp) / f"{intent}-{fast_path}", fast_path))
+                row.append(asyncio.run(measure(container, text)))
+                container.shutdown()
+            (before_p50, before_p99), (after_p50, after_p99) = row
+            print(f"{intent:<16} {before_p50:>14.1f} {after_p50:>13.1f} {before_p99:>14.1f} {after_p99:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
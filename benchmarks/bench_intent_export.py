@@ -0,0 +1,77 @@
+"""Compares the eager IntentClassifier with its dropout-folded, int8-quantized TorchScript export.
+
+Run with: PYTHONPATH=src python benchmarks/bench_intent_export.py
+"""
+
+from __future__ import annotations
+
+import time
+
+import torch
+from torch import nn
+
+from jarvis_assistant.ai.intent_model import IntentClassifier, export_for_inference, train_step
+
+INPUT_DIM = 512
+HIDDEN_DIM = 256
+NUM_CLASSES = 12
+SAMPLES = 4_096
+ITERATIONS = 200
+
+
+def synthetic_dataset(generator: torch.Generator) -> tuple[torch.Tensor, torch.Tensor]:
+    centers = torch.randn(NUM_CLASSES, INPUT_DIM, generator=generator)
+    labels = torch.randint(0, NUM_CLASSES, (SAMPLES,), generator=generator)
+    features = centers[labels] + 0.8 * torch.randn(SAMPLES, INPUT_DIM, generator=generator)
+    return features, labels
+
+
+def accuracy(model: nn.Module, features: torch.Tensor, labels: torch.Tensor) -> float:
+    with torch.inference_mode():
+        return float((model(features).argmax(dim=-1) == labels).float().mean())
+
+
+def latency_us(model: nn.Module, batch: torch.Tensor) -> float:
+    with torch.inference_mode():
+        for _ in range(20):
+            model(batch)
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            model(batch)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def main() -> None:
+    torch.set_num_threads(1)
+    generator = torch.Generator().manual_seed(0)
+    features, labels = synthetic_dataset(generator)
+    split = SAMPLES * 3 // 4
+
+    eager = IntentClassifier(INPUT_DIM, HIDDEN_DIM, NUM_CLASSES)
+    optimizer = torch.optim.Adam(eager.parameters(), lr=1e-3)
+    for _ in range(5):
+        for start in range(0, split, 128):
+            train_step(eager, features[start : start + 128], labels[start : start + 128], optimizer)
+    eager.eval()
+
+    candidates: dict[str, nn.Module] = {
+        "eager_fp32": eager,
+        "frozen_fp32": export_for_inference(eager, quantize=False),
+        "frozen_int8": export_for_inference(eager, quantize=True),
+    }
+    test_x, test_y = features[split:], labels[split:]
+    with torch.inference_mode():
+        reference = eager(test_x).argmax(dim=-1)
+
+    print(f"{'model':<12} {'accuracy':>9} {'agreement':>10} {'b1_us':>8} {'b32_us':>8}")
+    for name, model in candidates.items():
+        with torch.inference_mode():
+            agreement = float((model(test_x).argmax(dim=-1) == reference).float().mean())
+        print(
+            f"{name:<12} {accuracy(model, test_x, test_y):>9.4f} {agreement:>10.4f} "
+            f"{latency_us(model, test_x[:1]):>8.1f} {latency_us(model, test_x[:32]):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Parse throughput of the compiled rule matcher versus a per-rule regex loop.
+
+Run with: PYTHONPATH=src python benchmarks/bench_intent_matcher.py
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import time
+
+from jarvis_assistant.ai.intent_matcher import Rule
+from jarvis_assistant.ai.nlp_engine import NLPEngine
+
+RULE_COUNTS = (10, 1_000, 10_000)
+QUERIES = 2_000
+
+
+def build_rules(count: int, rng: random.Random) -> list[Rule]:
+    rules = []
+    for i in range(count):
+        if i % 10 == 0:
+            pattern = rf"verb{i}\s+(?P<target>\w+)"
+        else:
+            pattern = rf"\b(kw{i}a|kw{i}b)\b"
+        rules.append(Rule(pattern=pattern, intent=f"intent_{i}", priority=rng.randint(0, 3)))
+    return rules
+
+
+def legacy_parse(rules: list[Rule], text: str) -> str:
+    normalized = text.lower().strip()
+    for rule in rules:
+        if re.search(rule.pattern, normalized):
+            return rule.intent
+    return "general_reasoning"
+
+
+def main() -> None:
+    rng = random.Random(42)
+    logger = logging.getLogger("bench")
+    logger.disabled = True
+    print(f"{'rules':>7} {'legacy_qps':>12} {'compiled_qps':>13} {'speedup':>8}")
+    for count in RULE_COUNTS:
+        rules = build_rules(count, rng)
+        ordered = sorted(rules, key=lambda rule: rule.priority)
+        engine = NLPEngine(logger, rules=rules)
+        queries = [
+            f"please kw{rng.randrange(count)}a the thing" if rng.random() < 0.7 else "tell me something interesting"
+            for _ in range(QUERIES)
+        ]
+        legacy_queries = queries[: max(50, QUERIES // max(1, count // 100))]
+
+        start = time.perf_counter()
+        for query in legacy_queries:
+            legacy_parse(ordered, query)
+        legacy_qps = len(legacy_queries) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for query in queries:
+            engine.parse(query)
+        compiled_qps = len(queries) / (time.perf_counter() - start)
+        print(f"{count:>7} {legacy_qps:>12.0f} {compiled_qps:>13.0f} {compiled_qps / legacy_qps:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
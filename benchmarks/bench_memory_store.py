@@ -0,0 +1,125 @@
+"""Compares concurrent MemoryStore read/write throughput before and after SQLite tuning.
+
+"before" is the previous store layout: one connection behind a lock with
+default pragmas (rollback journal, synchronous=FULL, no mmap). "after" is
+MemoryStore with its default WAL, synchronous=NORMAL, mmap and pooled
+reader connections. Reader threads fetch recent history and a preference,
+alone and next to a writer thread committing single interactions.
+
+Run with: PYTHONPATH=src python benchmarks/bench_memory_store.py
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.memory.store import MemoryStore
+
+SECONDS = 2.0
+READERS = 4
+SEED_ROWS = 5_000
+
+
+class SingleConnectionStore:
+    """The pre-tuning store: a single default-configured connection serialized by a lock."""
+
+    def __init__(self, path: Path) -> None:
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("CREATE TABLE interactions (id INTEGER PRIMARY KEY AUTOINCREMENT, text, intent, result)")
+        self.conn.execute("CREATE TABLE preferences (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+    def write_batch(self, interactions: list[tuple[str, str, dict[str, Any]]], preferences: dict[str, str]) -> None:
+        rows = [(text, intent, json.dumps(result)) for text, intent, result in interactions]
+        with self._lock, self.conn:
+            self.conn.executemany("INSERT INTO interactions(text, intent, result) VALUES (?, ?, ?)", rows)
+            self.conn.executemany("INSERT OR REPLACE INTO preferences(key, value) VALUES (?, ?)", preferences.items())
+
+    def add_interaction(self, text: str, intent: str, result: dict[str, Any]) -> None:
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO interactions(text, intent, result) VALUES (?, ?, ?)", (text, intent, json.dumps(result))
+            )
+            self.conn.commit()
+
+    def recent_interactions(self, limit: int = 20) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT text, intent, result FROM interactions ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [
+            {"text": text, "intent": intent, "result": json.loads(result)} for text, intent, result in reversed(rows)
+        ]
+
+    def get_preference(self, key: str) -> str | None:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM preferences WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def run(name: str, store: Any, writes: bool) -> None:
+    store.write_batch(
+        [(f"seed request {i}", "general_reasoning", {"message": f"answer {i}"}) for i in range(SEED_ROWS)],
+        {"last_tone": "neutral"},
+    )
+    stop = threading.Event()
+    counts = {"writes": 0}
+    read_latencies: list[float] = []
+    lock = threading.Lock()
+
+    def writer() -> None:
+        done = 0
+        while not stop.is_set():
+            store.add_interaction(f"request {done}", "general_reasoning", {"message": "ok"})
+            done += 1
+        with lock:
+            counts["writes"] += done
+
+    def reader() -> None:
+        latencies = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            store.recent_interactions(20)
+            store.get_preference("last_tone")
+            latencies.append(time.perf_counter() - started)
+        with lock:
+            read_latencies.extend(latencies)
+
+    threads = [threading.Thread(target=reader) for _ in range(READERS)]
+    if writes:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    store.close()
+    read_latencies.sort()
+    p99_us = read_latencies[int(len(read_latencies) * 0.99)] * 1e6
+    print(
+        f"{name:<7} writer={'on' if writes else 'off':<3} reads_per_s={len(read_latencies) / SECONDS:8.0f} "
+        f"read_p99_us={p99_us:8.0f} writes_per_s={counts['writes'] / SECONDS:7.0f}"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for writes in (False, True):
+            run("before", SingleConnectionStore(Path(tmp) / f"before-{writes}.db"), writes)
+            run("after", MemoryStore(AppConfig(sqlite_path=Path(tmp) / f"after-{writes}.db")), writes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compares the legacy multi-dispatch analysis path with the shared analysis stage.
+
+Run with: PYTHONPATH=src python benchmarks/bench_text_analysis.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from jarvis_assistant.ai.emotion import EmotionalToneDetector
+from jarvis_assistant.ai.nlp_engine import NLPEngine
+from jarvis_assistant.ai.reasoning import ReasoningEngine
+from jarvis_assistant.ai.text_analysis import analyze_text
+from jarvis_assistant.runtime.worker_pool import AsyncWorkerPool
+
+REQUESTS = 5_000
+SAMPLES = [
+    "open terminal",
+    "thanks, please remind me now to call the bank",
+    "what's the weather like in Berlin this afternoon",
+    "I'm stressed, explain how the deployment pipeline rolls back a failed release",
+]
+
+
+async def legacy(
+    pool: AsyncWorkerPool, nlp: NLPEngine, tone: EmotionalToneDetector, reasoning: ReasoningEngine
+) -> None:
+    for i in range(REQUESTS):
+        text = SAMPLES[i % len(SAMPLES)]
+        intent = await pool.run_cpu(nlp.parse, text)
+        tone.detect(text)
+        tone.detect_urgency_and_stress(text)
+        await pool.run_cpu(reasoning.estimate_complexity, text, intent)
+
+
+async def shared(
+    pool: AsyncWorkerPool, nlp: NLPEngine, tone: EmotionalToneDetector, reasoning: ReasoningEngine
+) -> None:
+    def stage(text: str) -> None:
+        features = analyze_text(text)
+        intent = nlp.parse(text, features)
+        tone.detect(text, features)
+        tone.detect_urgency_and_stress(text, features)
+        reasoning.estimate_complexity(text, intent, features)
+
+    for i in range(REQUESTS):
+        await pool.run_cpu(stage, SAMPLES[i % len(SAMPLES)])
+
+
+def measure(name: str, runner, *args) -> tuple[float, float]:
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    asyncio.run(runner(*args))
+    cpu_us = (time.process_time() - cpu_start) / REQUESTS * 1e6
+    wall_us = (time.perf_counter() - wall_start) / REQUESTS * 1e6
+    print(f"{name:<8} cpu_per_request_us={cpu_us:8.1f} latency_per_request_us={wall_us:8.1f}")
+    return cpu_us, wall_us
+
+
+def main() -> None:
+    logger = logging.getLogger("bench")
+    logger.disabled = True
+    pool = AsyncWorkerPool(max_workers=2)
+    nlp = NLPEngine(logger)
+    tone = EmotionalToneDetector()
+    reasoning = ReasoningEngine(router=None, logger=logger)  # type: ignore[arg-type]
+    try:
+        old_cpu, old_wall = measure("legacy", legacy, pool, nlp, tone, reasoning)
+        new_cpu, new_wall = measure("shared", shared, pool, nlp, tone, reasoning)
+    finally:
+        pool.shutdown()
+    print(f"saved    cpu_per_request_us={old_cpu - new_cpu:8.1f} latency_per_request_us={old_wall - new_wall:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
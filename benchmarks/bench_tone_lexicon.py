@@ -0,0 +1,56 @@
+"""Tone scoring latency with a 50k-term lexicon: single-text and batched.
+
+Run with: PYTHONPATH=src python benchmarks/bench_tone_lexicon.py
+"""
+
+from __future__ import annotations
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from jarvis_assistant.ai.emotion import DEFAULT_LEXICON_PATH, EmotionalToneDetector, load_lexicon
+
+LEXICON_TERMS = 50_000
+TEXTS = 2_000
+BATCH_SIZE = 256
+
+
+def write_lexicon(path: Path, rng: random.Random) -> list[str]:
+    terms = [f"term{i}" for i in range(LEXICON_TERMS)]
+    lines = [DEFAULT_LEXICON_PATH.read_text(encoding="utf-8")]
+    lines.extend(f"{term}\t{rng.uniform(-1, 1):.3f}\t{rng.random():.3f}\t{rng.random():.3f}" for term in terms)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return terms
+
+
+def main() -> None:
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "lexicon.tsv"
+        terms = write_lexicon(path, rng)
+        start = time.perf_counter()
+        detector = EmotionalToneDetector(load_lexicon(path))
+        load_ms = (time.perf_counter() - start) * 1e3
+
+    vocab = [*terms[:5_000], "not", "very", "the", "please", "deploy", "now", "thanks"]
+    texts = [" ".join(rng.choices(vocab, k=rng.randint(4, 30))) for _ in range(TEXTS)]
+
+    start = time.perf_counter()
+    for text in texts:
+        detector.score(text)
+    single_us = (time.perf_counter() - start) / TEXTS * 1e6
+
+    detector.detect_batch(texts[:BATCH_SIZE])
+    start = time.perf_counter()
+    for offset in range(0, TEXTS, BATCH_SIZE):
+        detector.detect_batch(texts[offset : offset + BATCH_SIZE])
+    batch_us = (time.perf_counter() - start) / TEXTS * 1e6
+
+    print(f"lexicon_terms={len(detector.lexicon)} load_ms={load_ms:.1f}")
+    print(f"score_us_per_text={single_us:.1f} detect_batch_us_per_text={batch_us:.1f} batch_size={BATCH_SIZE}")
+
+
+if __name__ == "__main__":
+    main()
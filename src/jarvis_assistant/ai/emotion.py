@@ -1,33 +1,180 @@
 from __future__ import annotations
 
+import string
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import Any
+
+from jarvis_assistant.ai.text_analysis import TextFeatures, analyze_text
+
+DEFAULT_LEXICON_PATH = Path(__file__).parent / "data" / "tone_lexicon.tsv"
+NEGATION_WINDOW = 3
+_PUNCTUATION = string.punctuation.replace("'", "")
+
+
+@dataclass(slots=True)
+class ToneLexicon:
+    """Precomputed lookup tables for lexicon scoring; row 0 is the unknown term."""
+
+    index: dict[str, int]
+    weights: list[tuple[float, float, float]]
+    scales: list[float]
+    negators: list[bool]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+@dataclass(slots=True)
+class ToneScore:
+    """Summed lexicon weights for one text and the labels derived from them."""
+
+    valence: float
+    urgency: float
+    stress: float
+    tone: str
+    urgent: bool
+    stressed: bool
+
+    def markers(self) -> dict[str, bool]:
+        return {"urgent": self.urgent, "stressed": self.stressed}
+
+
+def load_lexicon(path: Path = DEFAULT_LEXICON_PATH) -> ToneLexicon:
+    """Loads a tab-separated tone lexicon; see data/tone_lexicon.tsv for the format."""
+
+    lexicon = ToneLexicon(index={}, weights=[(0.0, 0.0, 0.0)], scales=[1.0], negators=[False])
+    with path.open(encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            term, *fields = line.rstrip("\n").split("\t")
+            weights, scale, negator = (0.0, 0.0, 0.0), 1.0, False
+            try:
+                if fields == ["negate"]:
+                    negator = True
+                elif len(fields) == 2 and fields[0] == "intensify":
+                    scale = float(fields[1])
+                else:
+                    valence, urgency, stress = (float(value) for value in fields)
+                    weights = (valence, urgency, stress)
+            except ValueError as exc:
+                raise RuntimeError(f"Invalid tone lexicon '{path}' line {line_no}: {line.strip()!r}") from exc
+            lexicon.index[term.lower()] = len(lexicon.weights)
+            lexicon.weights.append(weights)
+            lexicon.scales.append(scale)
+            lexicon.negators.append(negator)
+    return lexicon
+
 
 class EmotionalToneDetector:
-    """Detects tone and urgency/stress hints from text."""
+    """Detects tone and urgency/stress hints with a weighted lexicon.
 
-    POSITIVE = {"great", "awesome", "thanks", "love"}
-    NEGATIVE = {"bad", "hate", "frustrated", "angry"}
-    URGENT = {"urgent", "immediately", "asap", "now"}
-    STRESS = {"stressed", "overwhelmed", "panic", "anxious"}
+    Each term contributes (valence, urgency, stress) weights, scaled by an
+    intensifier directly before it. A negator within the preceding
+    NEGATION_WINDOW tokens flips valence and cancels urgency and stress.
+    """
 
-    def detect(self, text: str) -> str:
-        """Returns tone classification."""
+    def __init__(
+        self,
+        lexicon: ToneLexicon | None = None,
+        valence_threshold: float = 0.5,
+        marker_threshold: float = 1.0,
+    ) -> None:
+        self.lexicon = lexicon or load_lexicon()
+        self.valence_threshold = valence_threshold
+        self.marker_threshold = marker_threshold
+        self._tables: tuple[Any, Any, Any] | None = None
+
+    def score(self, text: str, features: TextFeatures | None = None) -> ToneScore:
+        """Scores one text with plain lookups; cheaper than NumPy for a single utterance."""
+
+        ids = self._term_ids((features or analyze_text(text)).tokens)
+        lexicon = self.lexicon
+        valence = urgency = stress = 0.0
+        for pos, row in enumerate(ids):
+            term_valence, term_urgency, term_stress = lexicon.weights[row]
+            if not (term_valence or term_urgency or term_stress):
+                continue
+            scale = lexicon.scales[ids[pos - 1]] if pos else 1.0
+            if any(lexicon.negators[prev] for prev in ids[max(0, pos - NEGATION_WINDOW) : pos]):
+                valence -= term_valence * scale
+            else:
+                valence += term_valence * scale
+                urgency += term_urgency * scale
+                stress += term_stress * scale
+        return self._label(valence, urgency, stress)
 
-    POSITIVE = {"great", "awesome", "thanks", "love"}
-    NEGATIVE = {"bad", "hate", "frustrated", "angry"}
+    def detect(self, text: str, features: TextFeatures | None = None) -> str:
+        """Returns tone classification."""
 
-    def detect(self, text: str) -> str:
-        words = set(text.lower().split())
-        if words & self.NEGATIVE:
-            return "negative"
-        if words & self.POSITIVE:
-            return "positive"
-        return "neutral"
+        return self.score(text, features).tone
 
-    def detect_urgency_and_stress(self, text: str) -> dict[str, bool]:
+    def detect_urgency_and_stress(self, text: str, features: TextFeatures | None = None) -> dict[str, bool]:
         """Returns urgency and stress boolean markers."""
 
-        words = set(text.lower().split())
-        return {"urgent": bool(words & self.URGENT), "stressed": bool(words & self.STRESS)}
+        return self.score(text, features).markers()
+
+    def detect_batch(self, texts: Sequence[str], features: Sequence[TextFeatures] | None = None) -> list[ToneScore]:
+        """Scores many texts at once, vectorized over all of their tokens with NumPy."""
+
+        if features is None:
+            features = [analyze_text(text) for text in texts]
+        try:
+            import numpy as np
+        except ImportError:
+            return [self.score(text, feats) for text, feats in zip(texts, features)]
+
+        rows = [self._term_ids(feats.tokens) for feats in features]
+        weights, scales, negators = self._numpy_tables(np)
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        ids = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=int(lengths.sum()))
+        owner = np.repeat(np.arange(len(rows)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        pos = np.arange(len(ids))
+
+        scale = np.where(pos > starts, scales[ids[np.maximum(pos - 1, 0)]], 1.0)
+        seen_negators = np.concatenate(([0], np.cumsum(negators[ids])))
+        negated = seen_negators[pos] > seen_negators[np.maximum(pos - NEGATION_WINDOW, starts)]
+        contributions = weights[ids] * scale[:, None]
+        contributions[negated, 0] *= -1.0
+        contributions[negated, 1:] = 0.0
+
+        totals = [np.bincount(owner, weights=contributions[:, k], minlength=len(rows)) for k in range(3)]
+        return [
+            self._label(float(valence), float(urgency), float(stress))
+            for valence, urgency, stress in zip(*totals)
+        ]
+
+    def _term_ids(self, tokens: Sequence[str]) -> list[int]:
+        index = self.lexicon.index
+        return [index.get(token.strip(_PUNCTUATION), 0) for token in tokens]
+
+    def _numpy_tables(self, np: Any) -> tuple[Any, Any, Any]:
+        if self._tables is None:
+            self._tables = (
+                np.asarray(self.lexicon.weights, dtype=np.float64),
+                np.asarray(self.lexicon.scales, dtype=np.float64),
+                np.asarray(self.lexicon.negators, dtype=np.int64),
+            )
+        return self._tables
+
+    def _label(self, valence: float, urgency: float, stress: float) -> ToneScore:
+        tone = "neutral"
+        if valence <= -self.valence_threshold:
+            tone = "negative"
+        elif valence >= self.valence_threshold:
+            tone = "positive"
+        return ToneScore(
+            valence=valence,
+            urgency=urgency,
+            stress=stress,
+            tone=tone,
+            urgent=urgency >= self.marker_threshold,
+            stressed=stress >= self.marker_threshold,
+        )
 
 
 class AdaptivePersonality:
@@ -50,16 +197,3 @@ class AdaptivePersonality:
         if not self.formal_mode:
             return (prefix + text).replace("I understand.", "Got it,").replace("Excellent.", "Nice,")
         return prefix + text
-
-class AdaptivePersonality:
-    def __init__(self, level: float = 0.5) -> None:
-        self.level = max(0.0, min(1.0, level))
-
-    def apply_style(self, text: str, tone: str) -> str:
-        if self.level < 0.3:
-            return text
-        if tone == "negative":
-            return f"I understand. {text}"
-        if tone == "positive":
-            return f"Excellent. {text}"
-        return text
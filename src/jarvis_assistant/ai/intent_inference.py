@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import torch
+from torch import nn
+
+from jarvis_assistant.core.models import IntentResult
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+Featurizer = Callable[[Sequence[str]], torch.Tensor]
+
+
+class IntentInferenceService:
+    """Serves an intent model on CPU by micro-batching concurrent requests.
+
+    Callers block on `predict`/`predict_many` while a batcher thread collects
+    pending texts until `max_batch_size` are queued or the oldest has waited
+    `max_wait_seconds`, then runs one forward pass for the whole batch.
+    """
+
+    def __init__(
+        self,
+        model: nn.Module,
+        labels: Sequence[str],
+        featurize: Featurizer,
+        logger: logging.Logger,
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.005,
+        timeout_seconds: float = 1.0,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        self.model = model.eval()
+        self.labels = list(labels)
+        self.featurize = featurize
+        self.logger = logger
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.timeout_seconds = timeout_seconds
+        self.metrics = metrics
+        self._cond = threading.Condition()
+        self._pending: list[tuple[str, Future[IntentResult]]] = []
+        self._oldest_at: float | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="intent-inference", daemon=True)
+        self._thread.start()
+
+    def predict(self, text: str) -> IntentResult:
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts: Sequence[str]) -> list[IntentResult]:
+        """Classifies texts, sharing forward passes with concurrent callers."""
+
+        futures = self._enqueue(texts)
+        deadline = time.monotonic() + self.timeout_seconds
+        try:
+            return [future.result(timeout=max(0.0, deadline - time.monotonic())) for future in futures]
+        except FutureTimeoutError as exc:
+            for future in futures:
+                future.cancel()
+            raise TimeoutError("Intent inference timed out.") from exc
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Stops the batcher after serving already queued requests."""
+
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+
+    def _enqueue(self, texts: Sequence[str]) -> list[Future[IntentResult]]:
+        futures: list[Future[IntentResult]] = [Future() for _ in texts]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Intent inference service is closed.")
+            if self._oldest_at is None and texts:
+                self._oldest_at = time.monotonic()
+            self._pending.extend(zip(texts, futures))
+            self._cond.notify_all()
+        return futures
+
+    def _batch_due(self) -> bool:
+        if not self._pending:
+            return False
+        if self._closed or len(self._pending) >= self.max_batch_size:
+            return True
+        return self._oldest_at is not None and time.monotonic() - self._oldest_at >= self.max_wait_seconds
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._batch_due():
+                    if self._closed:
+                        return
+                    wait = None
+                    if self._oldest_at is not None:
+                        wait = max(0.0, self._oldest_at + self.max_wait_seconds - time.monotonic())
+                    self._cond.wait(timeout=wait)
+                batch = self._pending[: self.max_batch_size]
+                del self._pending[: self.max_batch_size]
+                self._oldest_at = time.monotonic() if self._pending else None
+            self._serve([(text, future) for text, future in batch if future.set_running_or_notify_cancel()])
+
+    def _serve(self, batch: list[tuple[str, Future[IntentResult]]]) -> None:
+        if not batch:
+            return
+        texts = [text for text, _ in batch]
+        try:
+            with torch.inference_mode():
+                probabilities = torch.softmax(self.model(self.featurize(texts)), dim=-1)
+                confidences, indices = probabilities.max(dim=-1)
+        except Exception as exc:  # noqa: BLE001
+            self.logger.exception("intent_inference_failed batch_size=%s error=%s", len(batch), exc)
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+
+        if self.metrics is not None:
+            self.metrics.increment("intent_inference.batches")
+            self.metrics.increment("intent_inference.requests", len(batch))
+        for (text, future), confidence, index in zip(batch, confidences.tolist(), indices.tolist()):
+            future.set_result(IntentResult(intent=self.labels[index], confidence=confidence, raw_text=text))
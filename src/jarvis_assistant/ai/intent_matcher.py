@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_KEYWORD_RULE = re.compile(r"^\\b\((?:\?:)?(\w+(?:\|\w+)*)\)\\b$")
+_NAMED_GROUP = re.compile(r"\(\?P<\w+>")
+_BACKREFERENCE = re.compile(r"\(\?P=|\\[1-9]")
+_GLOBAL_FLAGS = re.compile(r"^(?:\(\?[aiLmsux]+\))+")
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(slots=True)
+class Rule:
+    """Fallback rule parser entry.
+
+    Lower `priority` wins; rules with equal priority keep their load order.
+    Named groups in `pattern` are returned as entities of the match.
+    """
+
+    pattern: str
+    intent: str
+    priority: int = 100
+    confidence: float = 0.82
+
+
+@dataclass(slots=True)
+class RuleMatch:
+    """Winning rule and the entities captured by its pattern."""
+
+    rule: Rule
+    entities: dict[str, str] = field(default_factory=dict)
+
+
+class CompiledRuleMatcher:
+    """Matches text against a whole rule set without looping over rules in Python.
+
+    Keyword rules of the form ``\\b(a|b|c)\\b`` go into a hash index probed once
+    per word of the input. All other rules are combined into one lookahead
+    alternation ordered by priority, so the regex engine reports the best rule
+    at every position in a single scan. Leading global flags such as ``(?i)``
+    are rewritten as a scoped ``(?i:...)`` group for the combined pattern.
+    Rules using backreferences or verbose mode cannot be combined and are
+    checked individually.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        ranked = sorted(enumerate(rules), key=lambda item: (item[1].priority, item[0]))
+        self.rules = [rule for _, rule in ranked]
+        self._patterns = [re.compile(rule.pattern) for rule in self.rules]
+        self._keywords: dict[str, int] = {}
+        combined: list[str] = []
+        self._combined_ranks: list[int] = []
+        self._standalone: list[int] = []
+
+        for rank, rule in enumerate(self.rules):
+            keyword = _KEYWORD_RULE.match(rule.pattern)
+            if keyword is not None:
+                for word in keyword.group(1).split("|"):
+                    self._keywords.setdefault(word, rank)
+                continue
+            pattern = _scope_global_flags(rule.pattern)
+            if pattern is None or _BACKREFERENCE.search(pattern):
+                self._standalone.append(rank)
+            else:
+                combined.append(f"(?=(?P<r{rank}>{_NAMED_GROUP.sub('(?:', pattern)}))")
+                self._combined_ranks.append(rank)
+
+        self._combined = re.compile("|".join(combined)) if combined else None
+
+    def match(self, normalized: str) -> RuleMatch | None:
+        """Returns the highest-priority rule matching normalized text."""
+
+        best: int | None = None
+        if self._keywords:
+            for word in _WORD.findall(normalized):
+                rank = self._keywords.get(word)
+                if rank is not None and (best is None or rank < best):
+                    best = rank
+        if self._combined is not None and (best is None or self._combined_ranks[0] < best):
+            for found in self._combined.finditer(normalized):
+                rank = int(found.lastgroup[1:])  # type: ignore[index]
+                if best is None or rank < best:
+                    best = rank
+                if best == self._combined_ranks[0]:
+                    break
+        for rank in self._standalone:
+            if best is not None and rank >= best:
+                break
+            if self._patterns[rank].search(normalized):
+                best = rank
+                break
+        if best is None:
+            return None
+
+        found = self._patterns[best].search(normalized)
+        entities: dict[str, str] = {}
+        if found is not None:
+            entities["match"] = found.group(0)
+            entities.update({name: value for name, value in found.groupdict().items() if value is not None})
+        return RuleMatch(rule=self.rules[best], entities=entities)
+
+
+def _scope_global_flags(pattern: str) -> str | None:
+    """Turns leading ``(?flags)`` into a scoped group; None when the pattern uses verbose mode."""
+
+    found = _GLOBAL_FLAGS.match(pattern)
+    if found is None:
+        return pattern
+    flags = "".join(sorted(set(found.group(0)) - set("(?)")))
+    if "x" in flags:
+        # A trailing comment in verbose mode would swallow the group's closing parenthesis.
+        return None
+    return f"(?{flags}:{pattern[found.end():]})"
+
+
+def load_rules(path: Path) -> list[Rule]:
+    """Loads rules from a JSON list of {pattern, intent, priority?, confidence?} objects."""
+
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(raw, list):
+        raise RuntimeError(f"Invalid intent rules file '{path}': expected a JSON list.")
+    return [Rule(**entry) for entry in raw]
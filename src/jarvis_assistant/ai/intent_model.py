@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import copy
+import json
+from pathlib import Path
+from typing import Any
+
 import torch
 from torch import nn
 
@@ -35,3 +40,44 @@ def train_step(
     loss.backward()
     optimizer.step()
     return float(loss.item())
+
+
+def fold_dropout(model: IntentClassifier) -> IntentClassifier:
+    """Returns an eval-mode copy with Dropout layers replaced by Identity."""
+
+    folded = copy.deepcopy(model).eval()
+    for name, module in folded.net.named_children():
+        if isinstance(module, nn.Dropout):
+            folded.net[int(name)] = nn.Identity()
+    return folded
+
+
+def export_for_inference(model: IntentClassifier, quantize: bool = True) -> torch.jit.ScriptModule:
+    """Folds dropout, optionally int8-quantizes Linear layers, and freezes with TorchScript.
+
+    Dynamic quantization keeps activations in fp32 and stores weights as int8,
+    which suits the CPU-only hosts the "small" model tier targets.
+    """
+
+    folded = fold_dropout(model)
+    input_dim = folded.net[0].in_features
+    if quantize:
+        folded = torch.ao.quantization.quantize_dynamic(folded, {nn.Linear}, dtype=torch.qint8)
+    with torch.no_grad():
+        traced = torch.jit.trace(folded, torch.zeros(1, input_dim))
+    return torch.jit.freeze(traced.eval())
+
+
+def save_exported(module: torch.jit.ScriptModule, path: Path, metadata: dict[str, Any] | None = None) -> None:
+    """Saves an exported model with JSON metadata such as labels and featurizer settings."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.jit.save(module, str(path), _extra_files={"metadata.json": json.dumps(metadata or {})})
+
+
+def load_exported(path: Path) -> tuple[torch.jit.ScriptModule, dict[str, Any]]:
+    """Loads an exported model for CPU inference together with its metadata."""
+
+    extra_files = {"metadata.json": ""}
+    module = torch.jit.load(str(path), map_location="cpu", _extra_files=extra_files)
+    return module.eval(), json.loads(extra_files["metadata.json"] or "{}")
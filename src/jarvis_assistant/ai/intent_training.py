@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import logging
+import random
+import sqlite3
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import torch
+from torch import nn
+from torch.utils.data import DataLoader, IterableDataset, get_worker_info
+
+from jarvis_assistant.ai.intent_model import IntentClassifier, export_for_inference, save_exported, train_step
+from jarvis_assistant.ai.vectorizer import HashingVectorizer, HashingVectorizerSpec
+
+
+@dataclass(slots=True)
+class TrainingConfig:
+    """Hyperparameters and data-loading settings for streaming intent training."""
+
+    batch_size: int = 64
+    chunk_size: int = 2048
+    shuffle_buffer: int = 8192
+    num_workers: int = 2
+    max_epochs: int = 20
+    patience: int = 3
+    learning_rate: float = 1e-3
+    hidden_dim: int = 128
+    holdout_modulus: int = 10
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class EpochReport:
+    """Loss, validation accuracy and throughput of one training epoch."""
+
+    epoch: int
+    train_loss: float
+    val_loss: float
+    val_accuracy: float
+    samples: int
+    seconds: float
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.samples / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(slots=True)
+class TrainingReport:
+    """Outcome of a training run."""
+
+    labels: list[str]
+    epochs: list[EpochReport] = field(default_factory=list)
+    best_epoch: int | None = None
+    stopped_early: bool = False
+
+
+class InteractionStream(IterableDataset):
+    """Streams labelled (text, label index) rows from the interactions table.
+
+    Rows are read in id-range chunks so memory stays bounded by `chunk_size`
+    and `shuffle_buffer`. Chunks are split across DataLoader workers, their
+    order is reshuffled every epoch, and rows pass through a shuffle buffer.
+    Rows whose id is a multiple of `holdout_modulus` form the validation split.
+    """
+
+    def __init__(
+        self,
+        sqlite_path: Path,
+        labels: Sequence[str],
+        validation: bool,
+        chunk_size: int = 2048,
+        shuffle_buffer: int = 8192,
+        holdout_modulus: int = 10,
+        seed: int = 0,
+    ) -> None:
+        self.sqlite_path = sqlite_path
+        self.label_index = {label: index for index, label in enumerate(labels)}
+        self.validation = validation
+        self.chunk_size = chunk_size
+        self.shuffle_buffer = 0 if validation else shuffle_buffer
+        self.holdout_modulus = holdout_modulus
+        self.seed = seed
+        self.epoch = 0
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        worker = get_worker_info()
+        worker_id, num_workers = (0, 1) if worker is None else (worker.id, worker.num_workers)
+        rng = random.Random(f"{self.seed}:{self.epoch}:{worker_id}")
+        conn = sqlite3.connect(f"file:{self.sqlite_path}?mode=ro", uri=True)
+        try:
+            low, high = conn.execute("SELECT MIN(id), MAX(id) FROM interactions").fetchone()
+            if low is None:
+                return
+            starts = list(range(low, high + 1, self.chunk_size))[worker_id::num_workers]
+            if not self.validation:
+                rng.shuffle(starts)
+            yield from self._shuffled(self._rows(conn, starts), rng)
+        finally:
+            conn.close()
+
+    def _rows(self, conn: sqlite3.Connection, starts: list[int]) -> Iterator[tuple[str, int]]:
+        sign = "=" if self.validation else "!="
+        query = (
+            f"SELECT text, intent FROM interactions WHERE id >= ? AND id < ? AND id % ? {sign} 0 "
+            "AND text IS NOT NULL AND intent IS NOT NULL"
+        )
+        for start in starts:
+            for text, intent in conn.execute(query, (start, start + self.chunk_size, self.holdout_modulus)):
+                label = self.label_index.get(intent)
+                if label is not None:
+                    yield text, label
+
+    def _shuffled(self, rows: Iterator[tuple[str, int]], rng: random.Random) -> Iterator[tuple[str, int]]:
+        if self.shuffle_buffer <= 1:
+            yield from rows
+            return
+        buffer: list[tuple[str, int]] = []
+        for row in rows:
+            if len(buffer) < self.shuffle_buffer:
+                buffer.append(row)
+                continue
+            index = rng.randrange(len(buffer))
+            yield buffer[index]
+            buffer[index] = row
+        rng.shuffle(buffer)
+        yield from buffer
+
+
+class FeaturizeBatch:
+    """DataLoader collate function that hashes texts into a dense feature batch.
+
+    The vectorizer is built lazily so the collate function pickles cleanly
+    into worker processes.
+    """
+
+    def __init__(self, spec: HashingVectorizerSpec) -> None:
+        self.spec = spec
+        self._vectorizer: HashingVectorizer | None = None
+
+    def __call__(self, rows: list[tuple[str, int]]) -> tuple[torch.Tensor, torch.Tensor]:
+        if self._vectorizer is None:
+            self._vectorizer = HashingVectorizer(self.spec, cache_size=0)
+        texts = [text for text, _ in rows]
+        return self._vectorizer.transform(texts), torch.tensor([label for _, label in rows], dtype=torch.int64)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"spec": self.spec, "_vectorizer": None}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.spec = state["spec"]
+        self._vectorizer = None
+
+
+class IntentTrainer:
+    """Trains IntentClassifier from the interactions table without loading it into memory.
+
+    `last.pt` is checkpointed every epoch so an interrupted run resumes where
+    it stopped, and `best.pt` keeps the weights with the lowest validation
+    loss. Training stops after `patience` epochs without improvement, and
+    refuses to start when no labelled row falls into the validation split.
+    """
+
+    def __init__(
+        self,
+        sqlite_path: Path,
+        checkpoint_dir: Path,
+        logger: logging.Logger,
+        config: TrainingConfig | None = None,
+        spec: HashingVectorizerSpec | None = None,
+    ) -> None:
+        self.sqlite_path = sqlite_path
+        self.checkpoint_dir = checkpoint_dir
+        self.logger = logger
+        self.config = config or TrainingConfig()
+        self.spec = spec or HashingVectorizerSpec()
+
+    def train(self, resume: bool = True) -> TrainingReport:
+        """Runs epochs until `max_epochs` or early stopping; returns per-epoch reports."""
+
+        cfg = self.config
+        torch.manual_seed(cfg.seed)
+        last_path = self.checkpoint_dir / "last.pt"
+        state = torch.load(last_path, map_location="cpu") if resume and last_path.is_file() else None
+        if state is not None:
+            self.spec = HashingVectorizerSpec.from_dict(state["vectorizer"])
+        labels: list[str] = state["labels"] if state is not None else self._labels()
+        report = TrainingReport(labels=labels)
+        if not labels:
+            self.logger.warning("intent_training_skipped reason=no_labelled_rows")
+            return report
+        if not self._has_validation_rows(labels):
+            raise RuntimeError(
+                f"No labelled rows in the validation split (ids divisible by holdout_modulus="
+                f"{cfg.holdout_modulus}); add data or lower holdout_modulus."
+            )
+
+        model = IntentClassifier(self.spec.dim, cfg.hidden_dim, len(labels))
+        optimizer = torch.optim.Adam(model.parameters(), lr=cfg.learning_rate)
+        start_epoch, best_loss, bad_epochs = 0, float("inf"), 0
+        if state is not None:
+            model.load_state_dict(state["model"])
+            optimizer.load_state_dict(state["optimizer"])
+            start_epoch, best_loss, bad_epochs = state["epoch"] + 1, state["best_loss"], state["bad_epochs"]
+            report.best_epoch = state["best_epoch"]
+            self.logger.info("intent_training_resumed epoch=%s", start_epoch)
+
+        train_stream, train_loader = self._loader(labels, validation=False)
+        _, val_loader = self._loader(labels, validation=True)
+        for epoch in range(start_epoch, cfg.max_epochs):
+            if bad_epochs >= cfg.patience:
+                report.stopped_early = True
+                break
+            train_stream.epoch = epoch
+            started = time.perf_counter()
+            total_loss, samples = 0.0, 0
+            for features, targets in train_loader:
+                total_loss += train_step(model, features, targets, optimizer) * len(targets)
+                samples += len(targets)
+            seconds = time.perf_counter() - started
+            val_loss, val_accuracy = self._evaluate(model, val_loader)
+            epoch_report = EpochReport(
+                epoch=epoch,
+                train_loss=total_loss / samples if samples else 0.0,
+                val_loss=val_loss,
+                val_accuracy=val_accuracy,
+                samples=samples,
+                seconds=seconds,
+            )
+            report.epochs.append(epoch_report)
+            self.logger.info(
+                "intent_training_epoch epoch=%s train_loss=%.4f val_loss=%.4f val_accuracy=%.4f "
+                "samples=%s samples_per_second=%.1f",
+                epoch,
+                epoch_report.train_loss,
+                val_loss,
+                val_accuracy,
+                samples,
+                epoch_report.samples_per_second,
+            )
+
+            if val_loss < best_loss:
+                best_loss, bad_epochs, report.best_epoch = val_loss, 0, epoch
+                self._save("best.pt", {"model": model.state_dict(), "labels": labels, "epoch": epoch})
+            else:
+                bad_epochs += 1
+            self._save(
+                "last.pt",
+                {
+                    "model": model.state_dict(),
+                    "optimizer": optimizer.state_dict(),
+                    "epoch": epoch,
+                    "best_loss": best_loss,
+                    "best_epoch": report.best_epoch,
+                    "bad_epochs": bad_epochs,
+                    "labels": labels,
+                },
+            )
+        return report
+
+    def export_best(self, path: Path, quantize: bool = True) -> None:
+        """Exports the best checkpoint in the format ServiceContainer loads."""
+
+        best_path = self.checkpoint_dir / "best.pt"
+        if not best_path.is_file():
+            raise RuntimeError(f"No best checkpoint at {best_path}; run train() first.")
+        state = torch.load(best_path, map_location="cpu")
+        spec = HashingVectorizerSpec.from_dict(state["vectorizer"])
+        model = IntentClassifier(spec.dim, self.config.hidden_dim, len(state["labels"]))
+        model.load_state_dict(state["model"])
+        metadata = {"labels": state["labels"], "vectorizer": state["vectorizer"]}
+        save_exported(export_for_inference(model, quantize=quantize), path, metadata)
+
+    def _labels(self) -> list[str]:
+        conn = sqlite3.connect(f"file:{self.sqlite_path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute("SELECT DISTINCT intent FROM interactions WHERE intent IS NOT NULL").fetchall()
+        finally:
+            conn.close()
+        return sorted(intent for (intent,) in rows)
+
+    def _has_validation_rows(self, labels: list[str]) -> bool:
+        placeholders = ", ".join("?" * len(labels))
+        conn = sqlite3.connect(f"file:{self.sqlite_path}?mode=ro", uri=True)
+        try:
+            row = conn.execute(
+                f"SELECT 1 FROM interactions WHERE id % ? = 0 AND text IS NOT NULL AND intent IN ({placeholders}) "
+                "LIMIT 1",
+                (self.config.holdout_modulus, *labels),
+            ).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+
+    def _loader(self, labels: list[str], validation: bool) -> tuple[InteractionStream, DataLoader]:
+        cfg = self.config
+        stream = InteractionStream(
+            self.sqlite_path,
+            labels,
+            validation=validation,
+            chunk_size=cfg.chunk_size,
+            shuffle_buffer=cfg.shuffle_buffer,
+            holdout_modulus=cfg.holdout_modulus,
+            seed=cfg.seed,
+        )
+        loader = DataLoader(
+            stream,
+            batch_size=cfg.batch_size,
+            num_workers=cfg.num_workers,
+            collate_fn=FeaturizeBatch(self.spec),
+        )
+        return stream, loader
+
+    def _evaluate(self, model: IntentClassifier, loader: DataLoader) -> tuple[float, float]:
+        model.eval()
+        loss_fn = nn.CrossEntropyLoss(reduction="sum")
+        total_loss, correct, samples = 0.0, 0, 0
+        with torch.inference_mode():
+            for features, targets in loader:
+                logits = model(features)
+                total_loss += float(loss_fn(logits, targets))
+                correct += int((logits.argmax(dim=-1) == targets).sum())
+                samples += len(targets)
+        if samples == 0:
+            return float("inf"), 0.0
+        return total_loss / samples, correct / samples
+
+    def _save(self, name: str, state: dict[str, Any]) -> None:
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        state["vectorizer"] = self.spec.to_dict()
+        tmp_path = self.checkpoint_dir / f"{name}.tmp"
+        torch.save(state, tmp_path)
+        tmp_path.replace(self.checkpoint_dir / name)
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Protocol
+
+from jarvis_assistant.infrastructure.fair_queue import FairQueue
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+TIERS = ("small", "medium", "large")
+
+
+@dataclass(slots=True, frozen=True)
+class LocalModelSpec:
+    """Local model in the catalog with its size tier and resident memory."""
+
+    name: str
+    tier: str
+    ram_gb: float
+
+
+DEFAULT_LOCAL_MODELS: tuple[LocalModelSpec, ...] = (
+    LocalModelSpec("jarvis-small", "small", 2.0),
+    LocalModelSpec("jarvis-medium", "medium", 5.0),
+    LocalModelSpec("jarvis-large", "large", 10.0),
+)
+
+
+class LocalInferenceBackend(Protocol):
+    """Blocking interface of a local inference server."""
+
+    def load(self, model: str) -> None: ...
+
+    def unload(self, model: str) -> None: ...
+
+    def generate(self, model: str, prompt: str) -> str: ...
+
+
+class HttpLocalBackend:
+    """Local inference server speaking JSON over HTTP.
+
+    POSTs `{"model"}` to `/v1/models/load` and `/v1/models/unload`, and
+    `{"model", "prompt"}` to `/v1/generate`, expecting `{"text"}` back.
+    """
+
+    def __init__(self, endpoint: str, timeout_seconds: float = 120.0) -> None:
+        self.endpoint = endpoint.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+
+    def load(self, model: str) -> None:
+        self._post("/v1/models/load", {"model": model})
+
+    def unload(self, model: str) -> None:
+        self._post("/v1/models/unload", {"model": model})
+
+    def generate(self, model: str, prompt: str) -> str:
+        return str(self._post("/v1/generate", {"model": model, "prompt": prompt})["text"])
+
+    def _post(self, path: str, body: dict[str, str]) -> dict[str, object]:
+        request = urllib.request.Request(
+            f"{self.endpoint}{path}",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:  # noqa: S310
+            payload = response.read()
+        return json.loads(payload) if payload else {}
+
+
+class SimulatedLocalBackend:
+    """In-process stand-in for a local inference server.
+
+    Loading takes `load_seconds_per_gb` per GB of the model (looked up in
+    `catalog`) and generating takes `generate_seconds`; generating with a
+    model that is not loaded raises.
+    """
+
+    def __init__(
+        self,
+        catalog: Sequence[LocalModelSpec] = DEFAULT_LOCAL_MODELS,
+        load_seconds_per_gb: float = 0.05,
+        generate_seconds: float = 0.01,
+    ) -> None:
+        self.sizes = {spec.name: spec.ram_gb for spec in catalog}
+        self.load_seconds_per_gb = load_seconds_per_gb
+        self.generate_seconds = generate_seconds
+        self.loaded: set[str] = set()
+        self.loads: list[str] = []
+        self.unloads: list[str] = []
+        self._lock = threading.Lock()
+
+    def load(self, model: str) -> None:
+        time.sleep(self.sizes.get(model, 1.0) * self.load_seconds_per_gb)
+        with self._lock:
+            self.loaded.add(model)
+            self.loads.append(model)
+
+    def unload(self, model: str) -> None:
+        with self._lock:
+            self.loaded.discard(model)
+            self.unloads.append(model)
+
+    def generate(self, model: str, prompt: str) -> str:
+        with self._lock:
+            if model not in self.loaded:
+                raise RuntimeError(f"Model '{model}' is not loaded.")
+        time.sleep(self.generate_seconds)
+        return f"[Local:{model}] {prompt}"
+
+
+@dataclass(slots=True)
+class _LoadedModel:
+    """Resident model and how many generations are using it."""
+
+    spec: LocalModelSpec
+    in_use: int = 0
+
+
+def available_ram_gb() -> float | None:
+    """Returns RAM available to new allocations, or None if it cannot be read."""
+
+    try:
+        import psutil
+
+        return psutil.virtual_memory().available / (1024**3)
+    except Exception:  # noqa: BLE001
+        try:
+            return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024**3)
+        except (ValueError, OSError):
+            return None
+
+
+class LocalModelManager:
+    """Keeps a warm pool of local models and runs local generations fairly.
+
+    The pool holds catalog models up to the host's `tier`, largest first,
+    within `ram_budget_gb` and `max_loaded`. `start` preloads it smallest
+    first on a background thread, so a model is warm before the first local
+    request; background loads are skipped when they would evict another
+    model, so a host short of RAM keeps one warm model instead of
+    thrashing. Simple prompts (complexity below `simple_complexity`) use
+    the smallest pool model and others the largest; if the preferred model
+    is still cold but another pool model is warm, the warm one answers
+    while the preferred one loads in the background.
+
+    Loads are shared between concurrent callers. Idle models are unloaded,
+    least recently used first, to make room within the budget and whenever
+    available RAM drops below `min_free_ram_gb`, checked before each load
+    and every `pressure_check_seconds`. At most `max_concurrent`
+    generations run at once; the rest wait in arrival order. A generation
+    whose caller is cancelled keeps its turn until the backend returns.
+    """
+
+    def __init__(
+        self,
+        backend: LocalInferenceBackend,
+        catalog: Sequence[LocalModelSpec],
+        tier: str,
+        ram_budget_gb: float,
+        logger: logging.Logger,
+        max_loaded: int = 2,
+        max_concurrent: int = 1,
+        min_free_ram_gb: float = 1.0,
+        simple_complexity: float = 0.3,
+        pressure_check_seconds: float = 5.0,
+        available_ram: Callable[[], float | None] = available_ram_gb,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        self.backend = backend
+        self.ram_budget_gb = ram_budget_gb
+        self.logger = logger
+        self.max_loaded = max_loaded
+        self.min_free_ram_gb = min_free_ram_gb
+        self.simple_complexity = simple_complexity
+        self.pressure_check_seconds = pressure_check_seconds
+        self.available_ram = available_ram
+        self.metrics = metrics
+        self.pool = self._plan_pool(catalog, tier)
+        self._queue = FairQueue(max_concurrent)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="local-generate")
+        self._lock = threading.Lock()
+        self._loaded: OrderedDict[str, _LoadedModel] = OrderedDict()
+        self._loading: dict[str, threading.Event] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Preloads the pool and starts watching memory pressure on a background thread."""
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="local-models", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def loaded_models(self) -> list[str]:
+        with self._lock:
+            return list(self._loaded)
+
+    def relieve_pressure(self) -> None:
+        """Unloads idle models, least recently used first, while available RAM is below the floor."""
+
+        available = self.available_ram()
+        if available is None or available >= self.min_free_ram_gb:
+            return
+        with self._lock:
+            victims: list[str] = []
+            for name, entry in self._loaded.items():
+                if available >= self.min_free_ram_gb:
+                    break
+                if not entry.in_use:
+                    victims.append(name)
+                    available += entry.spec.ram_gb
+            for name in victims:
+                del self._loaded[name]
+        for name in victims:
+            self._unload(name, reason="memory_pressure")
+
+    async def generate(self, prompt: str, complexity: float | None = None) -> str:
+        """Generates with the pool model suited to `complexity`, waiting for a fair turn."""
+
+        await self._queue.acquire()
+        try:
+            work = self._executor.submit(contextvars.copy_context().run, self._generate, prompt, complexity)
+        except BaseException:
+            self._queue.release()
+            raise
+        # Cancelling the caller cannot stop a backend call already running, so the turn ends with the work.
+        work.add_done_callback(lambda _: self._queue.release())
+        return await asyncio.wrap_future(work)
+
+    def _plan_pool(self, catalog: Sequence[LocalModelSpec], tier: str) -> list[LocalModelSpec]:
+        allowed = [spec for spec in catalog if TIERS.index(spec.tier) <= TIERS.index(tier)]
+        pool: list[LocalModelSpec] = []
+        for spec in sorted(allowed, key=lambda spec: spec.ram_gb, reverse=True):
+            resident = sum(model.ram_gb for model in pool)
+            if len(pool) < self.max_loaded and resident + spec.ram_gb <= self.ram_budget_gb:
+                pool.append(spec)
+        if not pool and allowed:
+            pool.append(min(allowed, key=lambda spec: spec.ram_gb))
+        return sorted(pool, key=lambda spec: spec.ram_gb)
+
+    def _generate(self, prompt: str, complexity: float | None) -> str:
+        spec = self._choose(complexity)
+        entry = self._acquire(spec)
+        try:
+            return self.backend.generate(entry.spec.name, prompt)
+        finally:
+            self._release(entry)
+
+    def _choose(self, complexity: float | None) -> LocalModelSpec:
+        if not self.pool:
+            raise RuntimeError("No local model fits the configured tier.")
+        simple = complexity is not None and complexity < self.simple_complexity
+        preferred = self.pool[0] if simple else self.pool[-1]
+        with self._lock:
+            if preferred.name in self._loaded:
+                self._count("warm_hits")
+                return preferred
+            warm = [spec for spec in self.pool if spec.name in self._loaded]
+        if warm:
+            self._count("warm_substitutes")
+            self._warm_in_background(preferred)
+            return warm[0] if simple else warm[-1]
+        self._count("cold_starts")
+        return preferred
+
+    def _acquire(self, spec: LocalModelSpec) -> _LoadedModel:
+        """Returns the loaded entry for `spec`, marked in use, loading it first if needed."""
+
+        while True:
+            with self._lock:
+                entry = self._loaded.get(spec.name)
+                if entry is not None:
+                    entry.in_use += 1
+                    self._loaded.move_to_end(spec.name)
+                    return entry
+                loading = self._loading.get(spec.name)
+                if loading is None:
+                    loading = self._loading[spec.name] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+            if not owner:
+                loading.wait()
+                continue
+            try:
+                self._load(spec)
+            finally:
+                with self._lock:
+                    del self._loading[spec.name]
+                loading.set()
+
+    def _load(self, spec: LocalModelSpec) -> None:
+        self._make_room(spec)
+        started = time.perf_counter()
+        self.backend.load(spec.name)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._loaded[spec.name] = _LoadedModel(spec)
+        self._count("model_loads")
+        self.logger.info("local_model_loaded model=%s load_ms=%.1f", spec.name, elapsed * 1000)
+
+    def _fits_without_eviction(self, spec: LocalModelSpec) -> bool:
+        """Returns whether `spec` can load next to the resident models, so warming never evicts."""
+
+        available = self.available_ram()
+        with self._lock:
+            resident = sum(entry.spec.ram_gb for entry in self._loaded.values())
+            return (
+                len(self._loaded) < self.max_loaded
+                and resident + spec.ram_gb <= self.ram_budget_gb
+                and (available is None or available >= spec.ram_gb + self.min_free_ram_gb)
+            )
+
+    def _make_room(self, spec: LocalModelSpec) -> None:
+        """Unloads idle models until `spec` fits the budget and the free-RAM floor."""
+
+        available = self.available_ram()
+        with self._lock:
+            resident = sum(entry.spec.ram_gb for entry in self._loaded.values())
+            victims: list[str] = []
+            for name, entry in self._loaded.items():
+                fits_budget = resident + spec.ram_gb <= self.ram_budget_gb
+                fits_count = len(self._loaded) - len(victims) < self.max_loaded
+                fits_ram = available is None or available >= spec.ram_gb + self.min_free_ram_gb
+                if fits_budget and fits_count and fits_ram:
+                    break
+                if entry.in_use:
+                    continue
+                victims.append(name)
+                resident -= entry.spec.ram_gb
+                if available is not None:
+                    available += entry.spec.ram_gb
+            for name in victims:
+                del self._loaded[name]
+        for name in victims:
+            self._unload(name, reason="make_room")
+
+    def _unload(self, name: str, reason: str) -> None:
+        try:
+            self.backend.unload(name)
+        except Exception as exc:  # noqa: BLE001
+            self.logger.warning("local_model_unload_failed model=%s error=%s", name, exc)
+        self._count("model_evictions")
+        self.logger.info("local_model_evicted model=%s reason=%s", name, reason)
+
+    def _warm_in_background(self, spec: LocalModelSpec) -> None:
+        with self._lock:
+            if spec.name in self._loading or spec.name in self._loaded:
+                return
+        if not self._fits_without_eviction(spec):
+            return
+        threading.Thread(target=self._preload, args=(spec,), name="local-models-warm", daemon=True).start()
+
+    def _preload(self, spec: LocalModelSpec) -> None:
+        try:
+            self._release(self._acquire(spec))
+        except Exception as exc:  # noqa: BLE001
+            self.logger.warning("local_model_preload_failed model=%s error=%s", spec.name, exc)
+
+    def _run(self) -> None:
+        for spec in self.pool:
+            if self._stop.is_set():
+                return
+            if self._fits_without_eviction(spec):
+                self._preload(spec)
+            else:
+                self.logger.info("local_model_preload_skipped model=%s reason=memory", spec.name)
+        while not self._stop.wait(self.pressure_check_seconds):
+            self.relieve_pressure()
+
+    def _release(self, entry: _LoadedModel) -> None:
+        with self._lock:
+            entry.in_use -= 1
+
+    def _count(self, event: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(f"local.{event}")
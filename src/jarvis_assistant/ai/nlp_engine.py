@@ -1,50 +1,100 @@
 from __future__ import annotations
 
 import logging
-import re
-from dataclasses import dataclass
+from collections.abc import Sequence
+from typing import Protocol
 
+from jarvis_assistant.ai.intent_matcher import CompiledRuleMatcher, Rule
+from jarvis_assistant.ai.text_analysis import TextFeatures
 from jarvis_assistant.core.models import IntentResult
 
+DEFAULT_RULES = (
+    Rule(pattern=r"\b(open|launch)\b", intent="open_app"),
+    Rule(pattern=r"\b(close|quit)\b", intent="close_app"),
+    Rule(pattern=r"\b(weather)\b", intent="weather_query"),
+    # A reminder's content may name other commands ("remind me to open x"), so it outranks them.
+    Rule(pattern=r"\b(schedule|remind)\b", intent="create_reminder", priority=50),
+)
 
-@dataclass(slots=True)
-class Rule:
-    """Fallback rule parser entry."""
 
-@dataclass
-class Rule:
-    pattern: str
-    intent: str
+class IntentPredictor(Protocol):
+    """Model-backed intent classifier consulted when no rule is confident."""
+
+    def predict_many(self, texts: Sequence[str]) -> list[IntentResult]: ...
+
+    def close(self) -> None: ...
 
 
 class NLPEngine:
-    """Hybrid NLP pipeline: lightweight preprocessing + rule fallback."""
+    """Hybrid NLP pipeline: lightweight preprocessing + rule fallback.
+
+    With a `classifier`, rule matches below `rule_confidence_threshold` and
+    unmatched inputs are sent to the model; its prediction is used when it is
+    at least as confident as the rule result.
+    """
 
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        rules: Sequence[Rule] | None = None,
+        classifier: IntentPredictor | None = None,
+        rule_confidence_threshold: float = 0.8,
+    ) -> None:
         self.logger = logger
-    """Hybrid NLP pipeline: simple preprocessing + rule fallback + classifier stub."""
+        self.classifier = classifier
+        self.rule_confidence_threshold = rule_confidence_threshold
+        self.load_rules(DEFAULT_RULES if rules is None else rules)
 
-    def __init__(self) -> None:
-        self.rules = [
-            Rule(pattern=r"\b(open|launch)\b", intent="open_app"),
-            Rule(pattern=r"\b(close|quit)\b", intent="close_app"),
-            Rule(pattern=r"\b(weather)\b", intent="weather_query"),
-            Rule(pattern=r"\b(schedule|remind)\b", intent="create_reminder"),
-        ]
+    def load_rules(self, rules: Sequence[Rule]) -> None:
+        """Replaces the rule set and recompiles the matcher."""
 
-    def parse(self, text: str) -> IntentResult:
+        self.rules = list(rules)
+        self.matcher = CompiledRuleMatcher(self.rules)
+
+    def parse(self, text: str, features: TextFeatures | None = None) -> IntentResult:
         """Parses input text into an intent object."""
 
-        normalized = text.lower().strip()
-        for rule in self.rules:
-            if re.search(rule.pattern, normalized):
-                self.logger.debug("rule_match intent=%s", rule.intent)
-                return IntentResult(intent=rule.intent, confidence=0.82, raw_text=text)
+        return self._classify([text], [self._match(text, features)])[0]
 
-        self.logger.debug("rule_match intent=general_reasoning")
-        normalized = text.lower().strip()
-        for rule in self.rules:
-            if re.search(rule.pattern, normalized):
-                return IntentResult(intent=rule.intent, confidence=0.82, raw_text=text)
+    def parse_batch(
+        self, texts: Sequence[str], features: Sequence[TextFeatures] | None = None
+    ) -> list[IntentResult]:
+        """Parses many inputs in one call so a batch costs a single worker dispatch."""
 
+        if features is None:
+            matched = [self._match(text) for text in texts]
+        else:
+            matched = [self._match(text, feats) for text, feats in zip(texts, features)]
+        return self._classify(texts, matched)
+
+    def _match(self, text: str, features: TextFeatures | None = None) -> IntentResult:
+        normalized = features.normalized if features is not None else text.lower().strip()
+        match = self.matcher.match(normalized)
+        if match is not None:
+            self.logger.debug("rule_match intent=%s", match.rule.intent)
+            return IntentResult(
+                intent=match.rule.intent,
+                confidence=match.rule.confidence,
+                entities=match.entities,
+                raw_text=text,
+            )
+
+        self.logger.debug("rule_match intent=general_reasoning")
         return IntentResult(intent="general_reasoning", confidence=0.48, raw_text=text)
+
+    def _classify(self, texts: Sequence[str], matched: list[IntentResult]) -> list[IntentResult]:
+        if self.classifier is None:
+            return matched
+        uncertain = [i for i, result in enumerate(matched) if result.confidence < self.rule_confidence_threshold]
+        if not uncertain:
+            return matched
+        try:
+            predictions = self.classifier.predict_many([texts[i] for i in uncertain])
+        except Exception as exc:  # noqa: BLE001
+            self.logger.warning("intent_model_failed error=%s", exc)
+            return matched
+        for i, prediction in zip(uncertain, predictions):
+            if prediction.confidence >= matched[i].confidence:
+                self.logger.debug("model_match intent=%s", prediction.intent)
+                matched[i] = prediction
+        return matched
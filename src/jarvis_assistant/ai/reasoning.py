@@ -1,60 +1,161 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
 
+from jarvis_assistant.ai.text_analysis import TextFeatures
 from jarvis_assistant.cloud.model_router import ModelRouter
 from jarvis_assistant.contracts.results import ErrorInfo, ReasoningResult, ResultStatus
 from jarvis_assistant.core.models import IntentResult
+from jarvis_assistant.infrastructure.deadline import Deadline
+from jarvis_assistant.memory.context_assembler import ContextAssembler
 
 
-class ReasoningEngine:
-    """Reasoning and task planning service."""
+@dataclass(slots=True, frozen=True)
+class CompiledPlan:
+    """Fixed single-step plan for an intent whose plan depends only on the request text.
 
-    def __init__(self, router: ModelRouter, logger: logging.Logger) -> None:
-        self.router = router
-        self.logger = logger
+    `owns_following_text` marks intents whose argument runs on past clause
+    boundaries, such as the content of a reminder.
+    """
 
-    def estimate_complexity(self, text: str, intent: IntentResult) -> float:
-        """Estimates prompt complexity for routing."""
+    plan_name: str
+    confidence: float
+    step: Mapping[str, str]
+    text_field: str
+    owns_following_text: bool = False
 
-from jarvis_assistant.cloud.model_router import ModelRouter
-from jarvis_assistant.core.config import AppConfig
-from jarvis_assistant.core.models import ActionPlan, IntentResult
+    def build(self, text: str) -> ReasoningResult:
+        return ReasoningResult(
+            status=ResultStatus.SUCCESS,
+            confidence=self.confidence,
+            plan_name=self.plan_name,
+            steps=[self.step_for(text)],
+            metadata={"requires_confirmation": False},
+        )
+
+    def step_for(self, text: str) -> dict[str, Any]:
+        return {**self.step, self.text_field: text}
+
+
+COMPILED_PLANS: dict[str, CompiledPlan] = {
+    "open_app": CompiledPlan("open_app", 0.8, {"type": "system", "intent": "open_app"}, "text"),
+    "close_app": CompiledPlan("close_app", 0.8, {"type": "system", "intent": "close_app"}, "text"),
+    "create_reminder": CompiledPlan(
+        "create_reminder", 0.75, {"type": "plugin", "name": "smart_reminders"}, "payload", owns_following_text=True
+    ),
+}
 
 
 class ReasoningEngine:
-    def __init__(self, config: AppConfig) -> None:
-        self.router = ModelRouter(config.model)
+    """Reasoning and task planning service.
+
+    With a `ContextAssembler`, cloud-routed prompts carry the recent
+    conversation turns most relevant to the request; such plans record a
+    digest of the turns sent as `context_digest` ("" when none fit).
+    """
+
+    def __init__(
+        self,
+        router: ModelRouter,
+        logger: logging.Logger,
+        compiled_plans: Mapping[str, CompiledPlan] | None = None,
+        context: ContextAssembler | None = None,
+    ) -> None:
+        self.router = router
+        self.logger = logger
+        self.context = context
+        self.compiled_plans = dict(COMPILED_PLANS if compiled_plans is None else compiled_plans)
+
+    def compiled_plan(self, text: str, intent: IntentResult) -> ReasoningResult | None:
+        """Returns the precompiled plan for deterministic intents, or None."""
+
+        plan = self.compiled_plans.get(intent.intent)
+        return plan.build(text) if plan is not None else None
+
+    def compiled_compound_plan(
+        self, clauses: Sequence[tuple[str, bool]], intents: Sequence[IntentResult]
+    ) -> ReasoningResult | None:
+        """Combines clauses of a compound command into one multi-step plan.
+
+        Only applies when every clause has a compiled plan and no clause but
+        the last owns the text after it ("remind me to open x and close y" is
+        one reminder, not a reminder and a close). Clauses run in parallel
+        unless marked sequential, which makes them depend on the previous
+        clause.
+        """
+
+        plans = [self.compiled_plans.get(intent.intent) for intent in intents]
+        if len(plans) < 2 or any(plan is None for plan in plans):
+            return None
+        if any(plan.owns_following_text for plan in plans[:-1]):  # type: ignore[union-attr]
+            return None
+        steps: list[dict[str, Any]] = []
+        for index, ((clause, sequential), plan) in enumerate(zip(clauses, plans)):
+            step = {**plan.step_for(clause), "id": f"s{index}"}  # type: ignore[union-attr]
+            if sequential and index:
+                step["depends_on"] = [f"s{index - 1}"]
+            steps.append(step)
+        return ReasoningResult(
+            status=ResultStatus.SUCCESS,
+            confidence=min(plan.confidence for plan in plans),  # type: ignore[union-attr]
+            plan_name="compound",
+            steps=steps,
+            metadata={"requires_confirmation": False},
+        )
 
-    def estimate_complexity(self, text: str, intent: IntentResult) -> float:
-        tokens = len(text.split())
+    def context_digest(self, text: str, route: str) -> str:
+        """Returns the `context_digest` a plan for `text` on `route` would carry now, or "" without context."""
+
+        if self.context is None or route == "local":
+            return ""
+        return self.context.assemble(text).context_digest
+
+    def estimate_complexity(self, text: str, intent: IntentResult, features: TextFeatures | None = None) -> float:
+        """Estimates prompt complexity for routing."""
+
+        tokens = features.token_count if features is not None else len(text.split())
         heuristic = min(1.0, tokens / 24)
         if intent.intent == "general_reasoning":
             heuristic = max(heuristic, 0.7)
         return heuristic
 
-    async def create_plan(self, text: str, intent: IntentResult, route: str) -> ReasoningResult:
+    def estimate_complexity_batch(
+        self,
+        texts: Sequence[str],
+        intents: Sequence[IntentResult],
+        features: Sequence[TextFeatures] | None = None,
+    ) -> list[float]:
+        """Estimates complexity for a batch of already-parsed inputs."""
+
+        if features is None:
+            return [self.estimate_complexity(text, intent) for text, intent in zip(texts, intents)]
+        return [self.estimate_complexity(text, intent, feats) for text, intent, feats in zip(texts, intents, features)]
+
+    async def create_plan(
+        self, text: str, intent: IntentResult, route: str, deadline: Deadline | None = None
+    ) -> ReasoningResult:
         """Creates a structured reasoning result containing plan steps."""
 
-        if intent.intent in {"open_app", "close_app"}:
-            return ReasoningResult(
-                status=ResultStatus.SUCCESS,
-                confidence=0.8,
-                plan_name=intent.intent,
-                steps=[{"type": "system", "intent": intent.intent, "text": text}],
-                metadata={"requires_confirmation": False},
-            )
-
-        if intent.intent == "create_reminder":
-            return ReasoningResult(
-                status=ResultStatus.SUCCESS,
-                confidence=0.75,
-                plan_name="create_reminder",
-                steps=[{"type": "plugin", "name": "smart_reminders", "payload": text}],
-                metadata={"requires_confirmation": False},
-            )
-
-        answer = await self.router.generate(text=text, route=route)
+        compiled = self.compiled_plan(text, intent)
+        if compiled is not None:
+            return compiled
+
+        prompt, context_digest = text, ""
+        metadata: dict[str, Any] = {"requires_confirmation": False}
+        if self.context is not None and route != "local":
+            assembled = self.context.assemble(text)
+            prompt, context_digest = assembled.prompt, assembled.context_digest
+            metadata["context_digest"] = context_digest
+        answer = await self.router.generate(
+            text=prompt,
+            route=route,
+            deadline=deadline,
+            complexity=self.estimate_complexity(text, intent),
+            cache_key=(text, context_digest),
+        )
         if not answer:
             return ReasoningResult(
                 status=ResultStatus.FAILED,
@@ -68,24 +169,5 @@ class ReasoningEngine:
             confidence=0.6,
             plan_name="respond_only",
             steps=[{"type": "response", "message": answer}],
-            metadata={"requires_confirmation": False},
-    def create_plan(self, text: str, intent: IntentResult, route: str) -> ActionPlan:
-        if intent.intent in {"open_app", "close_app"}:
-            return ActionPlan(
-                name=intent.intent,
-                steps=[{"type": "system", "intent": intent.intent, "text": text}],
-                requires_confirmation=False,
-            )
-
-        if intent.intent == "create_reminder":
-            return ActionPlan(
-                name="create_reminder",
-                steps=[{"type": "plugin", "name": "smart_reminders", "payload": text}],
-            )
-
-        answer = self.router.generate(text=text, route=route)
-        return ActionPlan(
-            name="respond_only",
-            steps=[{"type": "response", "message": answer}],
-            sensitive=False,
+            metadata=metadata,
         )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+_CLAUSE_BOUNDARY = re.compile(r"\s*(?:,\s*)?\b(and then|then|and)\b\s*", re.IGNORECASE)
+
+
+@dataclass(slots=True, frozen=True)
+class TextFeatures:
+    """Normalized text and token features computed once per request."""
+
+    raw: str
+    normalized: str
+    tokens: tuple[str, ...]
+    token_set: frozenset[str]
+
+    @property
+    def token_count(self) -> int:
+        return len(self.tokens)
+
+
+def analyze_text(text: str) -> TextFeatures:
+    """Lowercases and tokenizes input once for all downstream consumers."""
+
+    normalized = text.lower().strip()
+    tokens = tuple(normalized.split())
+    return TextFeatures(raw=text, normalized=normalized, tokens=tokens, token_set=frozenset(tokens))
+
+
+def split_clauses(text: str) -> list[tuple[str, bool]]:
+    """Splits a compound command on "and"/"then".
+
+    Returns (clause, sequential) pairs; `sequential` marks a clause introduced
+    by "then" that must run after the previous one.
+    """
+
+    parts = _CLAUSE_BOUNDARY.split(text.strip())
+    clauses = [(parts[0], False)]
+    clauses.extend((clause, "then" in separator.lower()) for separator, clause in zip(parts[1::2], parts[2::2]))
+    return [(clause.strip(), sequential) for clause, sequential in clauses if clause.strip()]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+import zlib
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import torch
+
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+from jarvis_assistant.infrastructure.ttl_cache import LRUTTLCache
+
+_WORD = re.compile(r"\w+")
+
+SparseRow = tuple[np.ndarray, np.ndarray]
+
+
+@dataclass(slots=True, frozen=True)
+class HashingVectorizerSpec:
+    """Settings that fix the feature space; a model is only valid for one spec."""
+
+    dim: int = 2**14
+    word_ngrams: tuple[int, int] = (1, 2)
+    char_ngrams: tuple[int, int] = (3, 5)
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, object]) -> HashingVectorizerSpec:
+        return cls(
+            dim=int(raw["dim"]),  # type: ignore[arg-type]
+            word_ngrams=tuple(raw["word_ngrams"]),  # type: ignore[arg-type]
+            char_ngrams=tuple(raw["char_ngrams"]),  # type: ignore[arg-type]
+        )
+
+
+class HashingVectorizer:
+    """Vocabulary-free text featurizer using the hashing trick.
+
+    Word n-grams and word-boundary char n-grams are hashed with CRC32 into
+    `spec.dim` buckets, with one hash bit choosing the sign so collisions tend
+    to cancel. Rows are L2-normalized. Featurized utterances are kept in an LRU
+    cache as sparse (indices, values) pairs, so repeated texts cost a lookup.
+    """
+
+    def __init__(
+        self,
+        spec: HashingVectorizerSpec | None = None,
+        cache_size: int = 4096,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        self.spec = spec or HashingVectorizerSpec()
+        self._cache: LRUTTLCache[str, SparseRow] = LRUTTLCache(
+            max_entries=cache_size,
+            ttl_seconds=math.inf,
+            metrics=metrics,
+            name="vectorizer_cache",
+        )
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: Sequence[str]) -> torch.Tensor:
+        return self.transform(texts)
+
+    def transform(self, texts: Sequence[str]) -> torch.Tensor:
+        """Returns a dense (len(texts), dim) float32 batch for the model."""
+
+        return self.transform_sparse(texts).to_dense()
+
+    def transform_sparse(self, texts: Sequence[str]) -> torch.Tensor:
+        """Returns a sparse COO (len(texts), dim) float32 batch."""
+
+        if not texts:
+            return torch.sparse_coo_tensor(torch.empty((2, 0), dtype=torch.int64), torch.empty(0), (0, self.spec.dim))
+        rows = [self.featurize(text) for text in texts]
+        row_ids = np.concatenate([np.full(len(indices), i, dtype=np.int64) for i, (indices, _) in enumerate(rows)])
+        columns = np.concatenate([indices for indices, _ in rows])
+        values = np.concatenate([row_values for _, row_values in rows])
+        return torch.sparse_coo_tensor(
+            torch.from_numpy(np.stack([row_ids, columns])),
+            torch.from_numpy(values),
+            size=(len(texts), self.spec.dim),
+        ).coalesce()
+
+    def featurize(self, text: str) -> SparseRow:
+        """Returns sorted bucket indices and normalized values for one text."""
+
+        key = text.lower().strip()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        row = self._hash_row(key)
+        with self._lock:
+            self._cache.put(key, row)
+        return row
+
+    def _hash_row(self, normalized: str) -> SparseRow:
+        counts: dict[int, float] = {}
+        for gram in self._grams(normalized):
+            digest = zlib.crc32(gram.encode("utf-8"))
+            bucket = (digest >> 1) % self.spec.dim
+            counts[bucket] = counts.get(bucket, 0.0) + (1.0 if digest & 1 else -1.0)
+
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        order = np.argsort(indices)
+        indices, values = indices[order], values[order]
+        norm = float(np.linalg.norm(values))
+        if norm > 0:
+            values /= norm
+        return indices, values
+
+    def _grams(self, normalized: str) -> list[str]:
+        words = _WORD.findall(normalized)
+        grams: list[str] = []
+        low, high = self.spec.word_ngrams
+        for n in range(low, high + 1):
+            grams.extend("w:" + " ".join(words[i : i + n]) for i in range(len(words) - n + 1))
+        low, high = self.spec.char_ngrams
+        for word in words:
+            padded = f" {word} "
+            for n in range(low, min(high, len(padded)) + 1):
+                grams.extend("c:" + padded[i : i + n] for i in range(len(padded) - n + 1))
+        return grams
@@ -3,10 +3,13 @@ from __future__ import annotations
 import concurrent.futures
 import logging
 import subprocess
+from collections import Counter
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
 from jarvis_assistant.contracts.results import ActionResult, ErrorInfo, ReasoningResult, ResultStatus
+from jarvis_assistant.infrastructure.deadline import Deadline
 from jarvis_assistant.infrastructure.errors import ErrorBoundary
 from jarvis_assistant.infrastructure.rate_limiter import SlidingWindowLimiter
 from jarvis_assistant.plugins.base import PluginBase
@@ -14,16 +17,13 @@ from jarvis_assistant.security.permissions import PermissionManager
 from jarvis_assistant.transactions.undo import CommandHistoryRegistry
 
 
+_EXECUTABLE_STEPS = {"response", "system", "plugin"}
+
+
 @dataclass(slots=True)
 class ExecutionLog:
     """In-memory execution audit log."""
 
-from jarvis_assistant.core.models import ActionPlan
-from jarvis_assistant.security.permissions import PermissionManager
-
-
-@dataclass
-class ExecutionLog:
     entries: list[dict[str, Any]] = field(default_factory=list)
 
 
@@ -40,6 +40,7 @@ class AutomationExecutor:
         plugin_timeout_seconds: float,
         automation_limiter: SlidingWindowLimiter,
         plugin_limiter: SlidingWindowLimiter,
+        max_parallel_steps: int = 4,
     ) -> None:
         self.permissions = permission_manager
         self.log = ExecutionLog()
@@ -50,9 +51,18 @@ class AutomationExecutor:
         self.plugin_timeout_seconds = plugin_timeout_seconds
         self.automation_limiter = automation_limiter
         self.plugin_limiter = plugin_limiter
+        self.max_parallel_steps = max_parallel_steps
 
-    def execute_plan(self, plan: ReasoningResult) -> ActionResult:
-        """Executes a structured reasoning plan."""
+    def execute_plan(self, plan: ReasoningResult, deadline: Deadline | None = None) -> ActionResult:
+        """Executes a structured reasoning plan within the optional request deadline.
+
+        Steps may declare an `id` (default: their position) and a `depends_on`
+        list; plans that repeat an id are rejected. Independent steps run
+        concurrently, each dependent step starts once its dependencies
+        succeeded and receives their results under `upstream`, and multi-step
+        plans aggregate into one result with PARTIAL status when only some
+        steps succeed.
+        """
 
         if not self.automation_limiter.allow():
             return ActionResult(
@@ -62,28 +72,239 @@ class AutomationExecutor:
                 error=ErrorInfo(code="AUTOMATION_RATE_LIMIT", message="Automation rate limit exceeded."),
             )
 
-        for step in plan.steps:
-            stype = step.get("type")
-            if stype == "response":
-                return ActionResult(
-                    status=ResultStatus.SUCCESS,
-                    confidence=plan.confidence,
-                    message=step.get("message", "Done"),
-                    metadata={"kind": "response"},
+        executable = [
+            (str(step.get("id", index)), step)
+            for index, step in enumerate(plan.steps)
+            if step.get("type") in _EXECUTABLE_STEPS
+        ]
+        steps = dict(executable)
+        if len(steps) < len(executable):
+            counts = Counter(step_id for step_id, _ in executable)
+            duplicates = sorted(step_id for step_id, count in counts.items() if count > 1)
+            return ActionResult(
+                status=ResultStatus.FAILED,
+                confidence=0.0,
+                message="Plan has duplicate step ids.",
+                error=ErrorInfo(
+                    code="INVALID_PLAN",
+                    message=f"Step ids are used more than once: {', '.join(duplicates)}.",
+                    recoverable=False,
+                ),
+            )
+        if not steps:
+            return ActionResult(
+                status=ResultStatus.FAILED,
+                confidence=0.0,
+                message="No executable steps.",
+                error=ErrorInfo(code="NO_STEPS", message="Plan contained no executable steps."),
+            )
+        if len(steps) == 1 and not next(iter(steps.values())).get("depends_on"):
+            return self._execute_step(next(iter(steps.values())), plan, deadline, {})
+
+        dependencies = {step_id: [str(dep) for dep in step.get("depends_on", [])] for step_id, step in steps.items()}
+        invalid = self._invalid_dependencies(dependencies)
+        if invalid:
+            return ActionResult(
+                status=ResultStatus.FAILED,
+                confidence=0.0,
+                message="Plan has invalid step dependencies.",
+                error=ErrorInfo(code="INVALID_PLAN", message=invalid, recoverable=False),
+            )
+        results = self._execute_graph(steps, dependencies, plan, deadline)
+        return self._aggregate([(step_id, results[step_id]) for step_id in steps])
+
+    def execute_plans(
+        self, plans: Sequence[ReasoningResult], deadline: Deadline | None = None
+    ) -> list[ActionResult]:
+        """Executes several plans in order, containing crashes per plan."""
+
+        return [
+            self.error_boundary.safe_call(
+                self.execute_plan,
+                plan,
+                deadline,
+                fallback=self._crashed_result,
+            )
+            for plan in plans
+        ]
+
+    def _execute_step(
+        self,
+        step: dict[str, Any],
+        plan: ReasoningResult,
+        deadline: Deadline | None,
+        upstream: Mapping[str, ActionResult],
+    ) -> ActionResult:
+        if upstream:
+            step = {
+                **step,
+                "upstream": {
+                    step_id: {"status": result.status.value, "message": result.message, "metadata": result.metadata}
+                    for step_id, result in upstream.items()
+                },
+            }
+        stype = step.get("type")
+        if stype == "response":
+            return ActionResult(
+                status=ResultStatus.SUCCESS,
+                confidence=plan.confidence,
+                message=step.get("message", "Done"),
+                metadata={"kind": "response"},
+            )
+        if stype == "system":
+            return self._execute_system(step)
+        return self._execute_plugin(step, deadline)
+
+    def _execute_graph(
+        self,
+        steps: dict[str, dict[str, Any]],
+        dependencies: dict[str, list[str]],
+        plan: ReasoningResult,
+        deadline: Deadline | None,
+    ) -> dict[str, ActionResult]:
+        """Runs steps as their dependencies complete; the wall time is the critical path.
+
+        When the deadline passes, steps not yet started are skipped. Steps
+        already running cannot be stopped, since worker threads run to
+        completion, so they are reported as still in progress rather than
+        cancelled: their side effects may still happen.
+        """
+
+        results: dict[str, ActionResult] = {}
+        waiting = dict(dependencies)
+        running: dict[concurrent.futures.Future[ActionResult], str] = {}
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(steps), self.max_parallel_steps), thread_name_prefix="plan-step"
+        )
+
+        def schedule_ready() -> None:
+            progressed = True
+            while progressed:
+                progressed = False
+                for step_id, deps in list(waiting.items()):
+                    if any(dep in results and results[dep].status != ResultStatus.SUCCESS for dep in deps):
+                        results[step_id] = self._skipped_result("UPSTREAM_FAILED", "A step this one depends on failed.")
+                    elif all(dep in results for dep in deps):
+                        future = pool.submit(
+                            self.error_boundary.safe_call,
+                            self._execute_step,
+                            steps[step_id],
+                            plan,
+                            deadline,
+                            {dep: results[dep] for dep in deps},
+                            fallback=self._crashed_result,
+                        )
+                        running[future] = step_id
+                    else:
+                        continue
+                    del waiting[step_id]
+                    progressed = True
+
+        try:
+            schedule_ready()
+            while running:
+                done, _ = concurrent.futures.wait(
+                    running,
+                    timeout=None if deadline is None else deadline.remaining(),
+                    return_when=concurrent.futures.FIRST_COMPLETED,
                 )
-            if stype == "system":
-                return self._execute_system(step)
-            if stype == "plugin":
-                return self._execute_plugin(step)
+                if not done:
+                    for future, step_id in running.items():
+                        if future.cancel():
+                            results[step_id] = self._skipped_result("DEADLINE_EXCEEDED", "Request deadline exceeded.")
+                        else:
+                            self.logger.warning("plan_step_still_running step=%s", step_id)
+                            results[step_id] = ActionResult(
+                                status=ResultStatus.TIMEOUT,
+                                confidence=0.0,
+                                message="Step is still running past the request budget.",
+                                metadata={"in_progress": True},
+                                error=ErrorInfo(
+                                    code="STEP_IN_PROGRESS",
+                                    message="Request deadline exceeded mid-step; the step may still take effect.",
+                                ),
+                            )
+                    break
+                for future in done:
+                    results[running.pop(future)] = future.result()
+                schedule_ready()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        for step_id in waiting:
+            results[step_id] = self._skipped_result("DEADLINE_EXCEEDED", "Request deadline exceeded.")
+        return results
+
+    def _invalid_dependencies(self, dependencies: dict[str, list[str]]) -> str | None:
+        """Returns why the dependency graph cannot run, or None when it is a DAG."""
+
+        for step_id, deps in dependencies.items():
+            unknown = [dep for dep in deps if dep not in dependencies]
+            if unknown:
+                return f"Step '{step_id}' depends on unknown steps: {', '.join(unknown)}."
+        visiting: set[str] = set()
+        visited: set[str] = set()
 
+        def has_cycle(step_id: str) -> bool:
+            if step_id in visiting:
+                return True
+            if step_id in visited:
+                return False
+            visiting.add(step_id)
+            cyclic = any(has_cycle(dep) for dep in dependencies[step_id])
+            visiting.discard(step_id)
+            visited.add(step_id)
+            return cyclic
+
+        if any(has_cycle(step_id) for step_id in dependencies):
+            return "Plan step dependencies contain a cycle."
+        return None
+
+    def _aggregate(self, results: list[tuple[str, ActionResult]]) -> ActionResult:
+        succeeded = [result for _, result in results if result.status == ResultStatus.SUCCESS]
+        failed = [step_id for step_id, result in results if result.status != ResultStatus.SUCCESS]
+        if not failed:
+            status = ResultStatus.SUCCESS
+        elif succeeded:
+            status = ResultStatus.PARTIAL
+        else:
+            status = ResultStatus.FAILED
         return ActionResult(
-            status=ResultStatus.FAILED,
+            status=status,
+            confidence=min((result.confidence for result in succeeded), default=0.0),
+            message=" ".join(result.message for _, result in results),
+            metadata={
+                "steps": [
+                    {
+                        "id": step_id,
+                        "status": result.status.value,
+                        "message": result.message,
+                        **({"error": result.error.code} if result.error else {}),
+                    }
+                    for step_id, result in results
+                ]
+            },
+            error=None
+            if not failed
+            else ErrorInfo(
+                code="PARTIAL_FAILURE" if succeeded else "PLAN_FAILED",
+                message=f"{len(failed)} of {len(results)} steps did not succeed.",
+                details={"failed_steps": failed},
+            ),
+        )
+
+    def _crashed_result(self, error: ErrorInfo) -> ActionResult:
+        return ActionResult(status=ResultStatus.FAILED, confidence=0.0, message="Execution failed safely.", error=error)
+
+    def _skipped_result(self, code: str, message: str) -> ActionResult:
+        return ActionResult(
+            status=ResultStatus.CANCELLED,
             confidence=0.0,
-            message="No executable steps.",
-            error=ErrorInfo(code="NO_STEPS", message="Plan contained no executable steps."),
+            message="Step skipped.",
+            error=ErrorInfo(code=code, message=message),
         )
 
-    def _execute_plugin(self, step: dict[str, Any]) -> ActionResult:
+    def _execute_plugin(self, step: dict[str, Any], deadline: Deadline | None = None) -> ActionResult:
         plugin_name = str(step.get("name", ""))
         payload = str(step.get("payload", ""))
         self.logger.info("plugin_execute_start plugin=%s", plugin_name)
@@ -113,10 +334,19 @@ class AutomationExecutor:
                 error=ErrorInfo(code="PLUGIN_BLOCKED", message="Plugin blocked by permission policy."),
             )
 
+        timeout = self.plugin_timeout_seconds if deadline is None else deadline.timeout(self.plugin_timeout_seconds)
+        if timeout <= 0:
+            return ActionResult(
+                status=ResultStatus.TIMEOUT,
+                confidence=0.0,
+                message="Request budget exhausted before plugin execution.",
+                error=ErrorInfo(code="DEADLINE_EXCEEDED", message="Request deadline exceeded."),
+            )
+
         def run_plugin() -> dict[str, Any]:
             with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
                 future = pool.submit(plugin.handle, payload, {"step": step})
-                return future.result(timeout=self.plugin_timeout_seconds)
+                return future.result(timeout=timeout)
 
         result = self.error_boundary.safe_call(
             run_plugin,
@@ -133,24 +363,6 @@ class AutomationExecutor:
         )
 
     def _execute_system(self, step: dict[str, Any]) -> ActionResult:
-    def __init__(self, permission_manager: PermissionManager) -> None:
-        self.permissions = permission_manager
-        self.log = ExecutionLog()
-        self.undo_stack: list[dict[str, Any]] = []
-
-    def execute_plan(self, plan: ActionPlan) -> dict[str, Any]:
-        for step in plan.steps:
-            stype = step.get("type")
-            if stype == "response":
-                return {"success": True, "message": step.get("message", "Done")}
-            if stype == "system":
-                return self._execute_system(step)
-            if stype == "plugin":
-                return {"success": True, "message": f"Plugin call queued: {step.get('name')}"}
-
-        return {"success": False, "message": "No executable steps."}
-
-    def _execute_system(self, step: dict[str, Any]) -> dict[str, Any]:
         intent = step.get("intent")
         text = step.get("text", "")
         self.log.entries.append({"intent": intent, "text": text})
@@ -179,17 +391,3 @@ class AutomationExecutor:
             message=f"Unsupported system intent: {intent}",
             error=ErrorInfo(code="UNSUPPORTED_INTENT", message=f"Unsupported system intent: {intent}"),
         )
-            subprocess.Popen([app])
-            self.undo_stack.append({"type": "close_app", "app": app})
-            return {"success": True, "message": f"Opened {app}."}
-
-        if intent == "close_app":
-            return {"success": True, "message": "Close app action acknowledged."}
-
-        return {"success": False, "message": f"Unsupported system intent: {intent}"}
-
-    def undo_last(self) -> dict[str, Any]:
-        if not self.undo_stack:
-            return {"success": False, "message": "Nothing to undo."}
-        action = self.undo_stack.pop()
-        return {"success": True, "message": f"Undo placeholder: {action}"}
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import contextlib
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 
+from jarvis_assistant.cloud.transport import HttpRequest, HttpTransport
 from jarvis_assistant.infrastructure.rate_limiter import SlidingWindowLimiter
 
+_STREAM_END = object()
+
 
 @dataclass(slots=True)
 class CloudResponse:
@@ -14,32 +20,221 @@ class CloudResponse:
     cost_usd: float
 
 
+@dataclass(slots=True)
+class _PendingBatch:
+    """Prompts collected for one provider during the current batch window."""
+
+    prompts: list[str] = field(default_factory=list)
+    futures: list[asyncio.Future[CloudResponse]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
 class CloudClient:
-    """Async cloud client with timeout, rate limiting, and cost estimation."""
+    """Async cloud client with timeout, rate limiting, and cost estimation.
+
+    Without an `endpoint`, completions are simulated in-process. With one,
+    they are POSTed as JSON to `{endpoint}/v1/complete` over a pooled
+    keep-alive `HttpTransport`, and streamed completions are read from
+    `{endpoint}/v1/complete_stream` as newline-delimited JSON events.
+
+    With `batch_window_seconds` > 0, concurrent `complete` calls to the same
+    provider are collected for up to that window (or until `max_batch_size`)
+    and sent as one batched request that takes a single rate-limit slot.
+    Each caller gets its own response and cost.
+    """
 
-    def __init__(self, timeout_seconds: float, max_per_minute: int = 30) -> None:
+    def __init__(
+        self,
+        timeout_seconds: float,
+        max_per_minute: int = 30,
+        stream_buffer_size: int = 16,
+        endpoint: str | None = None,
+        transport: HttpTransport | None = None,
+        batch_window_seconds: float = 0.0,
+        max_batch_size: int = 16,
+    ) -> None:
         self.timeout_seconds = timeout_seconds
         self.limiter = SlidingWindowLimiter(max_per_minute, 60.0)
+        self.stream_buffer_size = stream_buffer_size
+        self.endpoint = endpoint.rstrip("/") if endpoint else None
+        self.transport = transport or HttpTransport()
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch_size = max_batch_size
         self.total_cost_usd = 0.0
+        self._batches: dict[str, _PendingBatch] = {}
+        self._flushes: set[asyncio.Task[None]] = set()
 
-    async def complete(self, prompt: str, provider: str) -> CloudResponse:
-        """Executes async cloud completion call with timeout and quota checks."""
+    async def complete(self, prompt: str, provider: str, timeout: float | None = None) -> CloudResponse:
+        """Executes async cloud completion call with timeout and quota checks.
 
+        `timeout` overrides `timeout_seconds` for this call, e.g. with the
+        remaining request budget. A batched call that times out stops waiting
+        but leaves the rest of its batch in flight.
+        """
+
+        timeout = self.timeout_seconds if timeout is None else timeout
+        if self.batch_window_seconds > 0:
+            return await asyncio.wait_for(asyncio.shield(self._enqueue(prompt, provider)), timeout=timeout)
         if not self.limiter.allow():
             raise RuntimeError("Cloud request limit exceeded.")
-        response = await asyncio.wait_for(self._simulate_request(prompt, provider), timeout=self.timeout_seconds)
+        response = await asyncio.wait_for(self._request(prompt, provider), timeout=timeout)
         self.total_cost_usd += response.cost_usd
         return response
 
+    def close(self) -> None:
+        """Closes idle pooled connections."""
+
+        self.transport.close()
+
+    def _enqueue(self, prompt: str, provider: str) -> asyncio.Future[CloudResponse]:
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(provider)
+        if batch is None:
+            batch = self._batches[provider] = _PendingBatch()
+            batch.timer = loop.call_later(self.batch_window_seconds, self._flush, provider)
+        future: asyncio.Future[CloudResponse] = loop.create_future()
+        # Callers that timed out never read their result; mark failures as retrieved.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        batch.prompts.append(prompt)
+        batch.futures.append(future)
+        if len(batch.prompts) >= self.max_batch_size:
+            self._flush(provider)
+        return future
+
+    def _flush(self, provider: str) -> None:
+        batch = self._batches.pop(provider, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._send_batch(batch, provider))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send_batch(self, batch: _PendingBatch, provider: str) -> None:
+        try:
+            if not self.limiter.allow():
+                raise RuntimeError("Cloud request limit exceeded.")
+            if len(batch.prompts) == 1:
+                request = self._request(batch.prompts[0], provider)
+                responses = [await asyncio.wait_for(request, timeout=self.timeout_seconds)]
+            else:
+                request = self._request_batch(batch.prompts, provider)
+                responses = await asyncio.wait_for(request, timeout=self.timeout_seconds)
+            if len(responses) != len(batch.prompts):
+                raise RuntimeError("Cloud provider returned a mismatched batch.")
+        except Exception as exc:  # noqa: BLE001
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, response in zip(batch.futures, responses):
+            self.total_cost_usd += response.cost_usd
+            if not future.done():
+                future.set_result(response)
+
+    async def _request(self, prompt: str, provider: str) -> CloudResponse:
+        if self.endpoint is None:
+            return await self._simulate_request(prompt, provider)
+        return await self._post(prompt, provider)
+
+    async def _request_batch(self, prompts: list[str], provider: str) -> list[CloudResponse]:
+        if self.endpoint is None:
+            return await self._simulate_batch(prompts, provider)
+        payload = await self._post_json("/v1/complete_batch", {"prompts": prompts, "provider": provider})
+        return [CloudResponse(text=str(item["text"]), cost_usd=float(item["cost_usd"])) for item in payload["results"]]
+
+    async def _post(self, prompt: str, provider: str) -> CloudResponse:
+        payload = await self._post_json("/v1/complete", {"prompt": prompt, "provider": provider})
+        return CloudResponse(text=str(payload["text"]), cost_usd=float(payload["cost_usd"]))
+
+    async def _post_json(self, path: str, body: dict[str, object]) -> dict[str, object]:
+        response = await self.transport.request(
+            HttpRequest(
+                method="POST",
+                url=f"{self.endpoint}{path}",
+                body=json.dumps(body).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+            )
+        )
+        if response.status != 200:
+            raise RuntimeError(f"Cloud provider returned HTTP {response.status}.")
+        return json.loads(response.body)
+
     async def _simulate_request(self, prompt: str, provider: str) -> CloudResponse:
         await asyncio.sleep(0.05)
-        token_estimate = max(1, len(prompt.split()))
-        cost = token_estimate * 0.00001
-        return CloudResponse(text=f"[Cloud:{provider}] {prompt}", cost_usd=cost)
+        return CloudResponse(text=f"[Cloud:{provider}] {prompt}", cost_usd=self._estimate_cost(prompt))
+
+    async def _simulate_batch(self, prompts: list[str], provider: str) -> list[CloudResponse]:
+        await asyncio.sleep(0.05)
+        return [CloudResponse(text=f"[Cloud:{provider}] {p}", cost_usd=self._estimate_cost(p)) for p in prompts]
+
+    async def stream_complete(self, prompt: str, provider: str) -> AsyncIterator[str]:
+        """Yields completion deltas as the provider produces them.
 
-    async def stream_complete(self, prompt: str, provider: str) -> list[str]:
-        """Returns streaming chunks for a completion."""
+        The provider is read by a producer task into a bounded buffer, so a slow
+        consumer applies backpressure. Each delta must arrive within
+        `timeout_seconds`, and closing or cancelling the iterator cancels the
+        provider read. The cost is charged once the provider has finished.
+        """
 
-        full = await self.complete(prompt, provider)
-        words = full.text.split()
-        return [" ".join(words[: i + 1]) for i in range(len(words))]
+        if not self.limiter.allow():
+            raise RuntimeError("Cloud request limit exceeded.")
+        if self.endpoint is None:
+            source = self._simulate_stream(prompt, provider)
+        else:
+            source = self._http_stream(prompt, provider)
+        buffer: asyncio.Queue[object] = asyncio.Queue(maxsize=self.stream_buffer_size)
+        producer = asyncio.create_task(self._pump(source, buffer))
+        try:
+            while True:
+                item = await asyncio.wait_for(buffer.get(), timeout=self.timeout_seconds)
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield str(item)
+        finally:
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+
+    async def _pump(self, source: AsyncIterator[str], buffer: asyncio.Queue[object]) -> None:
+        try:
+            async for delta in source:
+                await buffer.put(delta)
+        except Exception as exc:  # noqa: BLE001
+            await buffer.put(exc)
+            return
+        await buffer.put(_STREAM_END)
+
+    async def _http_stream(self, prompt: str, provider: str) -> AsyncIterator[str]:
+        request = HttpRequest(
+            method="POST",
+            url=f"{self.endpoint}/v1/complete_stream",
+            body=json.dumps({"prompt": prompt, "provider": provider}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        async with self.transport.stream(request) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Cloud provider returned HTTP {response.status}.")
+            pending = b""
+            async for chunk in response.chunks():
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in filter(None, (line.strip() for line in lines)):
+                    event = json.loads(line)
+                    if "delta" in event:
+                        yield str(event["delta"])
+                    if "cost_usd" in event:
+                        self.total_cost_usd += float(event["cost_usd"])
+
+    async def _simulate_stream(self, prompt: str, provider: str) -> AsyncIterator[str]:
+        await asyncio.sleep(0.01)
+        for index, word in enumerate(f"[Cloud:{provider}] {prompt}".split()):
+            yield word if index == 0 else f" {word}"
+            await asyncio.sleep(0)
+        self.total_cost_usd += self._estimate_cost(prompt)
+
+    def _estimate_cost(self, prompt: str) -> float:
+        token_estimate = max(1, len(prompt.split()))
+        return token_estimate * 0.00001
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from jarvis_assistant.cloud.client import CloudClient
+from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+STRATEGIES = ("p2c", "least_outstanding", "priority")
+
+
+@dataclass(slots=True)
+class ProviderBackend:
+    """One cloud provider with its client, circuit breaker and load statistics."""
+
+    name: str
+    client: CloudClient
+    breaker: CircuitBreaker
+    in_flight: int = 0
+    ewma_latency_seconds: float | None = None
+    requests: int = 0
+    failures: int = 0
+    cost_usd: float = 0.0
+
+    def available(self) -> bool:
+        return not self.breaker.state().is_open and self.client.limiter.remaining() > 0
+
+
+class ProviderBalancer:
+    """Picks a cloud backend per call by observed latency and outstanding requests.
+
+    `p2c` samples two available backends and takes the one with the lower
+    `ewma_latency * (in_flight + 1)`; `least_outstanding` takes the backend
+    with the fewest in-flight calls, breaking ties by EWMA latency; `priority`
+    takes the first backend in the given order, i.e. plain failover. Backends
+    whose circuit is open or whose rate limit is spent are skipped, and
+    backends without latency samples are tried first.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[ProviderBackend],
+        strategy: str = "p2c",
+        ewma_alpha: float = 0.3,
+        metrics: MetricsCollector | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown balancing strategy: {strategy}")
+        self.backends = list(backends)
+        self.strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self.metrics = metrics
+        self._rng = rng or random.Random()
+
+    def select(self) -> ProviderBackend | None:
+        """Returns a backend whose circuit admitted the call, or None if none can take it."""
+
+        candidates = [backend for backend in self.backends if backend.available()]
+        while candidates:
+            backend = self._choose(candidates)
+            if backend.breaker.allow_request():
+                return backend
+            candidates.remove(backend)
+        return None
+
+    def started(self, backend: ProviderBackend) -> None:
+        backend.in_flight += 1
+        self._publish(backend)
+
+    def finished(self, backend: ProviderBackend, latency_seconds: float, failed: bool, cost_usd: float = 0.0) -> None:
+        """Records the outcome, latency and cost of a call started with `started`."""
+
+        backend.in_flight -= 1
+        backend.requests += 1
+        backend.failures += failed
+        backend.cost_usd += cost_usd
+        previous = backend.ewma_latency_seconds
+        backend.ewma_latency_seconds = (
+            latency_seconds if previous is None else previous + self.ewma_alpha * (latency_seconds - previous)
+        )
+        if self.metrics is not None:
+            self.metrics.increment(f"backend.{backend.name}.requests")
+            self.metrics.increment(f"backend.{backend.name}.failures", float(failed))
+            self.metrics.increment(f"backend.{backend.name}.cost_usd", cost_usd)
+        self._publish(backend)
+
+    def abandoned(self, backend: ProviderBackend) -> None:
+        """Releases a call that ended without an outcome, e.g. cancelled or out of request budget."""
+
+        backend.in_flight -= 1
+        self._publish(backend)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {
+            backend.name: {
+                "in_flight": float(backend.in_flight),
+                "ewma_latency_ms": (backend.ewma_latency_seconds or 0.0) * 1000,
+                "requests": float(backend.requests),
+                "failures": float(backend.failures),
+                "cost_usd": backend.cost_usd,
+            }
+            for backend in self.backends
+        }
+
+    def _choose(self, candidates: list[ProviderBackend]) -> ProviderBackend:
+        if self.strategy == "priority":
+            return candidates[0]
+        unmeasured = [backend for backend in candidates if backend.ewma_latency_seconds is None]
+        if unmeasured:
+            return min(unmeasured, key=lambda backend: backend.in_flight)
+        if self.strategy == "least_outstanding":
+            return min(candidates, key=lambda backend: (backend.in_flight, backend.ewma_latency_seconds))
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = self._rng.sample(candidates, 2)
+        return min(first, second, key=self._load)
+
+    @staticmethod
+    def _load(backend: ProviderBackend) -> float:
+        return (backend.ewma_latency_seconds or 0.0) * (backend.in_flight + 1)
+
+    def _publish(self, backend: ProviderBackend) -> None:
+        if self.metrics is None:
+            return
+        self.metrics.set_gauge(f"backend.{backend.name}.in_flight", float(backend.in_flight))
+        if backend.ewma_latency_seconds is not None:
+            self.metrics.set_gauge(f"backend.{backend.name}.ewma_latency_ms", backend.ewma_latency_seconds * 1000)
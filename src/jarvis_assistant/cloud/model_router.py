@@ -1,75 +1,346 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+import time
+from collections.abc import AsyncIterator
 
+from jarvis_assistant.ai.local_models import LocalModelManager
 from jarvis_assistant.cloud.client import CloudClient
+from jarvis_assistant.cloud.load_balancer import ProviderBackend, ProviderBalancer
+from jarvis_assistant.cloud.semantic_cache import SemanticCache
+from jarvis_assistant.cloud.transport import HttpTransport
 from jarvis_assistant.core.config import AppConfig
-from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker
+from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker, CircuitBreakerGroup, CircuitState
+from jarvis_assistant.infrastructure.deadline import Deadline
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+from jarvis_assistant.infrastructure.singleflight import SingleFlight
+
+# Same-budget requests arriving this close together still share one call.
+_COALESCE_DEADLINE_SLACK_SECONDS = 0.05
 
 
 class ModelRouter:
-    """Async model routing with cloud failover protections."""
+    """Async model routing with cloud failover protections.
+
+    Each cloud provider (`cloud_provider`, then `cloud_fallback_providers`)
+    has its own client, rate limit and circuit breaker. A ProviderBalancer
+    picks the provider per call by `cloud_balancing` from observed latency
+    and in-flight calls, skipping providers whose circuit is open or whose
+    rate limit is spent, so one slow or failing backend is routed around.
+    `cloud_client` is the primary provider's client.
 
-    def __init__(self, config: AppConfig, circuit_breaker: CircuitBreaker, logger: logging.Logger) -> None:
+    Local generation goes through a LocalModelManager when one is given.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        circuit_breaker: CircuitBreaker,
+        logger: logging.Logger,
+        metrics: MetricsCollector | None = None,
+        semantic_cache: SemanticCache | None = None,
+        local_models: LocalModelManager | None = None,
+    ) -> None:
         self.config = config
         self.circuit_breaker = circuit_breaker
+        self.breakers = CircuitBreakerGroup(circuit_breaker, [config.cloud_provider, *config.cloud_fallback_providers])
         self.logger = logger
-        self.cloud_client = CloudClient(
-            timeout_seconds=config.request_timeout_seconds,
-            max_per_minute=config.cloud_rate_limit_per_minute,
+        self.metrics = metrics
+        self.semantic_cache = semantic_cache
+        self.local_models = local_models
+        transport = HttpTransport(
+            max_connections_per_host=config.cloud_max_connections_per_host,
+            idle_timeout_seconds=config.cloud_keepalive_seconds,
+            metrics=metrics,
+        )
+        endpoints = dict(config.cloud_provider_endpoints)
+        self.balancer = ProviderBalancer(
+            [
+                ProviderBackend(
+                    name=provider,
+                    client=CloudClient(
+                        timeout_seconds=config.request_timeout_seconds,
+                        max_per_minute=config.cloud_rate_limit_per_minute,
+                        endpoint=endpoints.get(provider, config.cloud_endpoint),
+                        transport=transport,
+                        batch_window_seconds=config.cloud_batch_window_seconds,
+                        max_batch_size=config.cloud_batch_max_size,
+                    ),
+                    breaker=self.breakers.breaker(provider),
+                )
+                for provider in self.breakers.providers
+            ],
+            strategy=config.cloud_balancing,
+            metrics=metrics,
         )
+        self.cloud_client = self.balancer.backends[0].client
+        self._inflight: SingleFlight[tuple[str, str, float | None], str] = SingleFlight(
+            name="singleflight.generate", deadline_slack_seconds=_COALESCE_DEADLINE_SLACK_SECONDS
+        )
+
+    async def generate(
+        self,
+        text: str,
+        route: str,
+        deadline: Deadline | None = None,
+        complexity: float | None = None,
+        cache_key: tuple[str, str] | None = None,
+    ) -> str:
+        """Generates text from selected route with circuit handling.
 
-    async def generate(self, text: str, route: str) -> str:
-        """Generates text from selected route with circuit handling."""
+        When a request deadline is given and less than `cloud_min_budget_seconds`
+        remain, the cheaper local route is used instead of the cloud. With
+        `hedge_enabled` and a LocalModelManager, cloud calls are hedged with
+        local generation; see `_hedged_generate`. Cloud answers to similar earlier prompts are served
+        from the semantic cache without a provider call; `cache_key` is the
+        (request, context) pair it is keyed on when `text` carries more than
+        the bare request, and defaults to `(text, "")`.
+        """
 
         if route == "local":
-            return self._local_generate(text)
-        if not self.circuit_breaker.allow_request():
-            self.logger.warning("cloud_blocked_by_circuit")
-            return self._local_generate(text)
+            return await self._local_generate(text, complexity)
+        key = cache_key or (text, "")
+        if self.semantic_cache is not None:
+            cached = self.semantic_cache.get(*key)
+            if cached is not None:
+                return cached
+        if deadline is not None and deadline.nearly_spent(self.config.cloud_min_budget_seconds):
+            self.logger.warning("cloud_skipped_budget remaining_s=%.3f", deadline.remaining())
+            return await self._local_generate(text, complexity)
+        # Complexity steers hedging and local model choice, and the deadline the fallback, so callers only
+        # share a call made with the same complexity and at least as much budget as their own.
+        flight = (text, route, complexity)
+        expires_at = deadline.expires_at if deadline is not None else None
+        if self.config.hedge_enabled and self.local_models is not None:
+            answer, _ = await self._inflight.do(
+                flight, lambda: self._hedged_generate(text, deadline, complexity, key), expires_at
+            )
+        else:
+            answer, _ = await self._inflight.do(
+                flight, lambda: self._cloud_generate(text, deadline, complexity, key), expires_at
+            )
+        return answer
+
+    async def _cloud_generate(
+        self, text: str, deadline: Deadline | None, complexity: float | None, cache_key: tuple[str, str]
+    ) -> str:
+        return await self._cloud_attempt(text, deadline, cache_key) or await self._local_generate(text, complexity)
+
+    async def _hedged_generate(
+        self, text: str, deadline: Deadline | None, complexity: float | None, cache_key: tuple[str, str]
+    ) -> str:
+        """Races the cloud call against local generation and returns the first acceptable answer.
+
+        Local generation starts after `hedge_delay_seconds` without a cloud
+        answer, or immediately for prompts with complexity at or below
+        `hedge_immediate_complexity`. Only a local model's answer can win;
+        a failed local leg leaves the race to the cloud. Tasks still running
+        when the race ends, or when the caller is cancelled, are cancelled.
+        """
+
+        cloud = asyncio.create_task(self._cloud_attempt(text, deadline, cache_key))
+        immediate = complexity is not None and complexity <= self.config.hedge_immediate_complexity
+        pending: set[asyncio.Task[str | None]] = {cloud}
+        try:
+            if not immediate:
+                done, pending = await asyncio.wait(pending, timeout=self.config.hedge_delay_seconds)
+                if done:
+                    return cloud.result() or await self._local_generate(text, complexity)
+
+            self._count("hedge.launched")
+            local = asyncio.create_task(self._local_model_generate(text, complexity))
+            pending = {cloud, local}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda finished: finished is not cloud):
+                    answer = task.result()
+                    if not answer:
+                        continue
+                    winner, loser = ("cloud", "local") if task is cloud else ("local", "cloud")
+                    self._count(f"hedge.wins.{winner}")
+                    if pending:
+                        self._count(f"hedge.wasted.{loser}")
+                    self.logger.info("hedge_resolved winner=%s immediate=%s", winner, immediate)
+                    return answer
+            return _local_placeholder(text)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def circuit_state(self) -> CircuitState:
+        """Returns the state of the first provider that can take traffic."""
+
+        return self.breakers.state()
+
+    def _admit(self) -> ProviderBackend | None:
+        backend = self.balancer.select()
+        if backend is None:
+            self.logger.warning("cloud_no_backend_available")
+        return backend
+
+    async def _cloud_attempt(
+        self, text: str, deadline: Deadline | None, cache_key: tuple[str, str] | None = None
+    ) -> str | None:
+        """Calls the provider picked by the balancer; returns None when blocked or failed."""
+
+        backend = self._admit()
+        if backend is None:
+            return None
+        provider, breaker, client = backend.name, backend.breaker, backend.client
+        timeout = client.timeout_seconds
+        if deadline is not None:
+            timeout = deadline.timeout(timeout)
+        self.balancer.started(backend)
+        started = time.perf_counter()
         try:
-            response = await self.cloud_client.complete(text, provider=self.config.cloud_provider)
-            self.circuit_breaker.record_success()
-            self.logger.info("cloud_cost_total_usd=%.6f", self.cloud_client.total_cost_usd)
+            response = await client.complete(text, provider=provider, timeout=timeout)
+            latency = time.perf_counter() - started
+            breaker.record_success(latency)
+            self.balancer.finished(backend, latency, failed=False, cost_usd=response.cost_usd)
+            self.logger.info("cloud_cost_total_usd=%.6f provider=%s", client.total_cost_usd, provider)
+            if self.semantic_cache is not None:
+                prompt, context = cache_key or (text, "")
+                self.semantic_cache.put(prompt, response.text, response.cost_usd, context)
             return response.text
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            self.balancer.abandoned(backend)
+            raise
+        except asyncio.TimeoutError:
+            latency = time.perf_counter() - started
+            if timeout < client.timeout_seconds:
+                # The request budget, not the provider, ran out; don't penalize the circuit.
+                self.logger.warning("cloud_call_budget_exhausted timeout_s=%.3f", timeout)
+                breaker.release_probe()
+                self.balancer.abandoned(backend)
+            else:
+                self.logger.warning("cloud_call_failed error=timeout provider=%s", provider)
+                breaker.record_failure(latency)
+                self.balancer.finished(backend, latency, failed=True)
+            return None
         except Exception as exc:  # noqa: BLE001
-            self.logger.warning("cloud_call_failed error=%s", exc)
-            self.circuit_breaker.record_failure()
-            return self._local_generate(text)
+            latency = time.perf_counter() - started
+            self.logger.warning("cloud_call_failed error=%s provider=%s", exc, provider)
+            breaker.record_failure(latency)
+            self.balancer.finished(backend, latency, failed=True)
+            return None
 
-    async def stream_generate(self, text: str, route: str) -> list[str]:
-        """Generates streaming chunks for response text."""
+    async def stream_generate(
+        self,
+        text: str,
+        route: str,
+        deadline: Deadline | None = None,
+        complexity: float | None = None,
+        cache_key: tuple[str, str] | None = None,
+    ) -> AsyncIterator[str]:
+        """Yields response deltas incrementally with the same failover as `generate`.
+
+        A cloud failure before the first delta falls back to the local stream; a
+        failure after output has started ends the stream, since emitted text
+        cannot be retracted. Both cases count against the circuit breaker.
+        The deadline, semantic cache and `cache_key` work as in `generate`: a
+        cached answer is yielded whole, a nearly spent budget goes local, and
+        a budget running out mid-stream ends it without penalizing the
+        circuit. Local backends only return whole answers, so the local path
+        is not streamed: it waits for the full generation and then yields it
+        word by word.
+        """
 
         if route == "local":
-            full = self._local_generate(text)
-            words = full.split()
-            return [" ".join(words[: i + 1]) for i in range(len(words))]
+            async for delta in self._local_stream(text, complexity):
+                yield delta
+            return
+        key = cache_key or (text, "")
+        if self.semantic_cache is not None:
+            cached = self.semantic_cache.get(*key)
+            if cached is not None:
+                yield cached
+                return
+        if deadline is not None and deadline.nearly_spent(self.config.cloud_min_budget_seconds):
+            self.logger.warning("cloud_skipped_budget remaining_s=%.3f", deadline.remaining())
+            async for delta in self._local_stream(text, complexity):
+                yield delta
+            return
+        backend = self._admit()
+        if backend is None:
+            async for delta in self._local_stream(text, complexity):
+                yield delta
+            return
+        provider, breaker, client = backend.name, backend.breaker, backend.client
+
+        deltas: list[str] = []
+        cost_before = client.total_cost_usd
+        self.balancer.started(backend)
+        started = time.perf_counter()
         try:
-            return await self.cloud_client.stream_complete(text, provider=self.config.cloud_provider)
-        except Exception:  # noqa: BLE001
-            full = self._local_generate(text)
-            words = full.split()
-            return [" ".join(words[: i + 1]) for i in range(len(words))]
+            stream = client.stream_complete(text, provider=provider)
+            async with contextlib.aclosing(stream):
+                while True:
+                    next_delta = anext(stream)
+                    if deadline is not None:
+                        next_delta = asyncio.wait_for(next_delta, deadline.remaining())
+                    try:
+                        delta = await next_delta
+                    except StopAsyncIteration:
+                        break
+                    deltas.append(delta)
+                    yield delta
+        except asyncio.TimeoutError:
+            # The request budget, not the provider, ran out; don't penalize the circuit.
+            self.logger.warning("cloud_stream_budget_exhausted emitted=%s provider=%s", bool(deltas), provider)
+            breaker.release_probe()
+            self.balancer.abandoned(backend)
+            if deltas:
+                return
+            async for delta in self._local_stream(text, complexity):
+                yield delta
+            return
+        except Exception as exc:  # noqa: BLE001
+            self.logger.warning("cloud_stream_failed error=%s emitted=%s provider=%s", exc, bool(deltas), provider)
+            breaker.record_failure()
+            self.balancer.finished(backend, time.perf_counter() - started, failed=True)
+            if deltas:
+                return
+            async for delta in self._local_stream(text, complexity):
+                yield delta
+            return
+        except BaseException:
+            breaker.release_probe()
+            self.balancer.abandoned(backend)
+            raise
+        latency = time.perf_counter() - started
+        cost_usd = client.total_cost_usd - cost_before
+        breaker.record_success()
+        self.balancer.finished(backend, latency, failed=False, cost_usd=cost_usd)
+        self.logger.info("cloud_cost_total_usd=%.6f provider=%s", client.total_cost_usd, provider)
+        if self.semantic_cache is not None:
+            prompt, context = key
+            self.semantic_cache.put(prompt, "".join(deltas), cost_usd, context)
 
-    def _local_generate(self, text: str) -> str:
-        return f"[Local reasoning] {text}"
-from jarvis_assistant.core.config import ModelConfig
+    async def _local_stream(self, text: str, complexity: float | None = None) -> AsyncIterator[str]:
+        for index, word in enumerate((await self._local_generate(text, complexity)).split()):
+            yield word if index == 0 else f" {word}"
 
+    async def _local_generate(self, text: str, complexity: float | None = None) -> str:
+        return await self._local_model_generate(text, complexity) or _local_placeholder(text)
 
-class ModelRouter:
-    def __init__(self, config: ModelConfig) -> None:
-        self.config = config
+    async def _local_model_generate(self, text: str, complexity: float | None) -> str | None:
+        """Returns a local model's answer, or None without a LocalModelManager or when it fails."""
 
-    def generate(self, text: str, route: str) -> str:
-        if route == "local":
-            return self._local_generate(text)
-        return self._cloud_generate(text)
+        if self.local_models is None:
+            return None
+        try:
+            return await self.local_models.generate(text, complexity)
+        except Exception as exc:  # noqa: BLE001
+            self.logger.warning("local_generate_failed error=%s", exc)
+            return None
+
+    def _count(self, event: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(event)
 
-    def _local_generate(self, text: str) -> str:
-        # Integrate with Ollama in production.
-        return f"[Local reasoning] {text}"
 
-    def _cloud_generate(self, text: str) -> str:
-        # Integrate with OpenAI/Groq/HF in production.
-        provider = self.config.cloud_provider
-        return f"[Cloud:{provider}] {text}"
+def _local_placeholder(text: str) -> str:
+    return f"[Local reasoning] {text}"
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import re
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+from jarvis_assistant.memory.vector_store import VectorMemory
+
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_NEGATION = re.compile(r"\b(?:not|no|never|none|nothing|nobody|neither|nor|without|cannot)\b|n['’]t\b")
+# Words whose two sides cannot be swapped without changing the request ("celsius to fahrenheit").
+_RELATIONS = frozenset(
+    {"to", "into", "onto", "from", "than", "vs", "versus", "before", "after", "over", "under", "above", "below", "per"}
+)
+_FUNCTION_WORDS = frozenset(
+    {"a", "an", "the", "is", "are", "was", "be", "do", "does", "i", "me", "my", "it", "of", "in", "on", "and", "or"}
+)
+
+Embedder = Callable[[str], list[float]]
+ExactTerms = tuple[tuple[str, ...], int, tuple[tuple[str, str, str], ...]]
+_Scope = tuple[str, ExactTerms]
+
+
+def embed_prompt(text: str, dim: int = 256) -> list[float]:
+    """Hashes words and their char trigrams into a dense `dim`-sized vector.
+
+    Word order is ignored, so reordered paraphrases map close together;
+    what order and similarity cannot tell apart is checked by `exact_terms`.
+    """
+
+    vector = [0.0] * dim
+    for word in _WORD.findall(text.lower()):
+        padded = f" {word} "
+        grams = [f"w:{word}", *(f"c:{padded[i : i + 3]}" for i in range(len(padded) - 2))]
+        for gram in grams:
+            digest = zlib.crc32(gram.encode("utf-8"))
+            vector[(digest >> 1) % dim] += 1.0 if digest & 1 else -1.0
+    return vector
+
+
+def exact_terms(text: str) -> ExactTerms:
+    """Returns the numbers in `text` in order, its negation count, and its relations.
+
+    A relation is a word such as "to" or "than" with the nearest content word
+    on each side. Prompts differing only in these ("2 plus 2" and "3 plus 3",
+    "buy" and "not buy", "celsius to fahrenheit" and "fahrenheit to celsius")
+    embed almost identically but need different answers.
+    """
+
+    lowered = text.lower()
+    words = _WORD.findall(lowered)
+    content = [word not in _RELATIONS and word not in _FUNCTION_WORDS for word in words]
+    relations = []
+    for index, word in enumerate(words):
+        if word in _RELATIONS:
+            before = next((words[i] for i in range(index - 1, -1, -1) if content[i]), "")
+            after = next((words[i] for i in range(index + 1, len(words)) if content[i]), "")
+            relations.append((before, word, after))
+    return tuple(_NUMBER.findall(lowered)), len(_NEGATION.findall(lowered)), tuple(relations)
+
+
+@dataclass(slots=True)
+class _CachedAnswer:
+    """Cached completion with its expiry and the cost a hit saves."""
+
+    expires_at: float
+    answer: str
+    cost_usd: float
+
+
+class SemanticCache:
+    """Bounded TTL cache of cloud answers keyed by prompt similarity.
+
+    Prompts are embedded and indexed in a VectorMemory per `context` and
+    `exact_terms`; a lookup returns the answer of the nearest prompt stored
+    with the same context and exact terms when its cosine similarity
+    reaches `threshold`. Callers pass the bare request as the prompt and
+    anything else that shapes the answer (such as a digest of the
+    conversation turns sent with it) as the context, so shared prompt
+    prefixes never make unrelated requests look alike. Entries are evicted
+    least recently used beyond `max_entries`. Hits, misses, saved cost and
+    lookup latency are reported to `metrics`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        threshold: float = 0.9,
+        embed: Embedder = embed_prompt,
+        metrics: MetricsCollector | None = None,
+        name: str = "semantic_cache",
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.embed = embed
+        self.metrics = metrics
+        self.name = name
+        self._memories: dict[_Scope, VectorMemory] = {}
+        self._entries: OrderedDict[tuple[_Scope, int], _CachedAnswer] = OrderedDict()
+
+    def get(self, prompt: str, context: str = "") -> str | None:
+        """Returns the answer cached for the most similar prompt in `context`, if similar enough."""
+
+        if self.metrics is None:
+            return self._lookup(prompt, context)
+        with self.metrics.time_block(f"{self.name}.lookup"):
+            return self._lookup(prompt, context)
+
+    def put(self, prompt: str, answer: str, cost_usd: float, context: str = "") -> None:
+        """Stores an answer and the provider cost a future hit will save."""
+
+        if self.max_entries <= 0:
+            return
+        scope = (context, exact_terms(prompt))
+        memory = self._memories.setdefault(scope, VectorMemory())
+        item_id = memory.add(self.embed(prompt), prompt)
+        self._entries[(scope, item_id)] = _CachedAnswer(time.monotonic() + self.ttl_seconds, answer, cost_usd)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._forget(evicted)
+            self._count("evictions")
+
+    def clear(self) -> None:
+        self._memories.clear()
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, prompt: str, context: str) -> str | None:
+        scope = (context, exact_terms(prompt))
+        memory = self._memories.get(scope)
+        if memory is None:
+            self._count("misses")
+            return None
+        for item_id, score, _ in memory.nearest(self.embed(prompt), limit=1):
+            if score < self.threshold:
+                break
+            key = (scope, item_id)
+            entry = self._entries[key]
+            if time.monotonic() >= entry.expires_at:
+                del self._entries[key]
+                self._forget(key)
+                self._count("expirations")
+                break
+            self._entries.move_to_end(key)
+            self._count("hits")
+            self._count("saved_cost_usd", entry.cost_usd)
+            return entry.answer
+        self._count("misses")
+        return None
+
+    def _forget(self, key: tuple[_Scope, int]) -> None:
+        scope, item_id = key
+        memory = self._memories[scope]
+        memory.remove(item_id)
+        if not len(memory):
+            del self._memories[scope]
+
+    def _count(self, event: str, amount: float = 1.0) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(f"{self.name}.{event}", amount)
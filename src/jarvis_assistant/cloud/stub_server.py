@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import random
+from types import TracebackType
+
+
+class StubProviderServer:
+    """Local HTTP/1.1 stand-in for a cloud completion provider.
+
+    Serves `POST /v1/complete` with a JSON body `{"prompt", "provider"}`,
+    answering `{"text", "cost_usd"}`, and `POST /v1/complete_batch` with
+    `{"prompts", "provider"}`, answering `{"results": [...]}` with one such
+    object per prompt. `POST /v1/complete_stream` takes the same body as
+    `/v1/complete` and answers with chunked newline-delimited JSON: one
+    `{"delta"}` object per word, then `{"cost_usd"}`. Responses are sent
+    after `latency_seconds` plus up to `jitter_seconds` of random delay.
+    Each new connection first waits `handshake_seconds` to stand in for TCP
+    and TLS setup against a remote host. Connections are kept alive until
+    idle for `keepalive_seconds`.
+    Pipelined requests are processed concurrently and answered in order, so
+    the pooled transport can be tested and benchmarked offline.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.05,
+        jitter_seconds: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        handshake_seconds: float = 0.0,
+        keepalive_seconds: float = 30.0,
+        seed: int | None = None,
+    ) -> None:
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.handshake_seconds = handshake_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self._handlers: set[asyncio.Task[None]] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> StubProviderServer:
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        """Stops accepting connections and drops the open ones."""
+
+        if self._server is None:
+            return
+        self._server.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> StubProviderServer:
+        return await self.start()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        handler = asyncio.current_task()
+        self._handlers.add(handler)  # type: ignore[arg-type]
+        self.connections += 1
+        pending: asyncio.Queue[asyncio.Task[bytes] | None] = asyncio.Queue()
+        responder = asyncio.create_task(self._respond_in_order(pending, writer))
+        try:
+            await asyncio.sleep(self.handshake_seconds)
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), timeout=self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.requests += 1
+                close = headers.get("connection", "").lower() == "close"
+                pending.put_nowait(asyncio.create_task(self._handle(request_line, body, close)))
+                if close:
+                    break
+            pending.put_nowait(None)
+            await responder
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away or the server is closing; stop serving this connection quietly.
+            responder.cancel()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                await responder
+        finally:
+            writer.close()
+            self._handlers.discard(handler)  # type: ignore[arg-type]
+
+    async def _respond_in_order(
+        self, pending: asyncio.Queue[asyncio.Task[bytes] | None], writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while (response := await pending.get()) is not None:
+                writer.write(await response)
+                await writer.drain()
+        finally:
+            while not pending.empty():
+                if (response := pending.get_nowait()) is not None:
+                    response.cancel()
+
+    async def _handle(self, request_line: bytes, body: bytes, close: bool) -> bytes:
+        await asyncio.sleep(self.latency_seconds + self._rng.uniform(0.0, self.jitter_seconds))
+        status, payload = self._respond(request_line, body)
+        if status.startswith("200") and _target(request_line) == "/v1/complete_stream":
+            framing = "Content-Type: application/x-ndjson\r\nTransfer-Encoding: chunked"
+            lines = payload.splitlines(keepends=True)
+            payload = b"".join(b"%x\r\n%s\r\n" % (len(line), line) for line in lines) + b"0\r\n\r\n"
+        else:
+            framing = f"Content-Type: application/json\r\nContent-Length: {len(payload)}"
+        return (
+            f"HTTP/1.1 {status}\r\n{framing}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode("latin-1")
+            + payload
+        )
+
+    def _respond(self, request_line: bytes, body: bytes) -> tuple[str, bytes]:
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        if method != "POST" or target not in {"/v1/complete", "/v1/complete_batch", "/v1/complete_stream"}:
+            return "404 Not Found", b'{"error": "not found"}'
+        try:
+            request = json.loads(body)
+            provider = str(request.get("provider", "stub"))
+            if target == "/v1/complete":
+                payload: object = _completion(str(request["prompt"]), provider)
+            elif target == "/v1/complete_stream":
+                return "200 OK", _stream_events(str(request["prompt"]), provider)
+            else:
+                payload = {"results": [_completion(str(prompt), provider) for prompt in request["prompts"]]}
+        except (ValueError, KeyError, TypeError):
+            return "400 Bad Request", b'{"error": "invalid request"}'
+        return "200 OK", json.dumps(payload).encode("utf-8")
+
+
+def _completion(prompt: str, provider: str) -> dict[str, object]:
+    return {"text": f"[Cloud:{provider}] {prompt}", "cost_usd": max(1, len(prompt.split())) * 0.00001}
+
+
+def _stream_events(prompt: str, provider: str) -> bytes:
+    completion = _completion(prompt, provider)
+    words = str(completion["text"]).split()
+    events = [{"delta": word if index == 0 else f" {word}"} for index, word in enumerate(words)]
+    events.append({"cost_usd": completion["cost_usd"]})
+    return b"".join(json.dumps(event).encode("utf-8") + b"\n" for event in events)
+
+
+def _target(request_line: bytes) -> str:
+    return request_line.decode("latin-1").split(" ", 2)[1]
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ssl
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+HostKey = tuple[str, str, int]
+
+
+@dataclass(slots=True)
+class HttpRequest:
+    """One HTTP/1.1 request for the pooled transport."""
+
+    method: str
+    url: str
+    body: bytes = b""
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class HttpResponse:
+    """Parsed HTTP/1.1 response."""
+
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+
+@dataclass(slots=True)
+class StreamedResponse:
+    """HTTP/1.1 response whose body is read as it arrives."""
+
+    status: int
+    headers: dict[str, str]
+    method: str
+    reader: asyncio.StreamReader
+    complete: bool = False
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yields the body chunk by chunk if it is chunked, otherwise in one piece."""
+
+        async for chunk in _body_chunks(self.reader, self.method, self.status, self.headers):
+            yield chunk
+        self.complete = True
+
+
+@dataclass(slots=True)
+class _Connection:
+    """Open keep-alive connection and when it was last returned to the pool."""
+
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    idle_since: float = 0.0
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _HostPool:
+    """Idle connections and the concurrency limit of one scheme/host/port."""
+
+    def __init__(self, max_connections: int) -> None:
+        self.slots = asyncio.Semaphore(max_connections)
+        self.idle: deque[_Connection] = deque()
+
+
+class HttpTransport:
+    """Pooled keep-alive HTTP/1.1 client for cloud providers.
+
+    Connections are reused per scheme/host/port, so TCP and TLS setup is
+    paid once per connection instead of once per call. At most
+    `max_connections_per_host` requests are in flight per host; further
+    callers wait for a slot. Idle connections beyond `max_idle_per_host`
+    (default: the connection limit) or older than `idle_timeout_seconds` are
+    closed. `pipeline` writes several requests on one connection before
+    reading the responses in order, and `stream` hands out a response body
+    as it arrives.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 8,
+        max_idle_per_host: int | None = None,
+        idle_timeout_seconds: float = 30.0,
+        ssl_context: ssl.SSLContext | None = None,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        self.max_connections_per_host = max_connections_per_host
+        self.max_idle_per_host = max_connections_per_host if max_idle_per_host is None else max_idle_per_host
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.ssl_context = ssl_context
+        self.metrics = metrics
+        self._pools: dict[HostKey, _HostPool] = {}
+
+    async def request(self, request: HttpRequest) -> HttpResponse:
+        """Sends one request on a pooled connection."""
+
+        responses = await self.pipeline([request])
+        return responses[0]
+
+    async def pipeline(self, requests: Sequence[HttpRequest]) -> list[HttpResponse]:
+        """Sends requests back to back on one connection and reads the responses in order.
+
+        All requests must target the same host. If a pooled idle connection
+        turns out to be stale (reset, or closed before or while answering),
+        a new connection is opened once and the requests not yet answered are
+        replayed on it. HTTP/1.1 cannot tell whether the server processed
+        those, so only pipeline requests that are safe to retry.
+        """
+
+        if not requests:
+            return []
+        key = _host_key(requests[0].url)
+        if any(_host_key(request.url) != key for request in requests[1:]):
+            raise ValueError("Pipelined requests must target the same host.")
+        pool = self._pool(key)
+        responses: list[HttpResponse] = []
+        async with pool.slots:
+            connection, reused = await self._acquire(key, pool)
+            try:
+                return await self._exchange(pool, connection, key, requests, responses)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+            self._count("stale")
+            return await self._exchange(pool, await self._connect(key), key, requests[len(responses) :], responses)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, request: HttpRequest) -> AsyncIterator[StreamedResponse]:
+        """Sends one request and yields its response once the head has arrived.
+
+        The body is read through `StreamedResponse.chunks` while the
+        connection is held; it returns to the pool only if the body was read
+        to the end. A stale pooled connection is replaced once, as long as no
+        part of the response has been read yet.
+        """
+
+        key = _host_key(request.url)
+        pool = self._pool(key)
+        async with pool.slots:
+            connection, reused = await self._acquire(key, pool)
+            try:
+                status, headers = await self._start(connection, key, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+                self._count("stale")
+                connection = await self._connect(key)
+                status, headers = await self._start(connection, key, request)
+            response = StreamedResponse(status, headers, request.method, connection.reader)
+            try:
+                yield response
+            finally:
+                self._release(pool, connection, response.complete and response.keep_alive)
+
+    def close(self) -> None:
+        """Closes all idle connections."""
+
+        for pool in self._pools.values():
+            while pool.idle:
+                pool.idle.popleft().close()
+
+    def idle_connections(self) -> int:
+        return sum(len(pool.idle) for pool in self._pools.values())
+
+    def _pool(self, key: HostKey) -> _HostPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _HostPool(self.max_connections_per_host)
+        return pool
+
+    async def _acquire(self, key: HostKey, pool: _HostPool) -> tuple[_Connection, bool]:
+        now = time.monotonic()
+        while pool.idle:
+            connection = pool.idle.pop()
+            if now - connection.idle_since < self.idle_timeout_seconds and not connection.reader.at_eof():
+                self._count("reused")
+                return connection, True
+            connection.close()
+            self._count("expired")
+        return await self._connect(key), False
+
+    async def _connect(self, key: HostKey) -> _Connection:
+        scheme, host, port = key
+        tls = (self.ssl_context or ssl.create_default_context()) if scheme == "https" else None
+        reader, writer = await asyncio.open_connection(host, port, ssl=tls)
+        self._count("opened")
+        return _Connection(reader, writer)
+
+    async def _exchange(
+        self,
+        pool: _HostPool,
+        connection: _Connection,
+        key: HostKey,
+        requests: Sequence[HttpRequest],
+        responses: list[HttpResponse],
+    ) -> list[HttpResponse]:
+        """Pipelines `requests` on `connection`, appending each response to `responses` as it is read."""
+
+        reusable = False
+        try:
+            connection.writer.write(b"".join(_encode(request, key) for request in requests))
+            await connection.writer.drain()
+            for request in requests:
+                responses.append(await _read_response(connection.reader, request.method))
+            reusable = responses[-1].keep_alive
+            return responses
+        finally:
+            self._release(pool, connection, reusable)
+
+    async def _start(self, connection: _Connection, key: HostKey, request: HttpRequest) -> tuple[int, dict[str, str]]:
+        try:
+            connection.writer.write(_encode(request, key))
+            await connection.writer.drain()
+            return await _read_head(connection.reader)
+        except BaseException:
+            connection.close()
+            raise
+
+    def _release(self, pool: _HostPool, connection: _Connection, reusable: bool) -> None:
+        if reusable and len(pool.idle) < self.max_idle_per_host:
+            connection.idle_since = time.monotonic()
+            pool.idle.append(connection)
+        else:
+            connection.close()
+
+    def _count(self, event: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(f"transport.connections_{event}")
+
+
+def _host_key(url: str) -> HostKey:
+    parts = urlsplit(url)
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url}")
+    return parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)
+
+
+def _encode(request: HttpRequest, key: HostKey) -> bytes:
+    parts = urlsplit(request.url)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    _, host, port = key
+    headers = {"Host": f"{host}:{port}", "Content-Length": str(len(request.body)), **request.headers}
+    lines = [f"{request.method} {target} HTTP/1.1", *(f"{name}: {value}" for name, value in headers.items())]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + request.body
+
+
+async def _read_response(reader: asyncio.StreamReader, method: str) -> HttpResponse:
+    status, headers = await _read_head(reader)
+    body = b"".join([chunk async for chunk in _body_chunks(reader, method, status, headers)])
+    return HttpResponse(status=status, headers=headers, body=body)
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[int, dict[str, str]]:
+    status_line = await reader.readline()
+    if not status_line.endswith(b"\n"):
+        # Empty or cut off: the server closed the connection before answering.
+        raise ConnectionResetError("Connection closed before response.")
+    status = int(status_line.split(b" ", 2)[1])
+    headers: dict[str, str] = {}
+    while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _body_chunks(
+    reader: asyncio.StreamReader, method: str, status: int, headers: dict[str, str]
+) -> AsyncIterator[bytes]:
+    if method == "HEAD" or status in {204, 304} or 100 <= status < 200:
+        return
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while size := int((await reader.readline()).split(b";", 1)[0], 16):
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+        while (await reader.readline()) not in {b"\r\n", b"\n", b""}:
+            pass
+    elif "content-length" in headers:
+        yield await reader.readexactly(int(headers["content-length"]))
+    else:
+        # The body runs to EOF, so the connection cannot carry another response.
+        headers["connection"] = "close"
+        yield await reader.read()
@@ -2,29 +2,53 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 
 from jarvis_assistant.ai.emotion import AdaptivePersonality, EmotionalToneDetector
 from jarvis_assistant.ai.nlp_engine import NLPEngine
 from jarvis_assistant.ai.reasoning import ReasoningEngine
+from jarvis_assistant.ai.text_analysis import TextFeatures, analyze_text, split_clauses
 from jarvis_assistant.automation.executor import AutomationExecutor
-from jarvis_assistant.contracts.results import ActionResult, ErrorInfo, ExecutionReport, ResultStatus
-from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker
+from jarvis_assistant.contracts.results import (
+    ActionResult,
+    ErrorInfo,
+    ExecutionReport,
+    ReasoningResult,
+    ResultStatus,
+)
+from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker, CircuitBreakerGroup
+from jarvis_assistant.infrastructure.deadline import Deadline
 from jarvis_assistant.infrastructure.errors import ErrorBoundary
 from jarvis_assistant.infrastructure.logging import new_correlation_id, timed_operation
 from jarvis_assistant.infrastructure.metrics import MetricsCollector
 from jarvis_assistant.infrastructure.rate_limiter import SlidingWindowLimiter
+from jarvis_assistant.infrastructure.singleflight import SingleFlight
+from jarvis_assistant.infrastructure.ttl_cache import LRUTTLCache
 from jarvis_assistant.memory.context_manager import ContextManager
-from jarvis_assistant.runtime.worker_pool import AsyncWorkerPool
-from jarvis_assistant.ai.nlp_engine import NLPEngine
-from jarvis_assistant.ai.reasoning import ReasoningEngine
-from jarvis_assistant.automation.executor import AutomationExecutor
-from jarvis_assistant.memory.context_manager import ContextManager
+from jarvis_assistant.runtime.worker_pool import AsyncWorkerPool, Priority
 from jarvis_assistant.security.permissions import PermissionManager
 
 from .config import AppConfig
-from .decision_engine import ModeDecisionEngine
-from .models import AssistantResponse
+from .decision_engine import Decision, ModeDecisionEngine
+from .models import AssistantResponse, IntentResult
+
+
+# Request tokens, execution mode, route and the digest of the conversation context sent with the request.
+ResponseCacheKey = tuple[str, str, str, str]
+
+
+@dataclass(slots=True)
+class RequestAnalysis:
+    """Output of the shared analysis stage for one request."""
+
+    features: TextFeatures
+    intent: IntentResult
+    tone: str
+    tone_meta: dict[str, bool]
+    complexity: float | None
+    compiled_plan: ReasoningResult | None = None
 
 
 class JarvisAssistant:
@@ -41,12 +65,13 @@ class JarvisAssistant:
         decision_engine: ModeDecisionEngine,
         error_boundary: ErrorBoundary,
         worker_pool: AsyncWorkerPool,
-        circuit_breaker: CircuitBreaker,
+        circuit_breaker: CircuitBreaker | CircuitBreakerGroup,
         request_limiter: SlidingWindowLimiter,
         metrics: MetricsCollector,
         tone_detector: EmotionalToneDetector,
         personality: AdaptivePersonality,
         logger: logging.Logger,
+        response_cache: LRUTTLCache[ResponseCacheKey, ActionResult] | None = None,
     ) -> None:
         self.config = config
         self.nlp = nlp
@@ -63,18 +88,30 @@ class JarvisAssistant:
         self.tone_detector = tone_detector
         self.personality = personality
         self.logger = logger
+        self.response_cache = response_cache
+        self._inflight: SingleFlight[tuple[str, str], AssistantResponse] = SingleFlight(
+            metrics=metrics, name="singleflight.handle_text"
+        )
 
     async def handle_text(self, text: str) -> AssistantResponse:
-        """Processes input text asynchronously without blocking UI thread."""
+        """Processes input text asynchronously without blocking UI thread.
+
+        Identical requests that arrive while one is already in flight share its
+        result instead of running the pipeline again.
+        """
 
         if not self.request_limiter.allow():
-            return AssistantResponse(
-                text="Request limit exceeded. Please wait.",
-                executed=False,
-                metadata={"status": ResultStatus.FAILED.value, "code": "REQUEST_RATE_LIMIT"},
-            )
+            return self._rate_limited_response()
+
+        key = (" ".join(text.lower().split()), self.config.execution_mode.value)
+        response, shared = await self._inflight.do(key, lambda: self._handle_text(text))
+        if shared:
+            return replace(response, metadata={**response.metadata, "coalesced": True})
+        return response
 
+    async def _handle_text(self, text: str) -> AssistantResponse:
         started_at = datetime.now(tz=timezone.utc)
+        deadline = Deadline.after(self.config.request_timeout_seconds)
         correlation_id = new_correlation_id()
 
         with timed_operation(self.logger, "handle_text"):
@@ -84,101 +121,396 @@ class JarvisAssistant:
             tone = "neutral"
             tone_meta: dict[str, bool] = {"urgent": False, "stressed": False}
             try:
-                with self.metrics.time_block("nlp.parse"):
-                    intent = await asyncio.wait_for(
-                        self.worker_pool.run_cpu(self.nlp.parse, text),
-                        timeout=self.config.request_timeout_seconds,
+                with self.metrics.time_block("analysis"):
+                    analysis = await asyncio.wait_for(
+                        self.worker_pool.run_cpu(self.analyze, text),
+                        timeout=deadline.remaining(),
                     )
 
-                tone = self.tone_detector.detect(text)
-                tone_meta = self.tone_detector.detect_urgency_and_stress(text)
+                intent = analysis.intent
+                tone = analysis.tone
+                tone_meta = analysis.tone_meta
+                priority = Priority.URGENT if tone_meta["urgent"] else Priority.NORMAL
 
-                with self.metrics.time_block("reasoning.complexity"):
-                    complexity = await asyncio.wait_for(
-                        self.worker_pool.run_cpu(self.reasoning.estimate_complexity, text, intent),
-                        timeout=self.config.request_timeout_seconds,
-                    )
+                if analysis.compiled_plan is not None:
+                    decision_route, decision_reason = "local", "compiled_plan"
+                    action_result = await self._execute(analysis.compiled_plan, deadline, priority)
+                else:
+                    decision = self._decide(analysis)
+                    decision_route = decision.route
+                    decision_reason = decision.reason
 
-                decision = self.decision_engine.decide(
-                    mode=self.config.execution_mode,
-                    intent=intent,
-                    is_sensitive=self.permissions.is_sensitive_intent(intent.intent),
-                    complexity_score=complexity,
-                    circuit_state=self.circuit_breaker.state(),
-                )
+                    cache_key = self._cache_key(text, analysis, decision.route)
+                    action_result = self._cached_result(intent, cache_key)
+                    if action_result is None:
+                        with self.metrics.time_block("reasoning.plan"):
+                            reasoning_result = await asyncio.wait_for(
+                                self.reasoning.create_plan(
+                                    text=text, intent=intent, route=decision.route, deadline=deadline
+                                ),
+                                timeout=deadline.remaining(),
+                            )
 
-                decision_route = decision.route
-                decision_reason = decision.reason
+                        if reasoning_result.status != ResultStatus.SUCCESS:
+                            return self._reasoning_failure_response(
+                                reasoning_result, correlation_id, decision_route, tone, tone_meta, started_at
+                            )
 
-                with self.metrics.time_block("reasoning.plan"):
-                    reasoning_result = await asyncio.wait_for(
-                        self.reasoning.create_plan(text=text, intent=intent, route=decision.route),
-                        timeout=self.config.request_timeout_seconds,
-                    )
+                        action_result = await self._execute(reasoning_result, deadline, priority)
+                        self._remember_result(cache_key, intent, reasoning_result, action_result)
 
-                if reasoning_result.status != ResultStatus.SUCCESS:
-                    report = ExecutionReport(
-                        status=reasoning_result.status,
-                        confidence=reasoning_result.confidence,
-                        correlation_id=correlation_id,
-                        route=decision_route,
-                        error=reasoning_result.error,
-                        metadata={"stage": "reasoning", "tone": tone, **tone_meta},
-                        started_at=started_at,
-                        finished_at=datetime.now(tz=timezone.utc),
+            except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+                action_result = self._failure_result(exc)
+            except Exception as exc:  # noqa: BLE001
+                self.logger.exception("handle_text_unhandled error=%s", exc)
+                action_result = self._failure_result(exc)
+
+            return self._finalize(
+                text=text,
+                intent=intent,
+                action_result=action_result,
+                tone=tone,
+                tone_meta=tone_meta,
+                correlation_id=correlation_id,
+                route=decision_route,
+                reason=decision_reason,
+                started_at=started_at,
+                metrics_snapshot=None if decision_reason == "compiled_plan" else self.metrics.snapshot(),
+            )
+
+    async def handle_batch(self, texts: Sequence[str]) -> list[AssistantResponse]:
+        """Processes many utterances, running each CPU stage once for the whole batch.
+
+        Rate limiting and circuit checks still apply per item, and responses are
+        returned in input order.
+        """
+
+        responses: list[AssistantResponse | None] = [None] * len(texts)
+        admitted: list[int] = []
+        for index in range(len(texts)):
+            if self.request_limiter.allow():
+                admitted.append(index)
+            else:
+                responses[index] = self._rate_limited_response()
+        if not admitted:
+            return [response for response in responses if response is not None]
+
+        started_at = datetime.now(tz=timezone.utc)
+        deadline = Deadline.after(self.config.request_timeout_seconds)
+        batch_id = new_correlation_id()
+        batch = [texts[index] for index in admitted]
+        size = len(batch)
+
+        intents: list[IntentResult | None] = [None] * size
+        tones = ["neutral"] * size
+        tone_metas: list[dict[str, bool]] = [{"urgent": False, "stressed": False} for _ in range(size)]
+        routes = ["local"] * size
+        reasons = ["unavailable"] * size
+        results: list[ActionResult | None] = [None] * size
+        cache_keys: dict[int, ResponseCacheKey] = {}
+        plans: dict[int, ReasoningResult | BaseException] = {}
+        rejected: dict[int, ReasoningResult] = {}
+
+        with timed_operation(self.logger, f"handle_batch size={size}"):
+            try:
+                with self.metrics.time_block("analysis_batch"):
+                    analyses = await asyncio.wait_for(
+                        self.worker_pool.run_cpu(self.analyze_batch, batch, priority=Priority.BULK),
+                        timeout=deadline.remaining(),
                     )
-                    return self._response_from_report(report)
 
-                with self.metrics.time_block("executor.run"):
-                    action_result = await asyncio.wait_for(
-                        self.worker_pool.run_cpu(self.executor.execute_plan, reasoning_result),
-                        timeout=self.config.request_timeout_seconds,
+                for pos, analysis in enumerate(analyses):
+                    intents[pos] = analysis.intent
+                    tones[pos] = analysis.tone
+                    tone_metas[pos] = analysis.tone_meta
+                    if analysis.compiled_plan is not None:
+                        reasons[pos] = "compiled_plan"
+                        plans[pos] = analysis.compiled_plan
+                        continue
+                    decision = self._decide(analysis)
+                    routes[pos] = decision.route
+                    reasons[pos] = decision.reason
+                    cache_keys[pos] = self._cache_key(batch[pos], analysis, decision.route)
+                    results[pos] = self._cached_result(analysis.intent, cache_keys[pos])
+
+                pending = [pos for pos in range(size) if results[pos] is None and pos not in plans]
+                with self.metrics.time_block("reasoning.plan_batch"):
+                    planned = await asyncio.wait_for(
+                        asyncio.gather(
+                            *(
+                                self.reasoning.create_plan(
+                                    text=batch[pos],
+                                    intent=analyses[pos].intent,
+                                    route=routes[pos],
+                                    deadline=deadline,
+                                )
+                                for pos in pending
+                            ),
+                            return_exceptions=True,
+                        ),
+                        timeout=deadline.remaining(),
                     )
+                plans.update(zip(pending, planned))
 
-            except asyncio.TimeoutError:
-                action_result = ActionResult(
-                    status=ResultStatus.TIMEOUT,
-                    confidence=0.0,
-                    message="Request timed out.",
-                    error=ErrorInfo(code="TIMEOUT", message="Operation timed out."),
-                )
-            except asyncio.CancelledError:
-                action_result = ActionResult(
-                    status=ResultStatus.CANCELLED,
-                    confidence=0.0,
-                    message="Request cancelled.",
-                    error=ErrorInfo(code="CANCELLED", message="Operation cancelled."),
-                )
+                executable: list[int] = []
+                for pos, plan in plans.items():
+                    if isinstance(plan, BaseException):
+                        results[pos] = self._failure_result(plan)
+                    elif plan.status != ResultStatus.SUCCESS:
+                        rejected[pos] = plan
+                    else:
+                        executable.append(pos)
+
+                if executable:
+                    with self.metrics.time_block("executor.run_batch"):
+                        executed = await asyncio.wait_for(
+                            self.worker_pool.run_cpu(
+                                self.executor.execute_plans,
+                                [plans[pos] for pos in executable],
+                                deadline,
+                                priority=Priority.BULK,
+                            ),
+                            timeout=deadline.remaining(),
+                        )
+                    for pos, action_result in zip(executable, executed):
+                        results[pos] = action_result
+                        if pos in cache_keys:
+                            self._remember_result(cache_keys[pos], analyses[pos].intent, plans[pos], action_result)
+
+            except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+                results = [result or self._failure_result(exc) for result in results]
             except Exception as exc:  # noqa: BLE001
-                self.logger.exception("handle_text_unhandled error=%s", exc)
-                action_result = ActionResult(
-                    status=ResultStatus.FAILED,
-                    confidence=0.0,
-                    message="Execution failed safely.",
-                    error=ErrorInfo(code="HANDLE_TEXT_FAILURE", message=str(exc)),
+                self.logger.exception("handle_batch_unhandled error=%s", exc)
+                results = [result or self._failure_result(exc) for result in results]
+
+            metrics_snapshot = self.metrics.snapshot()
+            for pos, index in enumerate(admitted):
+                if pos in rejected:
+                    responses[index] = self._reasoning_failure_response(
+                        rejected[pos], f"{batch_id}:{pos}", routes[pos], tones[pos], tone_metas[pos], started_at
+                    )
+                    continue
+                responses[index] = self._finalize(
+                    text=batch[pos],
+                    intent=intents[pos],
+                    action_result=results[pos] or self._failure_result(RuntimeError("Item was not processed.")),
+                    tone=tones[pos],
+                    tone_meta=tone_metas[pos],
+                    correlation_id=f"{batch_id}:{pos}",
+                    route=routes[pos],
+                    reason=reasons[pos],
+                    started_at=started_at,
+                    metrics_snapshot=metrics_snapshot,
                 )
 
-            action_result.message = self.personality.apply_style(action_result.message, tone)
-            action_result.metadata.update({"tone": tone, **tone_meta})
-            if intent is not None:
-                self.context.record_interaction(text=text, intent=intent, result=action_result)
+        return [response for response in responses if response is not None]
 
-            report = ExecutionReport(
-                status=action_result.status,
-                confidence=action_result.confidence,
-                correlation_id=correlation_id,
-                route=decision_route,
-                metadata={
-                    "reason": decision_reason,
-                    **action_result.metadata,
-                    "metrics": self.metrics.snapshot(),
-                    "circuit_open": self.circuit_breaker.state().is_open,
-                },
-                error=action_result.error,
-                started_at=started_at,
-                finished_at=datetime.now(tz=timezone.utc),
+    def analyze(self, text: str) -> RequestAnalysis:
+        """Runs intent, tone and complexity analysis over one shared tokenization."""
+
+        features = analyze_text(text)
+        intent = self.nlp.parse(text, features)
+        tone = self.tone_detector.score(text, features)
+        compiled_plan = self._compiled_plan(text, intent)
+        return RequestAnalysis(
+            features=features,
+            intent=intent,
+            tone=tone.tone,
+            tone_meta=tone.markers(),
+            complexity=None if compiled_plan else self.reasoning.estimate_complexity(text, intent, features),
+            compiled_plan=compiled_plan,
+        )
+
+    def analyze_batch(self, texts: Sequence[str]) -> list[RequestAnalysis]:
+        """Batch variant of `analyze` for a single worker dispatch."""
+
+        features = [analyze_text(text) for text in texts]
+        intents = self.nlp.parse_batch(texts, features)
+        compiled_plans = [self._compiled_plan(text, intent) for text, intent in zip(texts, intents)]
+        routed = [pos for pos, plan in enumerate(compiled_plans) if plan is None]
+        complexities: list[float | None] = [None] * len(texts)
+        estimated = self.reasoning.estimate_complexity_batch(
+            [texts[pos] for pos in routed], [intents[pos] for pos in routed], [features[pos] for pos in routed]
+        )
+        for pos, complexity in zip(routed, estimated):
+            complexities[pos] = complexity
+        tones = self.tone_detector.detect_batch(texts, features)
+        return [
+            RequestAnalysis(
+                features=feats,
+                intent=intent,
+                tone=tone.tone,
+                tone_meta=tone.markers(),
+                complexity=complexity,
+                compiled_plan=compiled_plan,
+            )
+            for feats, intent, tone, complexity, compiled_plan in zip(
+                features, intents, tones, complexities, compiled_plans
+            )
+        ]
+
+    def _compiled_plan(self, text: str, intent: IntentResult) -> ReasoningResult | None:
+        """Returns the precompiled plan, split into parallel steps for compound commands."""
+
+        if not self.config.fast_path_enabled:
+            return None
+        plan = self.reasoning.compiled_plan(text, intent)
+        if plan is None:
+            return None
+        clauses = split_clauses(text)
+        if len(clauses) > 1:
+            intents = self.nlp.parse_batch([clause for clause, _ in clauses])
+            return self.reasoning.compiled_compound_plan(clauses, intents) or plan
+        return plan
+
+    def _decide(self, analysis: RequestAnalysis) -> Decision:
+        return self.decision_engine.decide(
+            mode=self.config.execution_mode,
+            intent=analysis.intent,
+            is_sensitive=self.permissions.is_sensitive_intent(analysis.intent.intent),
+            complexity_score=analysis.complexity or 0.0,
+            circuit_state=self.circuit_breaker.state(),
+        )
+
+    async def _execute(self, plan: ReasoningResult, deadline: Deadline, priority: Priority) -> ActionResult:
+        with self.metrics.time_block("executor.run"):
+            return await asyncio.wait_for(
+                self.worker_pool.run_cpu(self.executor.execute_plan, plan, deadline, priority=priority),
+                timeout=deadline.remaining(),
             )
-            return self._response_from_report(report)
+
+    def _cache_key(self, text: str, analysis: RequestAnalysis, route: str) -> ResponseCacheKey:
+        return (
+            " ".join(analysis.features.tokens),
+            self.config.execution_mode.value,
+            route,
+            self.reasoning.context_digest(text, route),
+        )
+
+    def _cached_result(self, intent: IntentResult, key: ResponseCacheKey) -> ActionResult | None:
+        """Returns a fresh copy of a cached result when intent is replay-safe."""
+
+        if self.response_cache is None or not self.permissions.is_replay_safe(intent.intent):
+            return None
+        cached = self.response_cache.get(key)
+        if cached is None:
+            return None
+        return replace(
+            cached,
+            metadata={**cached.metadata, "cache": "hit"},
+            timestamp=datetime.now(tz=timezone.utc),
+        )
+
+    def _remember_result(
+        self,
+        key: ResponseCacheKey,
+        intent: IntentResult,
+        plan: ReasoningResult,
+        result: ActionResult,
+    ) -> None:
+        """Caches successful response-only results; side-effecting plans are never stored.
+
+        Results are stored under the digest of the conversation context the
+        plan was actually generated with, which may differ from the one looked
+        up if the conversation moved on meanwhile.
+        """
+
+        if self.response_cache is None or result.status != ResultStatus.SUCCESS:
+            return
+        if not self.permissions.is_replay_safe(intent.intent):
+            return
+        if any(step.get("type") != "response" for step in plan.steps):
+            return
+        key = (*key[:3], str(plan.metadata.get("context_digest", key[3])))
+        self.response_cache.put(key, replace(result, metadata=dict(result.metadata)))
+
+    def _finalize(
+        self,
+        text: str,
+        intent: IntentResult | None,
+        action_result: ActionResult,
+        tone: str,
+        tone_meta: dict[str, bool],
+        correlation_id: str,
+        route: str,
+        reason: str,
+        started_at: datetime,
+        metrics_snapshot: dict[str, dict[str, float]] | None,
+    ) -> AssistantResponse:
+        """Builds the response; `metrics_snapshot` is omitted for fast-path requests."""
+
+        action_result.message = self.personality.apply_style(action_result.message, tone)
+        action_result.metadata.update({"tone": tone, **tone_meta})
+        if intent is not None:
+            self.context.record_interaction(text=text, intent=intent, result=action_result)
+
+        report = ExecutionReport(
+            status=action_result.status,
+            confidence=action_result.confidence,
+            correlation_id=correlation_id,
+            route=route,
+            metadata={
+                "reason": reason,
+                **action_result.metadata,
+                **({"metrics": metrics_snapshot} if metrics_snapshot is not None else {}),
+                "worker_lanes": self.worker_pool.lane_stats(),
+                "circuit_open": self.circuit_breaker.state().is_open,
+            },
+            error=action_result.error,
+            started_at=started_at,
+            finished_at=datetime.now(tz=timezone.utc),
+        )
+        return self._response_from_report(report)
+
+    def _reasoning_failure_response(
+        self,
+        reasoning_result: ReasoningResult,
+        correlation_id: str,
+        route: str,
+        tone: str,
+        tone_meta: dict[str, bool],
+        started_at: datetime,
+    ) -> AssistantResponse:
+        report = ExecutionReport(
+            status=reasoning_result.status,
+            confidence=reasoning_result.confidence,
+            correlation_id=correlation_id,
+            route=route,
+            error=reasoning_result.error,
+            metadata={"stage": "reasoning", "tone": tone, **tone_meta},
+            started_at=started_at,
+            finished_at=datetime.now(tz=timezone.utc),
+        )
+        return self._response_from_report(report)
+
+    def _failure_result(self, exc: BaseException) -> ActionResult:
+        if isinstance(exc, asyncio.TimeoutError):
+            return ActionResult(
+                status=ResultStatus.TIMEOUT,
+                confidence=0.0,
+                message="Request timed out.",
+                error=ErrorInfo(code="TIMEOUT", message="Operation timed out."),
+            )
+        if isinstance(exc, asyncio.CancelledError):
+            return ActionResult(
+                status=ResultStatus.CANCELLED,
+                confidence=0.0,
+                message="Request cancelled.",
+                error=ErrorInfo(code="CANCELLED", message="Operation cancelled."),
+            )
+        return ActionResult(
+            status=ResultStatus.FAILED,
+            confidence=0.0,
+            message="Execution failed safely.",
+            error=ErrorInfo(code="HANDLE_TEXT_FAILURE", message=str(exc)),
+        )
+
+    def _rate_limited_response(self) -> AssistantResponse:
+        return AssistantResponse(
+            text="Request limit exceeded. Please wait.",
+            executed=False,
+            metadata={"status": ResultStatus.FAILED.value, "code": "REQUEST_RATE_LIMIT"},
+        )
 
     def _response_from_report(self, report: ExecutionReport) -> AssistantResponse:
         text = "Done." if report.status == ResultStatus.SUCCESS else "Request failed safely."
@@ -195,23 +527,4 @@ class JarvisAssistant:
                 **report.metadata,
             },
 
-    def handle_text(self, text: str) -> AssistantResponse:
-        intent = self.nlp.parse(text)
-        complexity = self.reasoning.estimate_complexity(text, intent)
-        decision = self.decision_engine.decide(
-            mode=self.config.mode,
-            intent=intent,
-            is_sensitive=self.permissions.is_sensitive_intent(intent.intent),
-            complexity_score=complexity,
-        )
-        plan = self.reasoning.create_plan(text=text, intent=intent, route=decision.route)
-        if plan.requires_confirmation and not self.permissions.confirm(plan.name):
-            return AssistantResponse(text="Cancelled by safety policy.", executed=False)
-
-        result = self.executor.execute_plan(plan)
-        self.context.record_interaction(text=text, intent=intent, result=result)
-        return AssistantResponse(
-            text=result.get("message", "Done."),
-            executed=result.get("success", False),
-            metadata={"route": decision.route, "reason": decision.reason},
         )
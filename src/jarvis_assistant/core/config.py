@@ -23,12 +23,20 @@ class AppConfig:
     log_level: str = "INFO"
     log_file: Path = Path("logs/jarvis.log")
     sqlite_path: Path = Path("data/memory.db")
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_mmap_size_bytes: int = 256 * 1024 * 1024
+    sqlite_max_readers: int = 4
+    intent_rules_path: Path | None = None
+    intent_model_path: Path | None = None
+    tone_lexicon_path: Path | None = None
     encrypted_key_file: Path = Path(".secrets/master.key")
     encrypted_data_file: Path = Path(".secrets/api_keys.enc")
 
     max_workers: int = 4
     request_timeout_seconds: float = 20.0
     plugin_timeout_seconds: float = 5.0
+    plan_max_parallel_steps: int = 4
 
     request_rate_limit_per_minute: int = 120
     cloud_rate_limit_per_minute: int = 30
@@ -37,7 +45,45 @@ class AppConfig:
 
     cloud_failure_threshold: int = 3
     cloud_cooldown_seconds: float = 30.0
+    cloud_half_open_probes: int = 1
+    cloud_latency_threshold_seconds: float | None = 8.0
+    cloud_error_rate_threshold: float | None = 0.5
+    cloud_breaker_window_seconds: float = 60.0
     cloud_provider: str = "openai"
+    cloud_fallback_providers: tuple[str, ...] = ()
+    cloud_min_budget_seconds: float = 1.0
+    cloud_endpoint: str | None = None
+    cloud_provider_endpoints: tuple[tuple[str, str], ...] = ()
+    cloud_balancing: str = "p2c"
+    cloud_max_connections_per_host: int = 8
+    cloud_keepalive_seconds: float = 30.0
+    cloud_batch_window_seconds: float = 0.0
+    cloud_batch_max_size: int = 16
+    hedge_enabled: bool = False
+    hedge_delay_seconds: float = 0.25
+    hedge_immediate_complexity: float = 0.3
+    local_model_endpoint: str | None = None
+    local_models: tuple[tuple[str, str, float], ...] = ()
+    local_model_ram_fraction: float = 0.5
+    local_model_max_loaded: int = 2
+    local_model_max_concurrent: int = 1
+    local_model_min_free_ram_gb: float = 1.0
+
+    memory_write_batch_size: int = 64
+    memory_write_max_latency_seconds: float = 0.05
+    context_max_turns: int = 256
+    context_token_budget: int = 384
+
+    response_cache_size: int = 256
+    response_cache_ttl_seconds: float = 300.0
+    semantic_cache_size: int = 256
+    semantic_cache_ttl_seconds: float = 300.0
+    semantic_cache_threshold: float = 0.9
+    fast_path_enabled: bool = True
+
+    intent_batch_size: int = 32
+    intent_batch_wait_seconds: float = 0.005
+    intent_feature_cache_size: int = 4096
 
     def validate(self) -> None:
         """Validates config values with explicit error messages."""
@@ -48,6 +94,80 @@ class AppConfig:
             raise RuntimeError("Invalid configuration: request_timeout_seconds must be > 0.")
         if self.plugin_timeout_seconds <= 0:
             raise RuntimeError("Invalid configuration: plugin_timeout_seconds must be > 0.")
+        if self.plan_max_parallel_steps < 1:
+            raise RuntimeError("Invalid configuration: plan_max_parallel_steps must be >= 1.")
+        if self.intent_rules_path is not None and not self.intent_rules_path.is_file():
+            raise RuntimeError(f"Invalid configuration: intent rules file '{self.intent_rules_path}' not found.")
+        if self.intent_model_path is not None and not self.intent_model_path.is_file():
+            raise RuntimeError(f"Invalid configuration: intent model file '{self.intent_model_path}' not found.")
+        if self.tone_lexicon_path is not None and not self.tone_lexicon_path.is_file():
+            raise RuntimeError(f"Invalid configuration: tone lexicon file '{self.tone_lexicon_path}' not found.")
+        if self.sqlite_journal_mode not in {"wal", "delete", "truncate", "persist", "memory"}:
+            raise RuntimeError(f"Invalid configuration: unsupported sqlite_journal_mode '{self.sqlite_journal_mode}'.")
+        if self.sqlite_synchronous not in {"off", "normal", "full", "extra"}:
+            raise RuntimeError(f"Invalid configuration: unsupported sqlite_synchronous '{self.sqlite_synchronous}'.")
+        if self.sqlite_mmap_size_bytes < 0:
+            raise RuntimeError("Invalid configuration: sqlite_mmap_size_bytes must be >= 0.")
+        if self.sqlite_max_readers < 1:
+            raise RuntimeError("Invalid configuration: sqlite_max_readers must be >= 1.")
+        if self.intent_batch_size < 1:
+            raise RuntimeError("Invalid configuration: intent_batch_size must be >= 1.")
+        if self.intent_batch_wait_seconds < 0:
+            raise RuntimeError("Invalid configuration: intent_batch_wait_seconds must be >= 0.")
+        if self.intent_feature_cache_size < 0:
+            raise RuntimeError("Invalid configuration: intent_feature_cache_size must be >= 0.")
+        if self.memory_write_batch_size < 1:
+            raise RuntimeError("Invalid configuration: memory_write_batch_size must be >= 1.")
+        if self.memory_write_max_latency_seconds <= 0:
+            raise RuntimeError("Invalid configuration: memory_write_max_latency_seconds must be > 0.")
+        if self.context_max_turns < 1:
+            raise RuntimeError("Invalid configuration: context_max_turns must be >= 1.")
+        if self.context_token_budget < 0:
+            raise RuntimeError("Invalid configuration: context_token_budget must be >= 0.")
+        if self.cloud_min_budget_seconds < 0:
+            raise RuntimeError("Invalid configuration: cloud_min_budget_seconds must be >= 0.")
+        if self.cloud_half_open_probes < 1:
+            raise RuntimeError("Invalid configuration: cloud_half_open_probes must be >= 1.")
+        if self.cloud_error_rate_threshold is not None and not 0.0 < self.cloud_error_rate_threshold <= 1.0:
+            raise RuntimeError("Invalid configuration: cloud_error_rate_threshold must be in (0, 1].")
+        if self.cloud_breaker_window_seconds <= 0:
+            raise RuntimeError("Invalid configuration: cloud_breaker_window_seconds must be > 0.")
+        if self.cloud_balancing not in {"p2c", "least_outstanding", "priority"}:
+            raise RuntimeError(
+                "Invalid configuration: cloud_balancing must be one of 'p2c', 'least_outstanding', 'priority'."
+            )
+        if self.cloud_max_connections_per_host < 1:
+            raise RuntimeError("Invalid configuration: cloud_max_connections_per_host must be >= 1.")
+        if self.cloud_keepalive_seconds < 0:
+            raise RuntimeError("Invalid configuration: cloud_keepalive_seconds must be >= 0.")
+        if self.cloud_batch_window_seconds < 0:
+            raise RuntimeError("Invalid configuration: cloud_batch_window_seconds must be >= 0.")
+        if self.cloud_batch_max_size < 1:
+            raise RuntimeError("Invalid configuration: cloud_batch_max_size must be >= 1.")
+        if self.hedge_delay_seconds < 0:
+            raise RuntimeError("Invalid configuration: hedge_delay_seconds must be >= 0.")
+        if any(tier not in {"small", "medium", "large"} or ram_gb <= 0 for _, tier, ram_gb in self.local_models):
+            raise RuntimeError(
+                "Invalid configuration: local_models entries need a small, medium or large tier and ram_gb > 0."
+            )
+        if not 0.0 < self.local_model_ram_fraction <= 1.0:
+            raise RuntimeError("Invalid configuration: local_model_ram_fraction must be in (0, 1].")
+        if self.local_model_max_loaded < 1:
+            raise RuntimeError("Invalid configuration: local_model_max_loaded must be >= 1.")
+        if self.local_model_max_concurrent < 1:
+            raise RuntimeError("Invalid configuration: local_model_max_concurrent must be >= 1.")
+        if self.local_model_min_free_ram_gb < 0:
+            raise RuntimeError("Invalid configuration: local_model_min_free_ram_gb must be >= 0.")
+        if self.response_cache_size < 0:
+            raise RuntimeError("Invalid configuration: response_cache_size must be >= 0.")
+        if self.response_cache_ttl_seconds <= 0:
+            raise RuntimeError("Invalid configuration: response_cache_ttl_seconds must be > 0.")
+        if self.semantic_cache_size < 0:
+            raise RuntimeError("Invalid configuration: semantic_cache_size must be >= 0.")
+        if self.semantic_cache_ttl_seconds <= 0:
+            raise RuntimeError("Invalid configuration: semantic_cache_ttl_seconds must be > 0.")
+        if not 0.0 < self.semantic_cache_threshold <= 1.0:
+            raise RuntimeError("Invalid configuration: semantic_cache_threshold must be in (0, 1].")
 
 
 def load_config() -> AppConfig:
@@ -64,58 +184,78 @@ def load_config() -> AppConfig:
         log_level=os.getenv("JARVIS_LOG_LEVEL", "INFO"),
         log_file=Path(os.getenv("JARVIS_LOG_FILE", "logs/jarvis.log")),
         sqlite_path=Path(os.getenv("JARVIS_SQLITE_PATH", "data/memory.db")),
+        sqlite_journal_mode=os.getenv("JARVIS_SQLITE_JOURNAL_MODE", "wal").lower(),
+        sqlite_synchronous=os.getenv("JARVIS_SQLITE_SYNCHRONOUS", "normal").lower(),
+        sqlite_mmap_size_bytes=int(os.getenv("JARVIS_SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024))),
+        sqlite_max_readers=int(os.getenv("JARVIS_SQLITE_MAX_READERS", "4")),
+        intent_rules_path=Path(rules_path) if (rules_path := os.getenv("JARVIS_INTENT_RULES_PATH")) else None,
+        intent_model_path=Path(model_path) if (model_path := os.getenv("JARVIS_INTENT_MODEL_PATH")) else None,
+        tone_lexicon_path=Path(lexicon_path) if (lexicon_path := os.getenv("JARVIS_TONE_LEXICON_PATH")) else None,
         encrypted_key_file=Path(os.getenv("JARVIS_ENCRYPTED_KEY_FILE", ".secrets/master.key")),
         encrypted_data_file=Path(os.getenv("JARVIS_ENCRYPTED_DATA_FILE", ".secrets/api_keys.enc")),
         max_workers=int(os.getenv("JARVIS_MAX_WORKERS", "4")),
         request_timeout_seconds=float(os.getenv("JARVIS_REQUEST_TIMEOUT_SECONDS", "20")),
         plugin_timeout_seconds=float(os.getenv("JARVIS_PLUGIN_TIMEOUT_SECONDS", "5")),
+        plan_max_parallel_steps=int(os.getenv("JARVIS_PLAN_MAX_PARALLEL_STEPS", "4")),
         request_rate_limit_per_minute=int(os.getenv("JARVIS_REQUEST_RATE_LIMIT_PER_MINUTE", "120")),
         cloud_rate_limit_per_minute=int(os.getenv("JARVIS_CLOUD_RATE_LIMIT_PER_MINUTE", "30")),
         automation_rate_limit_per_minute=int(os.getenv("JARVIS_AUTOMATION_RATE_LIMIT_PER_MINUTE", "60")),
         plugin_rate_limit_per_minute=int(os.getenv("JARVIS_PLUGIN_RATE_LIMIT_PER_MINUTE", "60")),
         cloud_failure_threshold=int(os.getenv("JARVIS_CLOUD_FAILURE_THRESHOLD", "3")),
         cloud_cooldown_seconds=float(os.getenv("JARVIS_CLOUD_COOLDOWN_SECONDS", "30")),
+        cloud_half_open_probes=int(os.getenv("JARVIS_CLOUD_HALF_OPEN_PROBES", "1")),
+        cloud_latency_threshold_seconds=(
+            float(latency) if (latency := os.getenv("JARVIS_CLOUD_LATENCY_THRESHOLD_SECONDS", "8")) else None
+        ),
+        cloud_error_rate_threshold=(
+            float(error_rate) if (error_rate := os.getenv("JARVIS_CLOUD_ERROR_RATE_THRESHOLD", "0.5")) else None
+        ),
+        cloud_breaker_window_seconds=float(os.getenv("JARVIS_CLOUD_BREAKER_WINDOW_SECONDS", "60")),
         cloud_provider=os.getenv("JARVIS_CLOUD_PROVIDER", "openai"),
+        cloud_fallback_providers=tuple(
+            name.strip() for name in os.getenv("JARVIS_CLOUD_FALLBACK_PROVIDERS", "").split(",") if name.strip()
+        ),
+        cloud_min_budget_seconds=float(os.getenv("JARVIS_CLOUD_MIN_BUDGET_SECONDS", "1")),
+        cloud_endpoint=os.getenv("JARVIS_CLOUD_ENDPOINT") or None,
+        cloud_provider_endpoints=tuple(
+            (name.strip(), url.strip())
+            for name, _, url in (
+                entry.partition("=") for entry in os.getenv("JARVIS_CLOUD_PROVIDER_ENDPOINTS", "").split(",")
+            )
+            if name.strip() and url.strip()
+        ),
+        cloud_balancing=os.getenv("JARVIS_CLOUD_BALANCING", "p2c"),
+        cloud_max_connections_per_host=int(os.getenv("JARVIS_CLOUD_MAX_CONNECTIONS_PER_HOST", "8")),
+        cloud_keepalive_seconds=float(os.getenv("JARVIS_CLOUD_KEEPALIVE_SECONDS", "30")),
+        cloud_batch_window_seconds=float(os.getenv("JARVIS_CLOUD_BATCH_WINDOW_SECONDS", "0")),
+        cloud_batch_max_size=int(os.getenv("JARVIS_CLOUD_BATCH_MAX_SIZE", "16")),
+        hedge_enabled=os.getenv("JARVIS_HEDGE_ENABLED", "false").lower() in {"1", "true", "yes"},
+        hedge_delay_seconds=float(os.getenv("JARVIS_HEDGE_DELAY_SECONDS", "0.25")),
+        hedge_immediate_complexity=float(os.getenv("JARVIS_HEDGE_IMMEDIATE_COMPLEXITY", "0.3")),
+        local_model_endpoint=os.getenv("JARVIS_LOCAL_MODEL_ENDPOINT") or None,
+        local_models=tuple(
+            (name.strip(), tier.strip(), float(ram_gb))
+            for name, tier, ram_gb in (
+                entry.rsplit(":", 2) for entry in os.getenv("JARVIS_LOCAL_MODELS", "").split(",") if entry.strip()
+            )
+        ),
+        local_model_ram_fraction=float(os.getenv("JARVIS_LOCAL_MODEL_RAM_FRACTION", "0.5")),
+        local_model_max_loaded=int(os.getenv("JARVIS_LOCAL_MODEL_MAX_LOADED", "2")),
+        local_model_max_concurrent=int(os.getenv("JARVIS_LOCAL_MODEL_MAX_CONCURRENT", "1")),
+        local_model_min_free_ram_gb=float(os.getenv("JARVIS_LOCAL_MODEL_MIN_FREE_RAM_GB", "1")),
+        memory_write_batch_size=int(os.getenv("JARVIS_MEMORY_WRITE_BATCH_SIZE", "64")),
+        memory_write_max_latency_seconds=float(os.getenv("JARVIS_MEMORY_WRITE_MAX_LATENCY_SECONDS", "0.05")),
+        context_max_turns=int(os.getenv("JARVIS_CONTEXT_MAX_TURNS", "256")),
+        context_token_budget=int(os.getenv("JARVIS_CONTEXT_TOKEN_BUDGET", "384")),
+        response_cache_size=int(os.getenv("JARVIS_RESPONSE_CACHE_SIZE", "256")),
+        response_cache_ttl_seconds=float(os.getenv("JARVIS_RESPONSE_CACHE_TTL_SECONDS", "300")),
+        semantic_cache_size=int(os.getenv("JARVIS_SEMANTIC_CACHE_SIZE", "256")),
+        semantic_cache_ttl_seconds=float(os.getenv("JARVIS_SEMANTIC_CACHE_TTL_SECONDS", "300")),
+        semantic_cache_threshold=float(os.getenv("JARVIS_SEMANTIC_CACHE_THRESHOLD", "0.9")),
+        fast_path_enabled=os.getenv("JARVIS_FAST_PATH_ENABLED", "true").lower() in {"1", "true", "yes"},
+        intent_batch_size=int(os.getenv("JARVIS_INTENT_BATCH_SIZE", "32")),
+        intent_batch_wait_seconds=float(os.getenv("JARVIS_INTENT_BATCH_WAIT_SECONDS", "0.005")),
+        intent_feature_cache_size=int(os.getenv("JARVIS_INTENT_FEATURE_CACHE_SIZE", "4096")),
     )
     cfg.validate()
     return cfg
-from dataclasses import dataclass, field
-from pathlib import Path
-
-from .models import AssistantMode
-
-
-@dataclass
-class SecurityConfig:
-    require_confirmation_for_dangerous: bool = True
-    encrypted_key_file: Path = Path(".secrets/api_keys.enc")
-    keyring_file: Path = Path(".secrets/master.key")
-
-
-@dataclass
-class MemoryConfig:
-    sqlite_path: Path = Path("data/memory.db")
-    faiss_index_path: Path = Path("data/memory.index")
-
-
-@dataclass
-class ModelConfig:
-    local_stt: str = "whisper"
-    local_llm_model: str = "mistral:7b-instruct"
-    cloud_provider: str = "openai"
-    intent_model_path: Path = Path("models/intent_classifier.pt")
-
-
-@dataclass
-class UIConfig:
-    theme: str = "dark"
-    personality: float = 0.5
-
-
-@dataclass
-class AppConfig:
-    mode: AssistantMode = AssistantMode.HYBRID
-    security: SecurityConfig = field(default_factory=SecurityConfig)
-    memory: MemoryConfig = field(default_factory=MemoryConfig)
-    model: ModelConfig = field(default_factory=ModelConfig)
-    ui: UIConfig = field(default_factory=UIConfig)
@@ -3,32 +3,33 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-from jarvis_assistant.ai.emotion import AdaptivePersonality, EmotionalToneDetector
-from jarvis_assistant.ai.nlp_engine import NLPEngine
+from jarvis_assistant.ai.emotion import AdaptivePersonality, EmotionalToneDetector, load_lexicon
+from jarvis_assistant.ai.intent_matcher import load_rules
+from jarvis_assistant.ai.local_models import DEFAULT_LOCAL_MODELS, HttpLocalBackend, LocalModelManager, LocalModelSpec
+from jarvis_assistant.ai.nlp_engine import IntentPredictor, NLPEngine
 from jarvis_assistant.ai.reasoning import ReasoningEngine
 from jarvis_assistant.automation.executor import AutomationExecutor
 from jarvis_assistant.cloud.model_router import ModelRouter
+from jarvis_assistant.cloud.semantic_cache import SemanticCache
+from jarvis_assistant.contracts.results import ActionResult
 from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker
 from jarvis_assistant.infrastructure.errors import ErrorBoundary
 from jarvis_assistant.infrastructure.hardware_profiler import HardwareProfiler
 from jarvis_assistant.infrastructure.logging import StructuredLoggerFactory
 from jarvis_assistant.infrastructure.metrics import MetricsCollector
 from jarvis_assistant.infrastructure.rate_limiter import SlidingWindowLimiter
+from jarvis_assistant.infrastructure.ttl_cache import LRUTTLCache
+from jarvis_assistant.memory.context_assembler import ContextAssembler
 from jarvis_assistant.memory.context_manager import ContextManager
 from jarvis_assistant.memory.store import MemoryStore
+from jarvis_assistant.memory.write_behind import WriteBehindWriter
 from jarvis_assistant.plugins.loader import PluginLoader
 from jarvis_assistant.runtime.worker_pool import AsyncWorkerPool
 from jarvis_assistant.security.permissions import PermissionManager
 from jarvis_assistant.transactions.undo import CommandHistoryRegistry
 from jarvis_assistant.utils.diagnostics import SelfDiagnostics
-from jarvis_assistant.ai.nlp_engine import NLPEngine
-from jarvis_assistant.ai.reasoning import ReasoningEngine
-from jarvis_assistant.automation.executor import AutomationExecutor
-from jarvis_assistant.memory.context_manager import ContextManager
-from jarvis_assistant.memory.store import MemoryStore
-from jarvis_assistant.security.permissions import PermissionManager
 
-from .assistant import JarvisAssistant
+from .assistant import JarvisAssistant, ResponseCacheKey
 from .config import AppConfig
 from .decision_engine import ModeDecisionEngine
 
@@ -65,6 +66,17 @@ class ServiceContainer:
         self.circuit_breaker = CircuitBreaker(
             failure_threshold=self.config.cloud_failure_threshold,
             cooldown_seconds=self.config.cloud_cooldown_seconds,
+            half_open_probes=self.config.cloud_half_open_probes,
+            latency_threshold_seconds=self.config.cloud_latency_threshold_seconds,
+            error_rate_threshold=self.config.cloud_error_rate_threshold,
+            window_seconds=self.config.cloud_breaker_window_seconds,
+        )
+
+        self.response_cache: LRUTTLCache[ResponseCacheKey, ActionResult] = LRUTTLCache(
+            max_entries=self.config.response_cache_size,
+            ttl_seconds=self.config.response_cache_ttl_seconds,
+            metrics=self.metrics,
+            name="response_cache",
         )
 
         self.request_limiter = SlidingWindowLimiter(self.config.request_rate_limit_per_minute, 60.0)
@@ -72,12 +84,40 @@ class ServiceContainer:
         self.plugin_limiter = SlidingWindowLimiter(self.config.plugin_rate_limit_per_minute, 60.0)
 
         self.memory_store = MemoryStore(config)
-        self.context_manager = ContextManager(self.memory_store)
+        self.memory_writer = WriteBehindWriter(
+            self.memory_store,
+            logger=self.logger,
+            max_batch=self.config.memory_write_batch_size,
+            max_latency_seconds=self.config.memory_write_max_latency_seconds,
+        )
+        self.context_assembler = ContextAssembler(
+            max_turns=self.config.context_max_turns, token_budget=self.config.context_token_budget
+        )
+        self.context_assembler.warm(self.memory_store.recent_interactions(self.config.context_max_turns))
+        self.context_manager = ContextManager(
+            self.memory_store, writer=self.memory_writer, assembler=self.context_assembler
+        )
         self.permissions = PermissionManager(config, self.logger)
-        self.nlp = NLPEngine(self.logger)
-
-        self.router = ModelRouter(config=config, circuit_breaker=self.circuit_breaker, logger=self.logger)
-        self.reasoning = ReasoningEngine(router=self.router, logger=self.logger)
+        rules = load_rules(self.config.intent_rules_path) if self.config.intent_rules_path else None
+        self.intent_classifier = self._build_intent_classifier()
+        self.nlp = NLPEngine(self.logger, rules=rules, classifier=self.intent_classifier)
+
+        self.semantic_cache = SemanticCache(
+            max_entries=self.config.semantic_cache_size,
+            ttl_seconds=self.config.semantic_cache_ttl_seconds,
+            threshold=self.config.semantic_cache_threshold,
+            metrics=self.metrics,
+        )
+        self.local_models = self._build_local_models()
+        self.router = ModelRouter(
+            config=config,
+            circuit_breaker=self.circuit_breaker,
+            logger=self.logger,
+            metrics=self.metrics,
+            semantic_cache=self.semantic_cache,
+            local_models=self.local_models,
+        )
+        self.reasoning = ReasoningEngine(router=self.router, logger=self.logger, context=self.context_assembler)
 
         self.plugin_loader = PluginLoader(Path("plugins"), self.error_boundary, self.logger)
         loaded_plugins = self.plugin_loader.load()
@@ -92,10 +132,12 @@ class ServiceContainer:
             plugin_timeout_seconds=self.config.plugin_timeout_seconds,
             automation_limiter=self.automation_limiter,
             plugin_limiter=self.plugin_limiter,
+            max_parallel_steps=self.config.plan_max_parallel_steps,
         )
 
         self.decision = ModeDecisionEngine(self.logger)
-        self.tone_detector = EmotionalToneDetector()
+        lexicon = load_lexicon(self.config.tone_lexicon_path) if self.config.tone_lexicon_path else None
+        self.tone_detector = EmotionalToneDetector(lexicon)
         self.personality = AdaptivePersonality(level=0.5)
 
         self.diagnostics = SelfDiagnostics(
@@ -105,20 +147,54 @@ class ServiceContainer:
             logger=self.logger,
         )
 
-    def build_assistant(self) -> JarvisAssistant:
-        """Builds assistant orchestrator service."""
+    def _build_intent_classifier(self) -> IntentPredictor | None:
+        """Loads the exported intent model behind a micro-batching service, if configured."""
 
-    def __init__(self, config: AppConfig) -> None:
-        self.config = config
-        self.memory_store = MemoryStore(config.memory)
-        self.context_manager = ContextManager(self.memory_store)
-        self.permissions = PermissionManager(config.security)
-        self.nlp = NLPEngine()
-        self.reasoning = ReasoningEngine(config=config)
-        self.executor = AutomationExecutor(permission_manager=self.permissions)
-        self.decision = ModeDecisionEngine()
+        if self.config.intent_model_path is None:
+            return None
+        from jarvis_assistant.ai.intent_inference import IntentInferenceService
+        from jarvis_assistant.ai.intent_model import load_exported
+        from jarvis_assistant.ai.vectorizer import HashingVectorizer, HashingVectorizerSpec
+
+        model, metadata = load_exported(self.config.intent_model_path)
+        vectorizer = HashingVectorizer(
+            HashingVectorizerSpec.from_dict(metadata["vectorizer"]),
+            cache_size=self.config.intent_feature_cache_size,
+            metrics=self.metrics,
+        )
+        return IntentInferenceService(
+            model,
+            labels=metadata["labels"],
+            featurize=vectorizer,
+            logger=self.logger,
+            max_batch_size=self.config.intent_batch_size,
+            max_wait_seconds=self.config.intent_batch_wait_seconds,
+            metrics=self.metrics,
+        )
+
+    def _build_local_models(self) -> LocalModelManager | None:
+        """Starts preloading the local model pool for this host's tier, if a local server is configured."""
+
+        if self.config.local_model_endpoint is None:
+            return None
+        catalog = [LocalModelSpec(*entry) for entry in self.config.local_models] or list(DEFAULT_LOCAL_MODELS)
+        manager = LocalModelManager(
+            HttpLocalBackend(self.config.local_model_endpoint),
+            catalog=catalog,
+            tier=self.hardware_profiler.recommended_model_tier(self.hardware_profile),
+            ram_budget_gb=self.hardware_profile.ram_gb * self.config.local_model_ram_fraction,
+            logger=self.logger,
+            max_loaded=self.config.local_model_max_loaded,
+            max_concurrent=self.config.local_model_max_concurrent,
+            min_free_ram_gb=self.config.local_model_min_free_ram_gb,
+            metrics=self.metrics,
+        )
+        manager.start()
+        return manager
 
     def build_assistant(self) -> JarvisAssistant:
+        """Builds assistant orchestrator service."""
+
         return JarvisAssistant(
             config=self.config,
             nlp=self.nlp,
@@ -129,16 +205,23 @@ class ServiceContainer:
             decision_engine=self.decision,
             error_boundary=self.error_boundary,
             worker_pool=self.worker_pool,
-            circuit_breaker=self.circuit_breaker,
+            circuit_breaker=self.router.breakers,
             request_limiter=self.request_limiter,
             metrics=self.metrics,
             tone_detector=self.tone_detector,
             personality=self.personality,
             logger=self.logger,
+            response_cache=self.response_cache,
         )
 
     def shutdown(self) -> None:
         """Graceful shutdown for runtime resources."""
 
+        if self.intent_classifier is not None:
+            self.intent_classifier.close()
+        self.router.cloud_client.close()
+        if self.local_models is not None:
+            self.local_models.close()
+        self.memory_writer.close()
+        self.memory_store.close()
         self.worker_pool.shutdown()
-        )
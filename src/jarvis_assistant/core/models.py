@@ -18,13 +18,6 @@ class AssistantMode(str, Enum):
 class IntentResult:
     """Intent extraction output."""
 
-    OFFLINE = "offline"
-    ONLINE = "online"
-    HYBRID = "hybrid"
-
-
-@dataclass
-class IntentResult:
     intent: str
     confidence: float
     entities: dict[str, Any] = field(default_factory=dict)
@@ -35,8 +28,6 @@ class IntentResult:
 class ActionPlan:
     """Executable action plan."""
 
-@dataclass
-class ActionPlan:
     name: str
     steps: list[dict[str, Any]]
     requires_confirmation: bool = False
@@ -47,8 +38,6 @@ class ActionPlan:
 class AssistantResponse:
     """Assistant response payload for UI/CLI."""
 
-@dataclass
-class AssistantResponse:
     text: str
     executed: bool = False
     metadata: dict[str, Any] = field(default_factory=dict)
@@ -1,56 +1,239 @@
 from __future__ import annotations
 
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from enum import Enum
 
 
-@dataclass(slots=True)
+class CircuitPhase(str, Enum):
+    """Circuit breaker phases."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True, frozen=True)
 class CircuitState:
     """Public circuit breaker state snapshot."""
 
     is_open: bool
     failure_count: int
     opened_until: float | None
+    phase: CircuitPhase = CircuitPhase.CLOSED
+    ewma_latency_seconds: float | None = None
+    error_rate: float = 0.0
+    trip_reason: str | None = None
 
 
 class CircuitBreaker:
-    """Simple circuit breaker for cloud reliability."""
+    """Adaptive circuit breaker for cloud reliability.
+
+    The circuit opens after `failure_threshold` consecutive failures, when the
+    failure rate over the last `window_seconds` reaches `error_rate_threshold`
+    (once `min_window_requests` calls were seen), or when the EWMA of call
+    latency exceeds `latency_threshold_seconds`. After `cooldown_seconds` it
+    turns half-open and admits at most `half_open_probes` concurrent probe
+    calls; that many successes close it and any failure reopens it.
 
-    def __init__(self, failure_threshold: int = 3, cooldown_seconds: float = 30.0) -> None:
+    Mutations take a lock so executor threads and the event loop can share
+    one breaker. Each mutation publishes an immutable `CircuitState`, so
+    `state()` and the closed-circuit path of `allow_request()` never lock.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        latency_threshold_seconds: float | None = None,
+        error_rate_threshold: float | None = None,
+        window_seconds: float = 60.0,
+        min_window_requests: int = 10,
+        ewma_alpha: float = 0.2,
+    ) -> None:
         self.failure_threshold = failure_threshold
         self.cooldown_seconds = cooldown_seconds
+        self.half_open_probes = half_open_probes
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.error_rate_threshold = error_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_window_requests = min_window_requests
+        self.ewma_alpha = ewma_alpha
+        self._lock = threading.Lock()
         self._failure_count = 0
-        self._opened_until: float | None = None
+        self._ewma_latency: float | None = None
+        self._window: deque[tuple[float, bool]] = deque()
+        self._window_failures = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._published = CircuitState(is_open=False, failure_count=0, opened_until=None)
+
+    def clone(self) -> CircuitBreaker:
+        """Returns a fresh breaker with the same settings, e.g. for another provider."""
+
+        return CircuitBreaker(
+            failure_threshold=self.failure_threshold,
+            cooldown_seconds=self.cooldown_seconds,
+            half_open_probes=self.half_open_probes,
+            latency_threshold_seconds=self.latency_threshold_seconds,
+            error_rate_threshold=self.error_rate_threshold,
+            window_seconds=self.window_seconds,
+            min_window_requests=self.min_window_requests,
+            ewma_alpha=self.ewma_alpha,
+        )
 
     def allow_request(self) -> bool:
-        """Returns whether cloud requests are currently allowed."""
+        """Returns whether a cloud request may be sent now.
 
-        if self._opened_until is None:
+        In the half-open phase a True result reserves a probe slot, which the
+        caller releases by recording the outcome.
+        """
+
+        if self._published.phase is CircuitPhase.CLOSED:
             return True
-        if time.time() >= self._opened_until:
-            self._opened_until = None
-            self._failure_count = 0
+        with self._lock:
+            state = self._published
+            if state.phase is CircuitPhase.CLOSED:
+                return True
+            if state.phase is CircuitPhase.OPEN:
+                if state.opened_until is not None and time.time() < state.opened_until:
+                    return False
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+                self._publish(CircuitPhase.HALF_OPEN, None, state.trip_reason)
+            if self._probes_in_flight >= self.half_open_probes:
+                return False
+            self._probes_in_flight += 1
             return True
-        return False
 
-    def record_success(self) -> None:
-        """Resets breaker failure counters after successful call."""
+    def record_success(self, latency_seconds: float | None = None) -> None:
+        """Records a successful call and its latency."""
 
-        self._failure_count = 0
-        self._opened_until = None
+        with self._lock:
+            now = time.time()
+            self._observe(now, failed=False, latency_seconds=latency_seconds)
+            self._failure_count = 0
+            state = self._published
+            if state.phase is CircuitPhase.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._reset()
+                    self._publish(CircuitPhase.CLOSED, None, None)
+                    return
+            elif state.phase is CircuitPhase.CLOSED and self._latency_exceeded():
+                self._open(now, "latency")
+                return
+            self._publish(state.phase, state.opened_until, state.trip_reason)
 
-    def record_failure(self) -> None:
-        """Records call failure and opens circuit on threshold."""
+    def record_failure(self, latency_seconds: float | None = None) -> None:
+        """Records a failed call; opens the circuit when a trip condition is met."""
 
-        self._failure_count += 1
-        if self._failure_count >= self.failure_threshold:
-            self._opened_until = time.time() + self.cooldown_seconds
+        with self._lock:
+            now = time.time()
+            self._observe(now, failed=True, latency_seconds=latency_seconds)
+            self._failure_count += 1
+            state = self._published
+            if state.phase is CircuitPhase.HALF_OPEN:
+                self._open(now, "probe_failed")
+            elif state.phase is CircuitPhase.CLOSED and self._failure_count >= self.failure_threshold:
+                self._open(now, "failures")
+            elif state.phase is CircuitPhase.CLOSED and self._error_rate_exceeded():
+                self._open(now, "error_rate")
+            else:
+                self._publish(state.phase, state.opened_until, state.trip_reason)
+
+    def release_probe(self) -> None:
+        """Frees a half-open probe slot for a call that ended without a verdict, e.g. cancelled."""
+
+        with self._lock:
+            if self._published.phase is CircuitPhase.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
 
     def state(self) -> CircuitState:
-        """Returns current breaker state."""
+        """Returns the current state without locking."""
+
+        state = self._published
+        if state.phase is CircuitPhase.OPEN and state.opened_until is not None and time.time() >= state.opened_until:
+            return replace(state, is_open=False, phase=CircuitPhase.HALF_OPEN)
+        return state
+
+    def _observe(self, now: float, failed: bool, latency_seconds: float | None) -> None:
+        self._window.append((now, failed))
+        self._window_failures += failed
+        while self._window and self._window[0][0] < now - self.window_seconds:
+            _, expired_failed = self._window.popleft()
+            self._window_failures -= expired_failed
+        if latency_seconds is not None:
+            previous = self._ewma_latency
+            self._ewma_latency = (
+                latency_seconds if previous is None else previous + self.ewma_alpha * (latency_seconds - previous)
+            )
 
-        return CircuitState(
-            is_open=not self.allow_request(),
+    def _latency_exceeded(self) -> bool:
+        return (
+            self.latency_threshold_seconds is not None
+            and self._ewma_latency is not None
+            and len(self._window) >= self.min_window_requests
+            and self._ewma_latency > self.latency_threshold_seconds
+        )
+
+    def _error_rate_exceeded(self) -> bool:
+        return (
+            self.error_rate_threshold is not None
+            and len(self._window) >= self.min_window_requests
+            and self._error_rate() >= self.error_rate_threshold
+        )
+
+    def _error_rate(self) -> float:
+        return self._window_failures / len(self._window) if self._window else 0.0
+
+    def _open(self, now: float, reason: str) -> None:
+        self._reset()
+        self._publish(CircuitPhase.OPEN, now + self.cooldown_seconds, reason)
+
+    def _reset(self) -> None:
+        self._window.clear()
+        self._window_failures = 0
+        self._ewma_latency = None
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def _publish(self, phase: CircuitPhase, opened_until: float | None, trip_reason: str | None) -> None:
+        self._published = CircuitState(
+            is_open=phase is CircuitPhase.OPEN,
             failure_count=self._failure_count,
-            opened_until=self._opened_until,
+            opened_until=opened_until,
+            phase=phase,
+            ewma_latency_seconds=self._ewma_latency,
+            error_rate=self._error_rate(),
+            trip_reason=trip_reason,
         )
+
+
+class CircuitBreakerGroup:
+    """Independent circuit breakers for each cloud provider, sharing one configuration."""
+
+    def __init__(self, primary: CircuitBreaker, providers: Sequence[str]) -> None:
+        self.providers = list(dict.fromkeys(providers))
+        self._breakers = {
+            provider: primary if index == 0 else primary.clone() for index, provider in enumerate(self.providers)
+        }
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        return self._breakers[provider]
+
+    def available(self) -> list[str]:
+        """Returns providers whose circuit is not open, in preference order."""
+
+        return [provider for provider in self.providers if not self._breakers[provider].state().is_open]
+
+    def state(self) -> CircuitState:
+        """Returns the state of the first provider that can take traffic, else the primary's."""
+
+        states = [self._breakers[provider].state() for provider in self.providers]
+        return next((state for state in states if not state.is_open), states[0])
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class Deadline:
+    """Absolute end-to-end time budget carried through every request stage."""
+
+    budget_seconds: float
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        """Creates a deadline that expires `seconds` from now."""
+
+        return cls(budget_seconds=seconds, expires_at=time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Returns seconds left in the budget, never negative."""
+
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def timeout(self, cap: float | None = None) -> float:
+        """Returns the stage timeout: remaining budget, optionally capped."""
+
+        remaining = self.remaining()
+        return remaining if cap is None else min(cap, remaining)
+
+    def nearly_spent(self, reserve_seconds: float) -> bool:
+        """Returns whether less than `reserve_seconds` of budget is left."""
+
+        return self.remaining() < reserve_seconds
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+from collections import deque
+from collections.abc import AsyncIterator
+
+
+class FairQueue:
+    """FIFO admission of at most `limit` concurrent holders.
+
+    Unlike asyncio.Semaphore, a released slot is handed straight to the
+    longest waiting caller, so a burst of new callers cannot overtake it,
+    and waiters may come from different event loops.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                    raise
+            # The slot was already handed to this caller; pass it on.
+            self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if self._waiters:
+                future = self._waiters.popleft()
+                future.get_loop().call_soon_threadsafe(_wake, future)
+                return
+            self._active -= 1
+
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
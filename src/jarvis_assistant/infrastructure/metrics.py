@@ -16,10 +16,12 @@ class MetricPoint:
 
 
 class MetricsCollector:
-    """Collects per-layer latency metrics."""
+    """Collects per-layer latency metrics, event counters and gauges."""
 
     def __init__(self) -> None:
         self._points: dict[str, MetricPoint] = defaultdict(MetricPoint)
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = {}
 
     @contextmanager
     def time_block(self, name: str) -> Iterator[None]:
@@ -34,6 +36,26 @@ class MetricsCollector:
             point.count += 1
             point.total_ms += elapsed_ms
 
+    def increment(self, name: str, amount: float = 1.0) -> None:
+        """Adds amount to a named event counter."""
+
+        self._counters[name] += amount
+
+    def counters(self) -> dict[str, float]:
+        """Returns a copy of all event counters."""
+
+        return dict(self._counters)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Records the latest value of a named gauge."""
+
+        self._gauges[name] = value
+
+    def gauges(self) -> dict[str, float]:
+        """Returns a copy of all gauges."""
+
+        return dict(self._gauges)
+
     def snapshot(self) -> dict[str, dict[str, float]]:
         """Returns summarized metrics snapshot."""
 
@@ -41,4 +63,8 @@ class MetricsCollector:
         for name, point in self._points.items():
             avg = point.total_ms / point.count if point.count else 0.0
             out[name] = {"count": float(point.count), "total_ms": point.total_ms, "avg_ms": avg}
+        if self._counters:
+            out["counters"] = self.counters()
+        if self._gauges:
+            out["gauges"] = self.gauges()
         return out
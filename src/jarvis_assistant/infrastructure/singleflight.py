@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any, Generic, TypeVar
+
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[K, T]):
+    """Coalesces concurrent calls with the same key into one in-flight task."""
+
+    def __init__(
+        self, metrics: MetricsCollector | None = None, name: str = "singleflight", deadline_slack_seconds: float = 0.0
+    ) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.deadline_slack_seconds = deadline_slack_seconds
+        self._inflight: dict[K, tuple[asyncio.Task[T], float | None]] = {}
+
+    async def do(
+        self, key: K, fn: Callable[[], Coroutine[Any, Any, T]], expires_at: float | None = None
+    ) -> tuple[T, bool]:
+        """Runs fn once per key and fans the result out to every concurrent caller.
+
+        Returns the result and whether it was shared from another caller's call.
+        Waiters are shielded, so cancelling one caller never cancels the shared task.
+        `expires_at` is the caller's `time.monotonic()` deadline (None for no
+        deadline). A caller only joins a call whose deadline is no earlier than
+        its own, give or take `deadline_slack_seconds`, since the result may
+        depend on the budget; otherwise it starts a new call, which later
+        callers with the same key join instead.
+        """
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and self._within(expires_at, inflight[1]):
+            self._count("coalesced")
+            return await asyncio.shield(inflight[0]), True
+        task = asyncio.create_task(fn())
+        self._inflight[key] = (task, expires_at)
+        task.add_done_callback(lambda done, k=key: self._release(k, done))
+        self._count("leaders")
+        return await asyncio.shield(task), False
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def _release(self, key: K, task: asyncio.Task[T]) -> None:
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def _within(self, expires_at: float | None, leader_expires_at: float | None) -> bool:
+        if leader_expires_at is None:
+            return True
+        return expires_at is not None and expires_at <= leader_expires_at + self.deadline_slack_seconds
+
+    def _count(self, event: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(f"{self.name}.{event}")
+
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUTTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries also expire after a TTL."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        metrics: MetricsCollector | None = None,
+        name: str = "cache",
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.metrics = metrics
+        self.name = name
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Returns cached value and marks it most recently used."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self._count("misses")
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self._count("expirations")
+            self._count("misses")
+            return None
+        self._entries.move_to_end(key)
+        self._count("hits")
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """Stores value, evicting least recently used entries when full."""
+
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._count("evictions")
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, event: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(f"{self.name}.{event}")
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+_WORD = re.compile(r"\w{3,}")
+_SCORE_BUCKETS = 64
+
+
+def count_tokens(text: str) -> int:
+    """Approximates the prompt token count of `text` by its whitespace-separated words."""
+
+    return len(text.split())
+
+
+@dataclass(slots=True, frozen=True)
+class ConversationTurn:
+    """One user request and assistant reply, pre-rendered with its token count."""
+
+    rendered: str
+    tokens: int
+    keywords: frozenset[str]
+    request: str
+
+
+@dataclass(slots=True, frozen=True)
+class AssembledPrompt:
+    """Request prefixed with packed context, and a digest of the turns packed ("" when none)."""
+
+    prompt: str
+    context_digest: str
+
+
+def make_turn(text: str, reply: str) -> ConversationTurn:
+    rendered = f"User: {text}\nAssistant: {reply}" if reply else f"User: {text}"
+    return ConversationTurn(
+        rendered=rendered,
+        tokens=count_tokens(rendered),
+        keywords=_keywords(f"{text} {reply}"),
+        request=_normalized(text),
+    )
+
+
+def _normalized(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _keywords(text: str) -> frozenset[str]:
+    return frozenset(_WORD.findall(text.lower()))
+
+
+class ContextAssembler:
+    """Packs relevant recent conversation turns into cloud prompts under a token budget.
+
+    Turns are kept in a ring buffer of `max_turns`, mirrored from MemoryStore
+    by `ContextManager`, so building a prompt never touches SQLite or
+    re-tokenizes history. Each turn scores by keyword overlap with the
+    request plus `recency_weight` times its recency; turns are bucketed by
+    score and taken best first while they fit `token_budget`, which keeps
+    assembly linear in the number of buffered turns. Earlier turns asking
+    the same request are left out, so repeating a request packs the same
+    context and the caches keyed on its digest keep hitting.
+    """
+
+    def __init__(self, max_turns: int = 256, token_budget: int = 384, recency_weight: float = 0.25) -> None:
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.recency_weight = recency_weight
+        self._turns: deque[ConversationTurn] = deque(maxlen=max_turns)
+
+    def append(self, text: str, reply: str) -> None:
+        self._turns.append(make_turn(text, reply))
+
+    def warm(self, interactions: Iterable[Mapping[str, Any]]) -> None:
+        """Loads stored interactions (as returned by `MemoryStore.recent_interactions`), oldest first."""
+
+        for interaction in interactions:
+            result = interaction.get("result")
+            reply = result.get("message", "") if isinstance(result, Mapping) else ""
+            self.append(str(interaction.get("text", "")), str(reply or ""))
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def select(self, text: str, token_budget: int | None = None) -> list[ConversationTurn]:
+        """Returns the turns packed for `text`, oldest first."""
+
+        budget = self.token_budget if token_budget is None else token_budget
+        turns = list(self._turns)
+        if budget <= 0 or not turns:
+            return []
+        query = _keywords(text)
+        request = _normalized(text)
+        buckets: list[list[int]] = [[] for _ in range(_SCORE_BUCKETS)]
+        scale = (_SCORE_BUCKETS - 1) / (1.0 + self.recency_weight)
+        for index, turn in enumerate(turns):
+            if turn.request == request:
+                continue
+            relevance = len(query & turn.keywords) / len(query) if query else 0.0
+            recency = (index + 1) / len(turns)
+            buckets[int((relevance + self.recency_weight * recency) * scale)].append(index)
+
+        chosen = [False] * len(turns)
+        for bucket in reversed(buckets):
+            for index in reversed(bucket):
+                if turns[index].tokens <= budget:
+                    chosen[index] = True
+                    budget -= turns[index].tokens
+        return [turn for turn, keep in zip(turns, chosen) if keep]
+
+    def assemble(self, text: str, token_budget: int | None = None) -> AssembledPrompt:
+        """Packs context for `text`; the digest lets caches tell conversation states apart."""
+
+        turns = self.select(text, token_budget)
+        if not turns:
+            return AssembledPrompt(prompt=text, context_digest="")
+        history = "\n".join(turn.rendered for turn in turns)
+        return AssembledPrompt(
+            prompt=f"Conversation so far:\n{history}\n\nUser: {text}",
+            context_digest=hashlib.blake2b(history.encode("utf-8"), digest_size=8).hexdigest(),
+        )
+
+    def build_prompt(self, text: str, token_budget: int | None = None) -> str:
+        """Returns `text` prefixed with the packed conversation context, or `text` alone without any."""
+
+        return self.assemble(text, token_budget).prompt
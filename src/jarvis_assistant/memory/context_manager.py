@@ -1,28 +1,64 @@
 from __future__ import annotations
 
 from dataclasses import asdict
+from typing import Any
 
 from jarvis_assistant.contracts.results import ActionResult
 from jarvis_assistant.core.models import IntentResult
 
+from .context_assembler import ContextAssembler
 from .store import MemoryStore
+from .write_behind import WriteBehindWriter
 
 
 class ContextManager:
-    """Writes interaction context into persistent memory."""
+    """Writes interaction context into persistent memory.
 
-    def __init__(self, store: MemoryStore) -> None:
+    With a `WriteBehindWriter`, writes are queued off the request path and
+    reads merge in writes that have not been committed yet. With a
+    `ContextAssembler`, each interaction is also mirrored into its in-memory
+    ring buffer of recent turns.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        writer: WriteBehindWriter | None = None,
+        assembler: ContextAssembler | None = None,
+    ) -> None:
         self.store = store
+        self.writer = writer
+        self.assembler = assembler
 
     def record_interaction(self, text: str, intent: IntentResult, result: ActionResult) -> None:
         """Records interaction and structured result."""
 
-        self.store.add_interaction(text=text, intent=intent.intent, result=asdict(result))
+        sink = self.writer or self.store
+        sink.add_interaction(text=text, intent=intent.intent, result=asdict(result))
+        if self.assembler is not None:
+            self.assembler.append(text, result.message)
         tone = result.metadata.get("tone")
         if isinstance(tone, str):
-            self.store.set_preference("last_tone", tone)
-    def __init__(self, store: MemoryStore) -> None:
-        self.store = store
+            sink.set_preference("last_tone", tone)
+
+    def recent_interactions(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Returns the most recent interactions, including uncommitted ones."""
+
+        if self.writer is None:
+            return self.store.recent_interactions(limit)
+        with self.writer.consistent_view():
+            rows = self.store.recent_interactions(limit)
+            pending = [
+                {"text": text, "intent": intent, "result": result}
+                for text, intent, result in self.writer.pending_interactions()
+            ]
+        return [*rows, *pending][-limit:]
 
-    def record_interaction(self, text: str, intent: IntentResult, result: dict) -> None:
-        self.store.add_interaction(text=text, intent=intent.intent, result=result)
+    def get_preference(self, key: str) -> str | None:
+        if self.writer is not None:
+            with self.writer.consistent_view():
+                pending = self.writer.pending_preference(key)
+                if pending is not None:
+                    return pending
+                return self.store.get_preference(key)
+        return self.store.get_preference(key)
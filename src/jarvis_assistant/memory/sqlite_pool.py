@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+JOURNAL_MODES = ("wal", "delete", "truncate", "persist", "memory")
+SYNCHRONOUS_LEVELS = ("off", "normal", "full", "extra")
+
+
+@dataclass(slots=True, frozen=True)
+class SQLiteTuning:
+    """Connection pragmas and pool sizes for a SQLite database."""
+
+    journal_mode: str = "wal"
+    synchronous: str = "normal"
+    mmap_size_bytes: int = 256 * 1024 * 1024
+    cache_size_kib: int = 8192
+    busy_timeout_ms: int = 5000
+    max_readers: int = 4
+    cached_statements: int = 128
+
+
+class SQLiteConnectionManager:
+    """One writer connection and a pool of reader connections to a SQLite file.
+
+    In WAL mode readers never block the writer or each other, so reads
+    borrow a pooled `query_only` connection (at most `max_readers`; further
+    readers wait) while writes are serialized on the single writer. Every
+    connection keeps up to `cached_statements` prepared statements, so
+    callers executing the same SQL text reuse them instead of re-preparing.
+    Connections are shared across threads, one borrower at a time.
+    """
+
+    def __init__(self, path: Path, tuning: SQLiteTuning | None = None) -> None:
+        self.path = path
+        self.tuning = tuning or SQLiteTuning()
+        if self.tuning.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Unsupported journal mode: {self.tuning.journal_mode}")
+        if self.tuning.synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unsupported synchronous level: {self.tuning.synchronous}")
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.execute(f"PRAGMA journal_mode={self.tuning.journal_mode}")
+        self._idle: list[sqlite3.Connection] = []
+        self._opened: list[sqlite3.Connection] = []
+        self._available = threading.Condition()
+        self._waiters = 0
+        self._closed = False
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Yields the writer connection inside a transaction that commits on success."""
+
+        with self._write_lock, self._writer:
+            yield self._writer
+
+    @contextlib.contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Yields a pooled reader connection for the duration of the block."""
+
+        conn = self._borrow()
+        try:
+            yield conn
+        finally:
+            self._idle.append(conn)
+            if self._waiters:
+                with self._available:
+                    self._available.notify()
+
+    def journal_mode(self) -> str:
+        with self._write_lock:
+            return str(self._writer.execute("PRAGMA journal_mode").fetchone()[0])
+
+    def close(self) -> None:
+        with self._write_lock, self._available:
+            if self._closed:
+                return
+            self._closed = True
+            for conn in self._opened:
+                conn.close()
+            self._writer.close()
+
+    def _borrow(self) -> sqlite3.Connection:
+        try:
+            # list.pop and list.append are atomic, so borrowing and returning an idle reader take no lock.
+            return self._idle.pop()
+        except IndexError:
+            pass
+        with self._available:
+            # Registered before retrying, so a reader returned after the failed pop above still notifies.
+            self._waiters += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+                    with contextlib.suppress(IndexError):
+                        return self._idle.pop()
+                    if len(self._opened) < self.tuning.max_readers:
+                        conn = self._connect()
+                        conn.execute("PRAGMA query_only=ON")
+                        self._opened.append(conn)
+                        return conn
+                    self._available.wait()
+            finally:
+                self._waiters -= 1
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            timeout=self.tuning.busy_timeout_ms / 1000,
+            cached_statements=self.tuning.cached_statements,
+        )
+        conn.execute(f"PRAGMA synchronous={self.tuning.synchronous}")
+        conn.execute(f"PRAGMA mmap_size={int(self.tuning.mmap_size_bytes)}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.tuning.cache_size_kib)}")
+        return conn
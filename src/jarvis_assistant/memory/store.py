@@ -1,63 +1,98 @@
 from __future__ import annotations
 
 import json
-import sqlite3
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 from typing import Any
 
 from jarvis_assistant.core.config import AppConfig
 
+from .sqlite_pool import SQLiteConnectionManager, SQLiteTuning
+
+_INSERT_INTERACTION = "INSERT INTO interactions(text, intent, result) VALUES (?, ?, ?)"
+_UPSERT_PREFERENCE = "INSERT OR REPLACE INTO preferences(key, value) VALUES (?, ?)"
+_RECENT_INTERACTIONS = "SELECT text, intent, result FROM interactions ORDER BY id DESC LIMIT ?"
+_GET_PREFERENCE = "SELECT value FROM preferences WHERE key = ?"
+
 
 class MemoryStore:
-    """SQLite-backed structured memory store."""
+    """SQLite-backed structured memory store.
+
+    Writes go through a single writer connection and reads through pooled
+    reader connections, tuned by the `sqlite_*` settings (WAL by default).
+    Statements are module-level constants so each connection reuses its
+    prepared statements.
+    """
 
     def __init__(self, config: AppConfig) -> None:
         self.sqlite_path: Path = config.sqlite_path
         self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.sqlite_path)
-from jarvis_assistant.core.config import MemoryConfig
-
-
-class MemoryStore:
-    def __init__(self, config: MemoryConfig) -> None:
-        self.config = config
-        self.config.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.config.sqlite_path)
+        self.db = SQLiteConnectionManager(
+            self.sqlite_path,
+            SQLiteTuning(
+                journal_mode=config.sqlite_journal_mode,
+                synchronous=config.sqlite_synchronous,
+                mmap_size_bytes=config.sqlite_mmap_size_bytes,
+                max_readers=config.sqlite_max_readers,
+            ),
+        )
         self._ensure_tables()
 
     def _ensure_tables(self) -> None:
-        self.conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS interactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text TEXT,
-                intent TEXT,
-                result TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        with self.db.write() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS interactions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    text TEXT,
+                    intent TEXT,
+                    result TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
             )
-            """
-        )
-        self.conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS preferences (
-                key TEXT PRIMARY KEY,
-                value TEXT
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS preferences (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+                """
             )
-            """
-        )
-        self.conn.commit()
 
     def add_interaction(self, text: str, intent: str, result: dict[str, Any]) -> None:
-        self.conn.execute(
-            "INSERT INTO interactions(text, intent, result) VALUES (?, ?, ?)",
-            (text, intent, json.dumps(result, default=str)),
-            (text, intent, json.dumps(result)),
-        )
-        self.conn.commit()
+        with self.db.write() as conn:
+            conn.execute(_INSERT_INTERACTION, (text, intent, json.dumps(result, default=str)))
 
     def set_preference(self, key: str, value: str) -> None:
-        self.conn.execute(
-            "INSERT OR REPLACE INTO preferences(key, value) VALUES (?, ?)",
-            (key, value),
-        )
-        self.conn.commit()
+        with self.db.write() as conn:
+            conn.execute(_UPSERT_PREFERENCE, (key, value))
+
+    def write_batch(
+        self,
+        interactions: Sequence[tuple[str, str, dict[str, Any]]],
+        preferences: Mapping[str, str],
+    ) -> None:
+        """Writes many interactions and preferences in a single transaction."""
+
+        rows = [(text, intent, json.dumps(result, default=str)) for text, intent, result in interactions]
+        with self.db.write() as conn:
+            conn.executemany(_INSERT_INTERACTION, rows)
+            conn.executemany(_UPSERT_PREFERENCE, list(preferences.items()))
+
+    def recent_interactions(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Returns up to `limit` most recent interactions, oldest first."""
+
+        with self.db.read() as conn:
+            rows = conn.execute(_RECENT_INTERACTIONS, (limit,)).fetchall()
+        return [
+            {"text": text, "intent": intent, "result": json.loads(result)} for text, intent, result in reversed(rows)
+        ]
+
+    def get_preference(self, key: str) -> str | None:
+        with self.db.read() as conn:
+            row = conn.execute(_GET_PREFERENCE, (key,)).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self.db.close()
@@ -1,18 +1,68 @@
 from __future__ import annotations
 
-from typing import Iterable
+import heapq
+import math
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
 
 
 class VectorMemory:
-    """FAISS wrapper placeholder for semantic recall."""
+    """In-process cosine-similarity index for semantic recall.
+
+    Embeddings are L2-normalized on insert and searched with a brute-force
+    scan, vectorized with numpy when it is installed. Items are addressed by
+    the id `add` returns so callers can evict them.
+    """
 
     def __init__(self) -> None:
-        self._items: list[tuple[list[float], str]] = []
+        self._items: dict[int, tuple[list[float], str]] = {}
+        self._next_id = 0
+        self._matrix: Any = None
+        self._matrix_ids: list[int] = []
+
+    def add(self, embedding: list[float], text: str) -> int:
+        item_id = self._next_id
+        self._next_id += 1
+        self._items[item_id] = (_normalized(embedding), text)
+        self._matrix = None
+        return item_id
+
+    def remove(self, item_id: int) -> None:
+        if self._items.pop(item_id, None) is not None:
+            self._matrix = None
+
+    def search(self, embedding: list[float], limit: int = 5) -> list[str]:
+        return [text for _, _, text in self.nearest(embedding, limit)]
+
+    def nearest(self, embedding: list[float], limit: int = 5) -> list[tuple[int, float, str]]:
+        """Returns up to `limit` (id, cosine similarity, text) triples, most similar first."""
+
+        if not self._items or limit <= 0:
+            return []
+        query = _normalized(embedding)
+        if np is None:
+            scored = ((sum(map(float.__mul__, query, vector)), item_id) for item_id, (vector, _) in self._items.items())
+            best = heapq.nlargest(limit, scored)
+        else:
+            scores = self._vectors() @ np.asarray(query, dtype=np.float32)
+            top = np.argsort(-scores)[:limit]
+            best = [(float(scores[row]), self._matrix_ids[row]) for row in top]
+        return [(item_id, score, self._items[item_id][1]) for score, item_id in best]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _vectors(self) -> Any:
+        if self._matrix is None:
+            self._matrix_ids = list(self._items)
+            self._matrix = np.asarray([self._items[item_id][0] for item_id in self._matrix_ids], dtype=np.float32)
+        return self._matrix
 
-    def add(self, embedding: list[float], text: str) -> None:
-        self._items.append((embedding, text))
 
-    def search(self, embedding: list[float], limit: int = 5) -> Iterable[str]:
-        # Placeholder distance scoring.
-        del embedding
-        return [text for _, text in self._items[:limit]]
+def _normalized(embedding: list[float]) -> list[float]:
+    norm = math.sqrt(sum(value * value for value in embedding))
+    return [float(value) / norm for value in embedding] if norm > 0 else [float(value) for value in embedding]
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from .store import MemoryStore
+
+
+class WriteBehindWriter:
+    """Background writer that group-commits queued memory writes.
+
+    Writes are buffered and flushed by a worker thread in one transaction once
+    `max_batch` writes are pending or the oldest has waited `max_latency_seconds`.
+    Buffered and in-flight writes stay visible through `pending_interactions` and
+    `pending_preference` until they are committed.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        logger: logging.Logger,
+        max_batch: int = 64,
+        max_latency_seconds: float = 0.05,
+    ) -> None:
+        self.store = store
+        self.logger = logger
+        self.max_batch = max_batch
+        self.max_latency_seconds = max_latency_seconds
+        self._cond = threading.Condition()
+        self._commit_lock = threading.Lock()
+        self._interactions: list[tuple[str, str, dict[str, Any]]] = []
+        self._preferences: dict[str, str] = {}
+        self._inflight_interactions: list[tuple[str, str, dict[str, Any]]] = []
+        self._inflight_preferences: dict[str, str] = {}
+        self._oldest_at: float | None = None
+        self._enqueued = 0
+        self._committed = 0
+        self._flush_requested = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._thread.start()
+
+    def add_interaction(self, text: str, intent: str, result: dict[str, Any]) -> None:
+        with self._cond:
+            self._ensure_open()
+            self._interactions.append((text, intent, result))
+            self._mark_enqueued()
+
+    def set_preference(self, key: str, value: str) -> None:
+        with self._cond:
+            self._ensure_open()
+            self._preferences[key] = value
+            self._mark_enqueued()
+
+    def pending_interactions(self) -> list[tuple[str, str, dict[str, Any]]]:
+        """Returns writes not yet committed, oldest first."""
+
+        with self._cond:
+            return [*self._inflight_interactions, *self._interactions]
+
+    def pending_preference(self, key: str) -> str | None:
+        with self._cond:
+            if key in self._preferences:
+                return self._preferences[key]
+            return self._inflight_preferences.get(key)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until every write queued so far is committed."""
+
+        with self._cond:
+            target = self._enqueued
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._committed >= target, timeout=timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Flushes pending writes and stops the worker thread."""
+
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+
+    @contextlib.contextmanager
+    def consistent_view(self) -> Iterator[None]:
+        """Holds off commits so store reads and pending reads see one state."""
+
+        with self._commit_lock:
+            yield
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Memory writer is closed.")
+
+    def _mark_enqueued(self) -> None:
+        self._enqueued += 1
+        if self._oldest_at is None:
+            self._oldest_at = time.monotonic()
+        if self._enqueued - self._committed >= self.max_batch:
+            self._cond.notify_all()
+
+    def _batch_due(self) -> bool:
+        pending = self._enqueued - self._committed
+        if pending == 0:
+            return False
+        if self._closed or self._flush_requested or pending >= self.max_batch:
+            return True
+        return self._oldest_at is not None and time.monotonic() - self._oldest_at >= self.max_latency_seconds
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._batch_due():
+                    if self._closed:
+                        return
+                    wait = None
+                    if self._oldest_at is not None:
+                        wait = max(0.0, self._oldest_at + self.max_latency_seconds - time.monotonic())
+                    self._cond.wait(timeout=wait)
+                self._inflight_interactions, self._interactions = self._interactions, []
+                self._inflight_preferences, self._preferences = self._preferences, {}
+                target = self._enqueued
+                self._oldest_at = None
+                self._flush_requested = False
+            with self._commit_lock:
+                try:
+                    self.store.write_batch(self._inflight_interactions, self._inflight_preferences)
+                except Exception as exc:  # noqa: BLE001
+                    self.logger.exception("memory_write_batch_failed error=%s", exc)
+                with self._cond:
+                    self._inflight_interactions = []
+                    self._inflight_preferences = {}
+                    self._committed = target
+                    self._cond.notify_all()
@@ -7,8 +7,6 @@ from pathlib import Path
 from jarvis_assistant.contracts.results import ErrorInfo
 from jarvis_assistant.infrastructure.errors import ErrorBoundary
 
-from pathlib import Path
-
 from .base import PluginBase
 
 
@@ -24,11 +22,6 @@ class PluginLoader:
     def load(self) -> list[PluginBase]:
         """Loads plugins from folder and initializes safely."""
 
-    def __init__(self, plugin_dir: Path) -> None:
-        self.plugin_dir = plugin_dir
-        self.plugins: list[PluginBase] = []
-
-    def load(self) -> list[PluginBase]:
         self.plugins.clear()
         for path in self.plugin_dir.glob("*.py"):
             if path.name.startswith("_"):
@@ -83,13 +76,3 @@ class PluginLoader:
 
         self.logger.info("plugin_loaded plugin=%s", path.name)
         return plugin
-            spec = importlib.util.spec_from_file_location(path.stem, path)
-            if spec is None or spec.loader is None:
-                continue
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            plugin = getattr(module, "PLUGIN", None)
-            if plugin:
-                plugin.initialize()
-                self.plugins.append(plugin)
-        return self.plugins
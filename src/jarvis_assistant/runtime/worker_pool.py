@@ -4,13 +4,24 @@ import asyncio
 import concurrent.futures
 import queue
 import threading
+import time
+from collections import deque
 from collections.abc import Callable, Coroutine
 from dataclasses import dataclass
+from enum import IntEnum
 from typing import Any, TypeVar
 
 T = TypeVar("T")
 
 
+class Priority(IntEnum):
+    """Scheduling lanes for CPU work; lower values are dispatched first."""
+
+    URGENT = 0
+    NORMAL = 1
+    BULK = 2
+
+
 @dataclass(slots=True)
 class WorkerTask:
     """Queued task representation."""
@@ -19,28 +30,59 @@ class WorkerTask:
     func: Callable[..., Any]
     args: tuple[Any, ...] = ()
     kwargs: dict[str, Any] | None = None
+    priority: Priority = Priority.NORMAL
+
+
+@dataclass(slots=True)
+class LaneStats:
+    """Dispatch and wait-time counters for one priority lane."""
+
+    dispatched: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class _LaneJob:
+    func: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: concurrent.futures.Future[Any]
+    enqueued_at: float
 
 
 class AsyncWorkerPool:
-    """Hybrid worker pool for CPU and async I/O tasks with graceful shutdown."""
+    """Hybrid worker pool for CPU and async I/O tasks with graceful shutdown.
+
+    CPU work is queued in priority lanes and handed to the thread pool only when
+    a worker is free, so urgent jobs overtake queued bulk work. A job that has
+    waited longer than `starvation_seconds` is dispatched ahead of its lane
+    order, which keeps lower lanes from starving under sustained urgent load.
+    """
 
-    def __init__(self, max_workers: int = 4) -> None:
+    def __init__(self, max_workers: int = 4, starvation_seconds: float = 0.5) -> None:
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self.starvation_seconds = starvation_seconds
         self.loop = asyncio.new_event_loop()
         self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
         self._loop_thread.start()
         self.queue: queue.Queue[WorkerTask] = queue.Queue()
         self._shutdown = threading.Event()
+        self._lock = threading.Lock()
+        self._free_slots = max_workers
+        self._lanes: dict[Priority, deque[_LaneJob]] = {lane: deque() for lane in Priority}
+        self._lane_stats: dict[Priority, LaneStats] = {lane: LaneStats() for lane in Priority}
 
     def _run_loop(self) -> None:
         asyncio.set_event_loop(self.loop)
         self.loop.run_forever()
 
-    async def run_cpu(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
-        """Runs CPU-bound work in thread pool."""
+    async def run_cpu(
+        self, fn: Callable[..., T], *args: Any, priority: Priority = Priority.NORMAL, **kwargs: Any
+    ) -> T:
+        """Runs CPU-bound work in thread pool via the given priority lane."""
 
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(self.executor, lambda: fn(*args, **kwargs))
+        return await asyncio.wrap_future(self._schedule(priority, fn, args, kwargs))
 
     async def run_io(self, coro: Coroutine[Any, Any, T]) -> T:
         """Runs async I/O coroutine on dedicated loop."""
@@ -49,9 +91,15 @@ class AsyncWorkerPool:
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, future.result)
 
-    def submit_cpu(self, fn: Callable[..., T], *args: Any, timeout: float | None = None, **kwargs: Any) -> T:
-        future = self.executor.submit(fn, *args, **kwargs)
-        return future.result(timeout=timeout)
+    def submit_cpu(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: float | None = None,
+        priority: Priority = Priority.NORMAL,
+        **kwargs: Any,
+    ) -> T:
+        return self._schedule(priority, fn, args, kwargs).result(timeout=timeout)
 
     def submit_io(self, coro: asyncio.Future[T] | Coroutine[Any, Any, T], timeout: float | None = None) -> T:
         future = asyncio.run_coroutine_threadsafe(coro, self.loop)
@@ -63,12 +111,88 @@ class AsyncWorkerPool:
     def drain_once(self, timeout: float | None = None) -> Any:
         task = self.queue.get(timeout=timeout)
         kwargs = task.kwargs or {}
-        return self.submit_cpu(task.func, *task.args, **kwargs)
+        return self.submit_cpu(task.func, *task.args, priority=task.priority, **kwargs)
+
+    def lane_stats(self) -> dict[str, dict[str, float]]:
+        """Returns per-lane queue depth and wait-time statistics."""
+
+        with self._lock:
+            out: dict[str, dict[str, float]] = {}
+            for lane in Priority:
+                stats = self._lane_stats[lane]
+                avg = stats.total_wait_ms / stats.dispatched if stats.dispatched else 0.0
+                out[lane.name.lower()] = {
+                    "depth": float(len(self._lanes[lane])),
+                    "dispatched": float(stats.dispatched),
+                    "avg_wait_ms": avg,
+                    "max_wait_ms": stats.max_wait_ms,
+                }
+            return out
 
     def shutdown(self) -> None:
         if self._shutdown.is_set():
             return
         self._shutdown.set()
+        with self._lock:
+            for lane in self._lanes.values():
+                while lane:
+                    lane.popleft().future.cancel()
         self.executor.shutdown(wait=True, cancel_futures=True)
         self.loop.call_soon_threadsafe(self.loop.stop)
         self._loop_thread.join(timeout=2)
+
+    def _schedule(
+        self, priority: Priority, fn: Callable[..., T], args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> concurrent.futures.Future[T]:
+        if self._shutdown.is_set():
+            raise RuntimeError("Worker pool is shut down.")
+        future: concurrent.futures.Future[T] = concurrent.futures.Future()
+        job = _LaneJob(func=fn, args=args, kwargs=kwargs, future=future, enqueued_at=time.monotonic())
+        with self._lock:
+            self._lanes[Priority(priority)].append(job)
+        self._dispatch()
+        return future
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            while self._free_slots > 0 and not self._shutdown.is_set():
+                picked = self._next_job_locked()
+                if picked is None:
+                    return
+                lane, job = picked
+                wait_ms = (time.monotonic() - job.enqueued_at) * 1000
+                stats = self._lane_stats[lane]
+                stats.dispatched += 1
+                stats.total_wait_ms += wait_ms
+                stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+                self._free_slots -= 1
+                self.executor.submit(self._run_job, job)
+
+    def _next_job_locked(self) -> tuple[Priority, _LaneJob] | None:
+        now = time.monotonic()
+        starving = [
+            lane
+            for lane in Priority
+            if self._lanes[lane] and now - self._lanes[lane][0].enqueued_at >= self.starvation_seconds
+        ]
+        if starving:
+            lane = min(starving, key=lambda name: self._lanes[name][0].enqueued_at)
+            return lane, self._lanes[lane].popleft()
+        for lane in Priority:
+            if self._lanes[lane]:
+                return lane, self._lanes[lane].popleft()
+        return None
+
+    def _run_job(self, job: _LaneJob) -> None:
+        try:
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    result = job.func(*job.args, **job.kwargs)
+                except BaseException as exc:  # noqa: BLE001
+                    job.future.set_exception(exc)
+                else:
+                    job.future.set_result(result)
+        finally:
+            with self._lock:
+                self._free_slots += 1
+            self._dispatch()
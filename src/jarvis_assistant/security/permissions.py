@@ -12,6 +12,7 @@ class PermissionManager:
         self.config = config
         self.logger = logger
         self.sensitive_intents = {"email_send", "delete_file", "system_shutdown"}
+        self.side_effect_intents = {"open_app", "close_app", "create_reminder"}
         self.command_blacklist = {"rm", "mkfs", "shutdown"}
         self.plugin_denylist = {"developer_tools"} if config.execution_mode == ExecutionMode.SAFE_MODE else set()
 
@@ -20,6 +21,11 @@ class PermissionManager:
 
         return intent in self.sensitive_intents
 
+    def is_replay_safe(self, intent: str) -> bool:
+        """Returns whether a cached result for intent may be served again."""
+
+        return intent not in self.sensitive_intents and intent not in self.side_effect_intents
+
     def confirm(self, action_name: str) -> bool:
         """Confirmation hook for dangerous actions."""
 
@@ -40,18 +46,3 @@ class PermissionManager:
         if self.config.execution_mode == ExecutionMode.SAFE_MODE:
             return False
         return plugin_name not in self.plugin_denylist
-from jarvis_assistant.core.config import SecurityConfig
-
-
-class PermissionManager:
-    def __init__(self, config: SecurityConfig) -> None:
-        self.config = config
-        self.sensitive_intents = {"email_send", "delete_file", "system_shutdown"}
-
-    def is_sensitive_intent(self, intent: str) -> bool:
-        return intent in self.sensitive_intents
-
-    def confirm(self, action_name: str) -> bool:
-        # Hook this into UI dialog in production.
-        del action_name
-        return True
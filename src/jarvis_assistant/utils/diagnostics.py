@@ -63,15 +63,3 @@ class SelfDiagnostics:
             return bool(row and row[0] == "ok")
         except sqlite3.Error:
             return False
-import shutil
-from pathlib import Path
-
-
-class SelfDiagnostics:
-    def run(self) -> dict[str, bool]:
-        return {
-            "python_available": True,
-            "ollama_installed": shutil.which("ollama") is not None,
-            "plugins_dir_exists": Path("plugins").exists(),
-            "data_dir_exists": Path("data").exists() or Path("data").mkdir(exist_ok=True) is None,
-        }
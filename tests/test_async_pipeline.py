@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from pathlib import Path
 
-from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.core.config import AppConfig, ExecutionMode
 from jarvis_assistant.core.container import ServiceContainer
+from jarvis_assistant.runtime.worker_pool import Priority
 
 
 def test_async_handle_text_and_tone_metadata() -> None:
@@ -21,3 +24,215 @@ def test_plugin_execution_pipeline() -> None:
     response = asyncio.run(assistant.handle_text("remind me to deploy at 5"))
     assert response.metadata["status"] in {"success", "failed"}
     container.shutdown()
+
+
+def test_handle_batch_preserves_order_and_batches_stages() -> None:
+    container = ServiceContainer(AppConfig())
+    assistant = container.build_assistant()
+    dispatched: list[str] = []
+    original_run_cpu = assistant.worker_pool.run_cpu
+
+    async def counting_run_cpu(fn, *args, **kwargs):
+        dispatched.append(fn.__name__)
+        return await original_run_cpu(fn, *args, **kwargs)
+
+    assistant.worker_pool.run_cpu = counting_run_cpu  # type: ignore[method-assign]
+    texts = ["remind me to stretch", "explain quantum tunnelling", "thanks remind me to eat"]
+    responses = asyncio.run(assistant.handle_batch(texts))
+    assert len(responses) == 3
+    assert responses[1].metadata["route"] in {"local", "cloud"}
+    assert responses[2].metadata["tone"] == "positive"
+    assert dispatched == ["analyze_batch", "execute_plans"]
+    container.shutdown()
+
+
+def test_handle_batch_applies_request_limit_per_item() -> None:
+    container = ServiceContainer(AppConfig(request_rate_limit_per_minute=2))
+    assistant = container.build_assistant()
+    responses = asyncio.run(assistant.handle_batch(["remind me a", "remind me b", "remind me c"]))
+    assert [r.metadata.get("code") for r in responses] == [None, None, "REQUEST_RATE_LIMIT"]
+    container.shutdown()
+
+
+def test_analysis_stage_uses_single_dispatch() -> None:
+    container = ServiceContainer(AppConfig())
+    assistant = container.build_assistant()
+    dispatched: list[str] = []
+    original_run_cpu = assistant.worker_pool.run_cpu
+
+    async def counting_run_cpu(fn, *args, **kwargs):
+        dispatched.append(fn.__name__)
+        return await original_run_cpu(fn, *args, **kwargs)
+
+    assistant.worker_pool.run_cpu = counting_run_cpu  # type: ignore[method-assign]
+    response = asyncio.run(assistant.handle_text("I am stressed remind me now"))
+    assert dispatched == ["analyze", "execute_plan"]
+    assert response.metadata["urgent"] is True
+    assert response.metadata["stressed"] is True
+    container.shutdown()
+
+
+def test_response_cache_replays_safe_intents_only() -> None:
+    container = ServiceContainer(AppConfig())
+    assistant = container.build_assistant()
+    calls: list[str] = []
+    original_create_plan = assistant.reasoning.create_plan
+
+    async def counting_create_plan(text, intent, route, deadline=None):
+        calls.append(intent.intent)
+        return await original_create_plan(text=text, intent=intent, route=route, deadline=deadline)
+
+    assistant.reasoning.create_plan = counting_create_plan  # type: ignore[method-assign]
+
+    async def run() -> list:
+        return [
+            await assistant.handle_text("What is the weather in Paris"),
+            await assistant.handle_text("what is  the WEATHER in paris"),
+            await assistant.handle_text("remind me to stretch"),
+            await assistant.handle_text("remind me to stretch"),
+        ]
+
+    first, second, third, fourth = asyncio.run(run())
+    assert calls == ["weather_query"]
+    assert "cache" not in first.metadata
+    assert second.metadata["cache"] == "hit"
+    assert "cache" not in fourth.metadata and fourth.metadata["reason"] == "compiled_plan"
+    counters = container.metrics.counters()
+    assert counters["response_cache.hits"] == 1
+    assert counters["response_cache.misses"] == 1
+    container.shutdown()
+
+
+def test_repeated_online_prompt_is_served_from_cache_despite_its_own_history(tmp_path: Path) -> None:
+    container = ServiceContainer(AppConfig(sqlite_path=tmp_path / "memory.db", execution_mode=ExecutionMode.ONLINE))
+    assistant = container.build_assistant()
+    prompts: list[str] = []
+    for backend in container.router.balancer.backends:
+        simulate = backend.client._simulate_request
+
+        async def counting_request(prompt: str, provider: str, simulate=simulate):
+            prompts.append(prompt)
+            return await simulate(prompt, provider)
+
+        backend.client._simulate_request = counting_request  # type: ignore[method-assign]
+
+    async def run() -> list:
+        question = "explain how black holes evaporate over time"
+        return [
+            await assistant.handle_text(question),
+            await assistant.handle_text(question),
+            await assistant.handle_text("explain why the sky looks blue during the day"),
+            await assistant.handle_text(question),
+        ]
+
+    first, second, _, after_new_turn = asyncio.run(run())
+    assert first.metadata["route"] == second.metadata["route"] == "cloud"
+    assert second.metadata["cache"] == "hit"
+    assert "cache" not in after_new_turn.metadata
+    assert len(prompts) == 3
+    assert "User: explain why the sky looks blue" in prompts[-1]
+    container.shutdown()
+
+
+def test_identical_concurrent_requests_are_coalesced() -> None:
+    container = ServiceContainer(AppConfig())
+    assistant = container.build_assistant()
+    calls: list[str] = []
+    original_create_plan = assistant.reasoning.create_plan
+
+    async def slow_create_plan(text, intent, route, deadline=None):
+        calls.append(text)
+        await asyncio.sleep(0.05)
+        return await original_create_plan(text=text, intent=intent, route=route, deadline=deadline)
+
+    assistant.reasoning.create_plan = slow_create_plan  # type: ignore[method-assign]
+
+    async def run() -> list:
+        tasks = [asyncio.create_task(assistant.handle_text("what is the weather in paris")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        tasks[0].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    cancelled, second, third = asyncio.run(run())
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert calls == ["what is the weather in paris"]
+    assert second.metadata["status"] == third.metadata["status"]
+    assert second.metadata.get("coalesced") is True
+    assert container.metrics.counters()["singleflight.handle_text.coalesced"] == 2
+    container.shutdown()
+
+
+def test_urgent_requests_use_urgent_lane() -> None:
+    container = ServiceContainer(AppConfig())
+    assistant = container.build_assistant()
+    priorities: dict[str, object] = {}
+    original_run_cpu = assistant.worker_pool.run_cpu
+
+    async def recording_run_cpu(fn, *args, **kwargs):
+        priorities[fn.__name__] = kwargs.get("priority", Priority.NORMAL)
+        return await original_run_cpu(fn, *args, **kwargs)
+
+    assistant.worker_pool.run_cpu = recording_run_cpu  # type: ignore[method-assign]
+    response = asyncio.run(assistant.handle_text("remind me now to call home"))
+    assert priorities["execute_plan"] == Priority.URGENT
+    assert "urgent" in response.metadata["worker_lanes"]
+    container.shutdown()
+
+
+def test_request_deadline_spans_all_stages() -> None:
+    container = ServiceContainer(AppConfig(request_timeout_seconds=0.2))
+    assistant = container.build_assistant()
+    original_analyze = assistant.analyze
+
+    def slow_analyze(text):
+        time.sleep(0.12)
+        return original_analyze(text)
+
+    def slow_execute(plan, deadline=None):
+        time.sleep(0.12)
+        return assistant.executor.__class__.execute_plan(assistant.executor, plan, deadline)
+
+    assistant.analyze = slow_analyze  # type: ignore[method-assign]
+    assistant.executor.execute_plan = slow_execute  # type: ignore[method-assign]
+    started = time.perf_counter()
+    response = asyncio.run(assistant.handle_text("remind me to stretch"))
+    assert response.metadata["status"] == "timeout"
+    assert time.perf_counter() - started < 0.35
+    container.shutdown()
+
+
+def test_interactions_are_written_behind_with_read_your_writes() -> None:
+    container = ServiceContainer(AppConfig(memory_write_max_latency_seconds=60.0))
+    assistant = container.build_assistant()
+    before = len(container.memory_store.recent_interactions(limit=10_000))
+    asyncio.run(assistant.handle_text("thanks remind me to hydrate"))
+    assert len(container.memory_store.recent_interactions(limit=10_000)) == before
+    assert container.context_manager.recent_interactions(limit=1)[0]["text"] == "thanks remind me to hydrate"
+    assert container.context_manager.get_preference("last_tone") == "positive"
+    assert container.memory_writer.flush(timeout=2)
+    assert len(container.memory_store.recent_interactions(limit=10_000)) == before + 1
+    assert container.memory_store.get_preference("last_tone") == "positive"
+    container.shutdown()
+
+
+def test_deterministic_intents_take_the_compiled_fast_path() -> None:
+    container = ServiceContainer(AppConfig())
+    assistant = container.build_assistant()
+    decided: list[str] = []
+    original_decide = assistant.decision_engine.decide
+
+    def recording_decide(**kwargs):
+        decided.append(kwargs["intent"].intent)
+        return original_decide(**kwargs)
+
+    assistant.decision_engine.decide = recording_decide  # type: ignore[method-assign]
+
+    single = asyncio.run(assistant.handle_text("remind me to stretch"))
+    batch = asyncio.run(assistant.handle_batch(["open browser", "tell me a story"]))
+
+    assert decided == ["general_reasoning"]
+    assert single.metadata["reason"] == "compiled_plan"
+    assert "metrics" not in single.metadata
+    assert batch[0].metadata["reason"] == "compiled_plan"
+    assert assistant.analyze("close editor").complexity is None
+    container.shutdown()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from jarvis_assistant.cloud.client import CloudClient, CloudResponse
+from jarvis_assistant.cloud.stub_server import StubProviderServer
+from jarvis_assistant.cloud.transport import HttpRequest, HttpTransport
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+
+def _complete_request(url: str, prompt: str) -> HttpRequest:
+    body = json.dumps({"prompt": prompt, "provider": "stub"}).encode("utf-8")
+    return HttpRequest(method="POST", url=f"{url}/v1/complete", body=body)
+
+
+def test_cloud_client_reuses_keep_alive_connections() -> None:
+    metrics = MetricsCollector()
+
+    async def run() -> tuple[list[str], int]:
+        async with StubProviderServer(latency_seconds=0.0) as server:
+            client = CloudClient(timeout_seconds=2.0, endpoint=server.url, transport=HttpTransport(metrics=metrics))
+            texts = [(await client.complete(f"prompt {i}", provider="stub")).text for i in range(5)]
+            client.close()
+            return texts, server.connections
+
+    texts, connections = asyncio.run(run())
+    assert texts == [f"[Cloud:stub] prompt {i}" for i in range(5)]
+    assert connections == 1
+    assert metrics.counters()["transport.connections_reused"] == 4
+
+
+def test_transport_limits_concurrency_per_host() -> None:
+    async def run() -> int:
+        async with StubProviderServer(latency_seconds=0.02) as server:
+            transport = HttpTransport(max_connections_per_host=2)
+            requests = [_complete_request(server.url, "hi") for _ in range(6)]
+            responses = await asyncio.gather(*(transport.request(request) for request in requests))
+            assert all(response.status == 200 for response in responses)
+            transport.close()
+            return server.connections
+
+    assert asyncio.run(run()) == 2
+
+
+def test_transport_pipelines_requests_on_one_connection() -> None:
+    async def run() -> tuple[list[str], int]:
+        async with StubProviderServer(latency_seconds=0.0) as server:
+            transport = HttpTransport()
+            responses = await transport.pipeline([_complete_request(server.url, f"p{i}") for i in range(4)])
+            transport.close()
+            return [json.loads(response.body)["text"] for response in responses], server.connections
+
+    texts, connections = asyncio.run(run())
+    assert texts == [f"[Cloud:stub] p{i}" for i in range(4)]
+    assert connections == 1
+
+
+def test_transport_reconnects_after_server_closes_idle_connection() -> None:
+    metrics = MetricsCollector()
+
+    async def run() -> tuple[int, int]:
+        async with StubProviderServer(latency_seconds=0.0, keepalive_seconds=0.01) as server:
+            transport = HttpTransport(metrics=metrics)
+            await transport.request(_complete_request(server.url, "first"))
+            await asyncio.sleep(0.05)
+            response = await transport.request(_complete_request(server.url, "second"))
+            transport.close()
+            return response.status, server.connections
+
+    assert asyncio.run(run()) == (200, 2)
+    assert metrics.counters()["transport.connections_opened"] == 2
+
+
+def test_cloud_client_raises_on_http_error() -> None:
+    async def run() -> None:
+        async with StubProviderServer(latency_seconds=0.0) as server:
+            client = CloudClient(timeout_seconds=2.0, endpoint=f"{server.url}/missing")
+            try:
+                await client.complete("hello", provider="stub")
+            finally:
+                client.close()
+
+    with pytest.raises(RuntimeError, match="HTTP 404"):
+        asyncio.run(run())
+
+
+def test_batched_completions_share_one_rate_limit_slot() -> None:
+    client = CloudClient(timeout_seconds=2.0, max_per_minute=1, batch_window_seconds=0.01)
+
+    async def run() -> list[CloudResponse]:
+        return await asyncio.gather(*(client.complete(f"prompt number {i}", provider="openai") for i in range(5)))
+
+    responses = asyncio.run(run())
+    assert [response.text for response in responses] == [f"[Cloud:openai] prompt number {i}" for i in range(5)]
+    assert [response.cost_usd for response in responses] == [client._estimate_cost("prompt number 0")] * 5
+    assert client.total_cost_usd == pytest.approx(sum(response.cost_usd for response in responses))
+    assert client.limiter.remaining() == 0
+
+
+def test_batches_are_split_at_max_batch_size_over_http() -> None:
+    async def run() -> tuple[list[str], int]:
+        async with StubProviderServer(latency_seconds=0.0) as server:
+            client = CloudClient(timeout_seconds=2.0, endpoint=server.url, batch_window_seconds=0.05, max_batch_size=3)
+            responses = await asyncio.gather(*(client.complete(f"p{i}", provider="stub") for i in range(7)))
+            client.close()
+            return [response.text for response in responses], server.requests
+
+    texts, requests = asyncio.run(run())
+    assert texts == [f"[Cloud:stub] p{i}" for i in range(7)]
+    assert requests == 3
+
+
+def test_batched_caller_timeout_does_not_fail_the_batch() -> None:
+    client = CloudClient(timeout_seconds=2.0, batch_window_seconds=0.01)
+
+    async def run() -> tuple[BaseException | CloudResponse, BaseException | CloudResponse]:
+        impatient = client.complete("first", provider="openai", timeout=0.001)
+        patient = client.complete("second", provider="openai")
+        return tuple(await asyncio.gather(impatient, patient, return_exceptions=True))  # type: ignore[return-value]
+
+    impatient, patient = asyncio.run(run())
+    assert isinstance(impatient, asyncio.TimeoutError)
+    assert isinstance(patient, CloudResponse)
+    assert patient.text == "[Cloud:openai] second"
+
+
+def test_cloud_client_streams_from_the_endpoint_over_keep_alive() -> None:
+    async def run() -> tuple[list[list[str]], int, int, float]:
+        async with StubProviderServer(latency_seconds=0.0) as server:
+            client = CloudClient(timeout_seconds=2.0, endpoint=server.url)
+            streams = [[delta async for delta in client.stream_complete(f"hello {i}", "stub")] for i in range(2)]
+            total = client.total_cost_usd
+            client.close()
+            return streams, server.requests, server.connections, total
+
+    streams, requests, connections, total = asyncio.run(run())
+    assert streams == [["[Cloud:stub]", " hello", " 0"], ["[Cloud:stub]", " hello", " 1"]]
+    assert (requests, connections) == (2, 1)
+    assert total == pytest.approx(0.00004)
+
+
+async def _drop_after(answered: int, drop: bytes, received: list[list[bytes]]) -> asyncio.Server:
+    """Starts a server whose first connection answers `answered` requests, then sends `drop` and closes."""
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        bodies: list[bytes] = []
+        received.append(bodies)
+        first = len(received) == 1
+        while request_line := await reader.readline():
+            length = 0
+            while (line := await reader.readline()) not in {b"\r\n", b""}:
+                name, _, value = line.decode("latin-1").partition(":")
+                length = int(value) if name.lower() == "content-length" else length
+            body = await reader.readexactly(length)
+            bodies.append(json.loads(body)["prompt"].encode())
+            if first and len(bodies) > answered:
+                writer.write(drop)
+                break
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(serve, "127.0.0.1", 0)
+
+
+@pytest.mark.parametrize(
+    "drop",
+    [b"", b"HTTP/1.1 2", b"HTTP/1.1 200 OK\r\nContent-Length: 50\r\n\r\n{"],
+    ids=["closed", "truncated_status_line", "truncated_body"],
+)
+def test_pipeline_replays_only_unanswered_requests_after_a_stale_connection(drop: bytes) -> None:
+    received: list[list[bytes]] = []
+
+    async def run() -> list[str]:
+        server = await _drop_after(2, drop, received)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        transport = HttpTransport()
+        try:
+            await transport.request(_complete_request(url, "warm"))
+            responses = await transport.pipeline([_complete_request(url, p) for p in ("a", "b", "c")])
+        finally:
+            transport.close()
+            server.close()
+            await server.wait_closed()
+        return [json.loads(response.body)["prompt"] for response in responses]
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert received == [[b"warm", b"a", b"b"], [b"b", b"c"]]
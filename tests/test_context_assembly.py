@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+from jarvis_assistant.ai.reasoning import ReasoningEngine
+from jarvis_assistant.cloud.model_router import ModelRouter
+from jarvis_assistant.cloud.semantic_cache import SemanticCache
+from jarvis_assistant.contracts.results import ActionResult, ResultStatus
+from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.core.models import IntentResult
+from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker
+from jarvis_assistant.memory.context_assembler import ContextAssembler
+from jarvis_assistant.memory.context_manager import ContextManager
+from jarvis_assistant.memory.store import MemoryStore
+
+
+def test_assembler_packs_relevant_turns_within_budget() -> None:
+    assembler = ContextAssembler(max_turns=50, token_budget=30)
+    assembler.append("my sister lives in Lisbon", "Noted, Lisbon.")
+    for i in range(40):
+        assembler.append(f"filler request {i}", f"filler answer {i}")
+
+    turns = assembler.select("book a flight to see my sister in Lisbon")
+    assert sum(turn.tokens for turn in turns) <= 30
+    assert turns[0].rendered == "User: my sister lives in Lisbon\nAssistant: Noted, Lisbon."
+    assert turns[-1].rendered == "User: filler request 39\nAssistant: filler answer 39"
+    assert len(assembler) == 41
+    assert assembler.select("anything", token_budget=0) == []
+
+
+def test_context_is_mirrored_from_memory_into_cloud_prompts(tmp_path: Path) -> None:
+    config = AppConfig(sqlite_path=tmp_path / "memory.db")
+    store = MemoryStore(config)
+    store.add_interaction("my dog is called Rex", "general_reasoning", {"message": "Nice name!"})
+    assembler = ContextAssembler(max_turns=8, token_budget=64)
+    assembler.warm(store.recent_interactions(8))
+    context = ContextManager(store, assembler=assembler)
+    intent = IntentResult(intent="general_reasoning", confidence=0.9, entities={})
+    reply = ActionResult(status=ResultStatus.SUCCESS, confidence=0.9, message="He is a good boy.")
+    context.record_interaction("tell me about Rex", intent, reply)
+
+    router = ModelRouter(config=config, circuit_breaker=CircuitBreaker(), logger=logging.getLogger("test"))
+    reasoning = ReasoningEngine(router=router, logger=logging.getLogger("test"), context=assembler)
+    plan = asyncio.run(reasoning.create_plan("what should I feed Rex", intent, route="cloud"))
+    store.close()
+
+    message = plan.steps[0]["message"]
+    assert message.startswith("[Cloud:openai] Conversation so far:\nUser: my dog is called Rex\nAssistant: Nice name!")
+    assert "User: tell me about Rex\nAssistant: He is a good boy." in message
+    assert message.endswith("\n\nUser: what should I feed Rex")
+    local = asyncio.run(reasoning.create_plan("what should I feed Rex", intent, route="local"))
+    assert local.steps[0]["message"] == "[Local reasoning] what should I feed Rex"
+
+
+def test_semantic_cache_keys_on_the_request_not_the_shared_history() -> None:
+    assembler = ContextAssembler(max_turns=32, token_budget=384)
+    for i in range(20):
+        assembler.append(f"earlier request number {i} about my schedule", f"earlier answer number {i} about it")
+    cache = SemanticCache(max_entries=8, ttl_seconds=60)
+    router = ModelRouter(
+        config=AppConfig(), circuit_breaker=CircuitBreaker(), logger=logging.getLogger("test"), semantic_cache=cache
+    )
+    reasoning = ReasoningEngine(router=router, logger=logging.getLogger("test"), context=assembler)
+    intent = IntentResult(intent="general_reasoning", confidence=0.9, entities={})
+
+    def ask(text: str):
+        return asyncio.run(reasoning.create_plan(text, intent, route="cloud"))
+
+    france = ask("what is the capital of france")
+    bread = ask("how do I bake sourdough bread")
+    assert france.metadata["context_digest"]
+    assert france.steps[0]["message"].endswith("User: what is the capital of france")
+    assert bread.steps[0]["message"].endswith("User: how do I bake sourdough bread")
+    assert ask("what is the capital of france").steps[0]["message"] == france.steps[0]["message"]
+
+    assembler.append("what is the capital of france", "Paris.")
+    repeated = ask("what is the capital of france")
+    assert repeated.metadata["context_digest"] == france.metadata["context_digest"]
+    assert repeated.steps[0]["message"] == france.steps[0]["message"]
+
+    assembler.append("I am travelling to france next week", "Enjoy the trip.")
+    followup = ask("what is the capital of france")
+    assert followup.metadata["context_digest"] != france.metadata["context_digest"]
+    assert "Assistant: Enjoy the trip." in followup.steps[0]["message"]
+    assert len(cache) == 3
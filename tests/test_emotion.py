@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from jarvis_assistant.ai.emotion import EmotionalToneDetector, load_lexicon
+
+
+def test_lexicon_handles_negation_intensifiers_and_punctuation() -> None:
+    detector = EmotionalToneDetector()
+
+    assert detector.detect("thanks, that was great!") == "positive"
+    assert detector.detect("this is not good at all") == "negative"
+    assert detector.detect("not bad") == "positive"
+    assert detector.detect("slightly annoyed") == "neutral"
+    assert detector.detect("very annoyed") == "negative"
+    assert detector.detect_urgency_and_stress("I need this now, I'm stressed") == {"urgent": True, "stressed": True}
+    assert detector.detect_urgency_and_stress("it is not urgent") == {"urgent": False, "stressed": False}
+
+
+def test_invalid_lexicon_line_is_reported(tmp_path: Path) -> None:
+    path = tmp_path / "lexicon.tsv"
+    path.write_text("great\t1.0\t0\t0\nvery\tintensify\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="line 2"):
+        load_lexicon(path)
+
+
+def test_vectorized_batch_matches_single_text_scoring() -> None:
+    pytest.importorskip("numpy")
+    detector = EmotionalToneDetector()
+    rng = random.Random(3)
+    vocab = [*detector.lexicon.index, "the", "build", "deploy", "again", "today"]
+    texts = [" ".join(rng.choices(vocab, k=rng.randint(0, 12))) for _ in range(300)]
+
+    batch = detector.detect_batch(texts)
+
+    for text, scored in zip(texts, batch):
+        single = detector.score(text)
+        assert scored.tone == single.tone and scored.markers() == single.markers()
+        assert scored.valence == pytest.approx(single.valence)
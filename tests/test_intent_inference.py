@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from jarvis_assistant.ai.nlp_engine import NLPEngine
+from jarvis_assistant.core.models import IntentResult
+
+
+class _StubClassifier:
+    def __init__(self, intent: str, confidence: float) -> None:
+        self.intent = intent
+        self.confidence = confidence
+        self.calls: list[list[str]] = []
+
+    def predict_many(self, texts: Sequence[str]) -> list[IntentResult]:
+        self.calls.append(list(texts))
+        return [IntentResult(intent=self.intent, confidence=self.confidence, raw_text=text) for text in texts]
+
+    def close(self) -> None:
+        pass
+
+
+def test_nlp_engine_consults_model_only_without_confident_rule() -> None:
+    classifier = _StubClassifier("play_music", 0.9)
+    nlp = NLPEngine(logging.getLogger("test"), classifier=classifier)
+
+    results = nlp.parse_batch(["open browser", "put on some jazz", "hum a tune"])
+
+    assert [result.intent for result in results] == ["open_app", "play_music", "play_music"]
+    assert classifier.calls == [["put on some jazz", "hum a tune"]]
+
+
+def test_nlp_engine_keeps_rule_result_when_model_is_unsure() -> None:
+    nlp = NLPEngine(logging.getLogger("test"), classifier=_StubClassifier("play_music", 0.3))
+
+    assert nlp.parse("tell me a story").intent == "general_reasoning"
+
+
+def test_inference_service_batches_concurrent_requests() -> None:
+    torch = pytest.importorskip("torch")
+    from jarvis_assistant.ai.intent_inference import IntentInferenceService
+    from jarvis_assistant.ai.intent_model import IntentClassifier
+
+    torch.manual_seed(0)
+    model = IntentClassifier(input_dim=4, hidden_dim=8, num_classes=2)
+    batch_sizes: list[int] = []
+
+    def featurize(texts: Sequence[str]) -> torch.Tensor:
+        batch_sizes.append(len(texts))
+        return torch.tensor([[float(len(text)), 1.0, 0.0, 1.0] for text in texts])
+
+    service = IntentInferenceService(
+        model,
+        labels=["a", "b"],
+        featurize=featurize,
+        logger=logging.getLogger("test"),
+        max_batch_size=8,
+        max_wait_seconds=0.05,
+    )
+    results: list[IntentResult] = []
+    threads = [threading.Thread(target=lambda i=i: results.append(service.predict(f"text {i}"))) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    service.close()
+
+    assert len(results) == 8
+    assert all(result.intent in {"a", "b"} and 0.5 <= result.confidence <= 1.0 for result in results)
+    assert len(batch_sizes) < 8
+    assert not model.training
+
+
+def test_exported_model_matches_eager_predictions(tmp_path: Path) -> None:
+    torch = pytest.importorskip("torch")
+    from jarvis_assistant.ai.intent_model import IntentClassifier, export_for_inference, load_exported, save_exported
+
+    torch.manual_seed(0)
+    model = IntentClassifier(input_dim=16, hidden_dim=32, num_classes=4)
+    features = torch.randn(64, 16)
+    with torch.inference_mode():
+        expected = model.eval()(features)
+
+    frozen = export_for_inference(model, quantize=False)
+    save_exported(export_for_inference(model), tmp_path / "intent.pt", {"labels": ["a", "b", "c", "d"]})
+    quantized, metadata = load_exported(tmp_path / "intent.pt")
+
+    with torch.inference_mode():
+        assert torch.allclose(frozen(features), expected, atol=1e-5)
+        agreement = (quantized(features).argmax(dim=-1) == expected.argmax(dim=-1)).float().mean()
+    assert agreement >= 0.9
+    assert metadata == {"labels": ["a", "b", "c", "d"]}
+    assert any(isinstance(module, torch.nn.Dropout) for module in model.modules())
+
+
+def test_hashing_vectorizer_is_stable_normalized_and_cached() -> None:
+    torch = pytest.importorskip("torch")
+    from jarvis_assistant.ai.vectorizer import HashingVectorizer, HashingVectorizerSpec
+    from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+    metrics = MetricsCollector()
+    vectorizer = HashingVectorizer(HashingVectorizerSpec(dim=1024), metrics=metrics)
+
+    batch = vectorizer(["Open the browser", "open the browser", "", "weather in berlin"])
+
+    assert batch.shape == (4, 1024)
+    assert torch.equal(batch[0], batch[1])
+    assert torch.allclose(batch.norm(dim=1), torch.tensor([1.0, 1.0, 0.0, 1.0]))
+    assert metrics.counters()["vectorizer_cache.hits"] == 1
+    assert torch.equal(HashingVectorizer(HashingVectorizerSpec(dim=1024)).transform(["weather in berlin"])[0], batch[3])
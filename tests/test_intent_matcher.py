@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+from pathlib import Path
+
+from jarvis_assistant.ai.intent_matcher import CompiledRuleMatcher, Rule, load_rules
+from jarvis_assistant.ai.nlp_engine import NLPEngine
+
+
+def _legacy_match(rules: list[Rule], text: str) -> str | None:
+    ordered = sorted(enumerate(rules), key=lambda item: (item[1].priority, item[0]))
+    for _, rule in ordered:
+        if re.search(rule.pattern, text):
+            return rule.intent
+    return None
+
+
+def test_compiled_matcher_agrees_with_sequential_search() -> None:
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(300)]
+    rules: list[Rule] = []
+    for i in range(400):
+        words = "|".join(rng.sample(vocab, 3))
+        if i % 5 == 0:
+            pattern = rf"{rng.choice(vocab)}\s+{rng.choice(vocab)}"
+        elif i % 7 == 0:
+            pattern = rf"\b({rng.choice(vocab)})\b.*\1"
+        else:
+            pattern = rf"\b({words})\b"
+        rules.append(Rule(pattern=pattern, intent=f"intent_{i}", priority=rng.randint(0, 5)))
+    matcher = CompiledRuleMatcher(rules)
+    for _ in range(500):
+        text = " ".join(rng.choices(vocab + ["filler"] * 300, k=8))
+        found = matcher.match(text)
+        assert (found.rule.intent if found else None) == _legacy_match(rules, text)
+
+
+def test_priority_and_named_entities() -> None:
+    matcher = CompiledRuleMatcher(
+        [
+            Rule(pattern=r"\b(open)\b", intent="open_app", priority=10),
+            Rule(pattern=r"open (?P<app>\w+) in (?P<workspace>\w+)", intent="open_in_workspace", priority=1),
+        ]
+    )
+    found = matcher.match("please open editor in work")
+    assert found is not None
+    assert found.rule.intent == "open_in_workspace"
+    assert found.entities == {"match": "open editor in work", "app": "editor", "workspace": "work"}
+    assert matcher.match("open sesame").entities == {"match": "open"}  # type: ignore[union-attr]
+
+
+def test_rules_with_inline_global_flags_compile_and_match() -> None:
+    rules = [
+        Rule(pattern=r"(?i)HELLO (?P<name>\w+)", intent="greet", priority=1),
+        Rule(pattern=r"(?s)(?m)^start.+end$", intent="block", priority=2),
+        Rule(pattern="(?x) bye \\s+ now  # farewell", intent="farewell", priority=3),
+        Rule(pattern=r"\b(status)\b", intent="status", priority=4),
+    ]
+    matcher = CompiledRuleMatcher(rules)
+    found = matcher.match("well hello there")
+    assert found is not None and found.rule.intent == "greet"
+    assert found.entities == {"match": "hello there", "name": "there"}
+    for text in ["start\nmiddle\nend", "bye  now", "status please", "nothing here"]:
+        found = matcher.match(text)
+        assert (found.rule.intent if found else None) == _legacy_match(rules, text)
+
+
+def test_nlp_engine_loads_rules_from_file(tmp_path: Path) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"pattern": r"\b(deploy)\b", "intent": "deploy", "priority": 1}]))
+    engine = NLPEngine(logging.getLogger("test"), rules=load_rules(path))
+    assert engine.parse("Deploy the app").intent == "deploy"
+    assert engine.parse("open terminal").intent == "general_reasoning"
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pytest
+
+from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.memory.store import MemoryStore
+
+
+def _seed_interactions(path: Path, rows: int) -> None:
+    store = MemoryStore(AppConfig(sqlite_path=path))
+    samples = [("play some jazz please", "play_music"), ("what is the weather in paris", "weather_query")]
+    store.write_batch([(*samples[i % 2], {}) for i in range(rows)], {})
+    store.close()
+
+
+def test_streaming_trainer_checkpoints_resumes_and_exports(tmp_path: Path) -> None:
+    pytest.importorskip("torch")
+    from jarvis_assistant.ai.intent_model import load_exported
+    from jarvis_assistant.ai.intent_training import IntentTrainer, TrainingConfig
+    from jarvis_assistant.ai.vectorizer import HashingVectorizer, HashingVectorizerSpec
+
+    db_path = tmp_path / "memory.db"
+    _seed_interactions(db_path, 400)
+    spec = HashingVectorizerSpec(dim=256)
+    config = TrainingConfig(batch_size=16, chunk_size=50, shuffle_buffer=64, num_workers=0, max_epochs=2, hidden_dim=16)
+    trainer = IntentTrainer(db_path, tmp_path / "ckpt", logging.getLogger("test"), config=config, spec=spec)
+
+    first = trainer.train()
+    assert first.labels == ["play_music", "weather_query"]
+    assert [epoch.samples for epoch in first.epochs] == [360, 360]
+    assert all(epoch.samples_per_second > 0 for epoch in first.epochs)
+
+    config.max_epochs = 3
+    resumed = trainer.train()
+    assert [epoch.epoch for epoch in resumed.epochs] == [2]
+    assert resumed.epochs[0].val_accuracy >= 0.9
+
+    trainer.export_best(tmp_path / "intent.pt")
+    model, metadata = load_exported(tmp_path / "intent.pt")
+    features = HashingVectorizer(HashingVectorizerSpec.from_dict(metadata["vectorizer"]))(["play some jazz please"])
+    assert metadata["labels"][int(model(features).argmax())] == "play_music"
+
+
+def test_trainer_rejects_an_empty_validation_split(tmp_path: Path) -> None:
+    pytest.importorskip("torch")
+    from jarvis_assistant.ai.intent_training import IntentTrainer, TrainingConfig
+
+    db_path = tmp_path / "memory.db"
+    _seed_interactions(db_path, 5)
+    config = TrainingConfig(num_workers=0, holdout_modulus=10)
+    trainer = IntentTrainer(db_path, tmp_path / "ckpt", logging.getLogger("test"), config=config)
+
+    with pytest.raises(RuntimeError, match="validation split"):
+        trainer.train()
+    with pytest.raises(RuntimeError, match="run train"):
+        trainer.export_best(tmp_path / "intent.pt")
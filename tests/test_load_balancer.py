@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+
+from jarvis_assistant.cloud.client import CloudClient
+from jarvis_assistant.cloud.load_balancer import ProviderBackend, ProviderBalancer
+from jarvis_assistant.cloud.model_router import ModelRouter
+from jarvis_assistant.cloud.stub_server import StubProviderServer
+from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+
+def _backend(name: str, max_per_minute: int = 30) -> ProviderBackend:
+    return ProviderBackend(
+        name=name,
+        client=CloudClient(timeout_seconds=1.0, max_per_minute=max_per_minute),
+        breaker=CircuitBreaker(failure_threshold=1, cooldown_seconds=60),
+    )
+
+
+def test_router_prefers_the_faster_provider() -> None:
+    metrics = MetricsCollector()
+
+    async def run() -> tuple[list[str], int, int]:
+        async with StubProviderServer(latency_seconds=0.005) as fast, StubProviderServer(latency_seconds=0.08) as slow:
+            config = AppConfig(
+                cloud_provider="slow",
+                cloud_fallback_providers=("fast",),
+                cloud_provider_endpoints=(("slow", slow.url), ("fast", fast.url)),
+                cloud_rate_limit_per_minute=1000,
+            )
+            router = ModelRouter(config, CircuitBreaker(), logging.getLogger("test"), metrics=metrics)
+            outputs: list[str] = []
+            for wave in range(6):
+                outputs += await asyncio.gather(
+                    *(router.generate(f"wave {wave} prompt {i}", route="cloud") for i in range(6))
+                )
+            router.cloud_client.close()
+            return outputs, fast.requests, slow.requests
+
+    outputs, fast_requests, slow_requests = asyncio.run(run())
+    assert not any(output.startswith("[Local") for output in outputs)
+    assert fast_requests + slow_requests == 36
+    assert fast_requests > 2 * slow_requests
+    counters = metrics.counters()
+    assert counters["backend.fast.requests"] == fast_requests
+    assert counters["backend.fast.cost_usd"] > 0
+    gauges = metrics.snapshot()["gauges"]
+    assert gauges["backend.fast.in_flight"] == 0
+    assert gauges["backend.fast.ewma_latency_ms"] < gauges["backend.slow.ewma_latency_ms"]
+
+
+def test_balancer_skips_open_and_rate_limited_backends() -> None:
+    tripped, spent, healthy = _backend("tripped"), _backend("spent", max_per_minute=1), _backend("healthy")
+    tripped.breaker.record_failure()
+    assert spent.client.limiter.allow()
+    balancer = ProviderBalancer([tripped, spent, healthy], rng=random.Random(7))
+
+    assert all(balancer.select() is healthy for _ in range(10))
+    healthy.breaker.record_failure()
+    assert balancer.select() is None
+
+
+def test_least_outstanding_balances_in_flight_calls() -> None:
+    first, second = _backend("first"), _backend("second")
+    balancer = ProviderBalancer([first, second], strategy="least_outstanding")
+    for backend in (first, second):
+        balancer.started(backend)
+        balancer.finished(backend, 0.01, failed=False)
+
+    picked = []
+    for _ in range(4):
+        backend = balancer.select()
+        assert backend is not None
+        balancer.started(backend)
+        picked.append(backend.name)
+    assert sorted(picked) == ["first", "first", "second", "second"]
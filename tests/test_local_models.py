@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from jarvis_assistant.ai.local_models import DEFAULT_LOCAL_MODELS, LocalModelManager, SimulatedLocalBackend
+from jarvis_assistant.cloud.model_router import ModelRouter
+from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker
+from jarvis_assistant.infrastructure.fair_queue import FairQueue
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def _manager(backend: SimulatedLocalBackend, **kwargs) -> LocalModelManager:
+    options = {"tier": "medium", "ram_budget_gb": 8.0, "available_ram": lambda: 64.0, **kwargs}
+    return LocalModelManager(backend, DEFAULT_LOCAL_MODELS, logger=logging.getLogger("test"), **options)
+
+
+def test_preloaded_pool_serves_by_complexity_without_cold_loads() -> None:
+    backend = SimulatedLocalBackend(load_seconds_per_gb=0.002, generate_seconds=0.0)
+    metrics = MetricsCollector()
+    manager = _manager(backend, metrics=metrics)
+    assert [spec.name for spec in manager.pool] == ["jarvis-small", "jarvis-medium"]
+
+    manager.start()
+    _wait_for(lambda: len(manager.loaded_models()) == 2)
+    simple = asyncio.run(manager.generate("hi", complexity=0.1))
+    complex_ = asyncio.run(manager.generate("plan my week", complexity=0.9))
+    manager.close()
+
+    assert simple == "[Local:jarvis-small] hi"
+    assert complex_ == "[Local:jarvis-medium] plan my week"
+    assert backend.loads == ["jarvis-small", "jarvis-medium"]
+    assert metrics.counters()["local.warm_hits"] == 2
+
+
+def test_cold_model_is_substituted_by_a_warm_one_while_it_loads() -> None:
+    backend = SimulatedLocalBackend(load_seconds_per_gb=0.01, generate_seconds=0.0)
+    metrics = MetricsCollector()
+    manager = _manager(backend, metrics=metrics)
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(manager.generate(f"q{i}", complexity=0.1) for i in range(3)))
+
+    assert asyncio.run(run()) == [f"[Local:jarvis-small] q{i}" for i in range(3)]
+    assert asyncio.run(manager.generate("deep question", complexity=0.9)) == "[Local:jarvis-small] deep question"
+    _wait_for(lambda: "jarvis-medium" in manager.loaded_models())
+    assert asyncio.run(manager.generate("deep question", complexity=0.9)) == "[Local:jarvis-medium] deep question"
+    assert backend.loads == ["jarvis-small", "jarvis-medium"]
+    counters = metrics.counters()
+    assert counters["local.cold_starts"] == 1
+    assert counters["local.warm_substitutes"] == 1
+
+
+def test_idle_models_are_evicted_under_memory_pressure() -> None:
+    backend = SimulatedLocalBackend(load_seconds_per_gb=0.0, generate_seconds=0.0)
+    free_gb = [64.0]
+    manager = _manager(backend, tier="large", ram_budget_gb=12.0, available_ram=lambda: free_gb[0])
+    assert [spec.name for spec in manager.pool] == ["jarvis-small", "jarvis-large"]
+
+    asyncio.run(manager.generate("a", complexity=0.9))
+    asyncio.run(manager.generate("b", complexity=0.1))
+    _wait_for(lambda: len(manager.loaded_models()) == 2)
+    asyncio.run(manager.generate("c", complexity=0.1))
+    assert manager.loaded_models() == ["jarvis-large", "jarvis-small"]
+
+    free_gb[0] = 0.5
+    manager.relieve_pressure()
+    assert manager.loaded_models() == ["jarvis-small"]
+    assert backend.unloads == ["jarvis-large"]
+
+
+def test_fair_queue_serves_waiters_in_arrival_order() -> None:
+    queue = FairQueue(1)
+    order: list[int] = []
+
+    async def worker(index: int) -> None:
+        async with queue.slot():
+            order.append(index)
+            await asyncio.sleep(0.001)
+
+    async def run() -> None:
+        first = asyncio.create_task(worker(0))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(worker(i)) for i in range(1, 5)]
+        await asyncio.sleep(0)
+        waiters[1].cancel()
+        await asyncio.gather(first, *waiters, return_exceptions=True)
+        late = [asyncio.create_task(worker(i)) for i in range(5, 7)]
+        await asyncio.gather(*late)
+
+    asyncio.run(run())
+    assert order == [0, 1, 3, 4, 5, 6]
+    assert queue.waiting() == 0
+
+
+def test_router_local_route_uses_model_manager() -> None:
+    backend = SimulatedLocalBackend(load_seconds_per_gb=0.0, generate_seconds=0.0)
+    router = ModelRouter(
+        config=AppConfig(),
+        circuit_breaker=CircuitBreaker(),
+        logger=logging.getLogger("test"),
+        local_models=_manager(backend),
+    )
+    assert asyncio.run(router.generate("hello", route="local", complexity=0.1)) == "[Local:jarvis-small] hello"
+
+
+def test_cancelled_generation_keeps_its_slot_until_the_backend_returns() -> None:
+    class CountingBackend(SimulatedLocalBackend):
+        def __init__(self) -> None:
+            super().__init__(load_seconds_per_gb=0.0, generate_seconds=0.1)
+            self.running = 0
+            self.peak = 0
+
+        def generate(self, model: str, prompt: str) -> str:
+            with self._lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            try:
+                return super().generate(model, prompt)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+    backend = CountingBackend()
+    manager = _manager(backend, max_concurrent=1)
+
+    async def run() -> str:
+        first = asyncio.create_task(manager.generate("first", complexity=0.1))
+        await asyncio.sleep(0.03)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        return await manager.generate("second", complexity=0.1)
+
+    assert asyncio.run(run()) == "[Local:jarvis-small] second"
+    manager.close()
+    assert backend.peak == 1
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import sqlite3
+import threading
 from pathlib import Path
 
 import pytest
@@ -9,8 +11,13 @@ import pytest
 from jarvis_assistant.contracts.results import ActionResult, ResultStatus
 from jarvis_assistant.core.config import AppConfig
 from jarvis_assistant.infrastructure.errors import ErrorBoundary
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
+from jarvis_assistant.infrastructure.ttl_cache import LRUTTLCache
+from jarvis_assistant.memory.sqlite_pool import SQLiteConnectionManager, SQLiteTuning
+from jarvis_assistant.memory.store import MemoryStore
+from jarvis_assistant.memory.write_behind import WriteBehindWriter
 from jarvis_assistant.plugins.loader import PluginLoader
-from jarvis_assistant.runtime.worker_pool import AsyncWorkerPool, WorkerTask
+from jarvis_assistant.runtime.worker_pool import AsyncWorkerPool, Priority, WorkerTask
 
 
 def test_error_boundary_contains_crash() -> None:
@@ -68,3 +75,123 @@ PLUGIN = Bad()
 def test_structured_action_result() -> None:
     result = ActionResult(status=ResultStatus.SUCCESS, confidence=0.9, message="ok")
     assert result.status == ResultStatus.SUCCESS
+
+
+def test_lru_ttl_cache_eviction_and_expiry(monkeypatch: pytest.MonkeyPatch) -> None:
+    metrics = MetricsCollector()
+    cache: LRUTTLCache[str, int] = LRUTTLCache(max_entries=2, ttl_seconds=10, metrics=metrics, name="c")
+    now = [100.0]
+    monkeypatch.setattr("jarvis_assistant.infrastructure.ttl_cache.time.monotonic", lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    now[0] += 11
+    assert cache.get("a") is None
+    assert metrics.counters() == {"c.hits": 1, "c.evictions": 1, "c.misses": 2, "c.expirations": 1}
+
+
+def _ordered_run(pool: AsyncWorkerPool) -> list[str]:
+    gate = threading.Event()
+    order: list[str] = []
+
+    async def run() -> None:
+        blocker = asyncio.ensure_future(pool.run_cpu(gate.wait))
+        await asyncio.sleep(0.01)
+        jobs = [
+            asyncio.ensure_future(pool.run_cpu(order.append, name, priority=priority))
+            for name, priority in (("bulk", Priority.BULK), ("normal", Priority.NORMAL), ("urgent", Priority.URGENT))
+        ]
+        await asyncio.sleep(0.01)
+        assert pool.lane_stats()["bulk"]["depth"] == 1.0
+        gate.set()
+        await asyncio.gather(blocker, *jobs)
+
+    asyncio.run(run())
+    return order
+
+
+def test_worker_pool_priority_lanes() -> None:
+    pool = AsyncWorkerPool(max_workers=1)
+    try:
+        assert _ordered_run(pool) == ["urgent", "normal", "bulk"]
+        stats = pool.lane_stats()
+        assert stats["urgent"]["dispatched"] == 1.0
+        assert stats["bulk"]["max_wait_ms"] >= stats["urgent"]["max_wait_ms"]
+    finally:
+        pool.shutdown()
+
+
+def test_worker_pool_starvation_protection() -> None:
+    pool = AsyncWorkerPool(max_workers=1, starvation_seconds=0.0)
+    try:
+        assert _ordered_run(pool) == ["bulk", "normal", "urgent"]
+    finally:
+        pool.shutdown()
+
+
+def test_write_behind_group_commit_and_close_flush(tmp_path: Path) -> None:
+    store = MemoryStore(AppConfig(sqlite_path=tmp_path / "memory.db"))
+    batches: list[int] = []
+    original_write_batch = store.write_batch
+
+    def counting_write_batch(interactions, preferences):
+        batches.append(len(interactions))
+        original_write_batch(interactions, preferences)
+
+    store.write_batch = counting_write_batch  # type: ignore[method-assign]
+    writer = WriteBehindWriter(store, logging.getLogger("test"), max_batch=3, max_latency_seconds=60.0)
+    for i in range(3):
+        writer.add_interaction(text=f"t{i}", intent="general_reasoning", result={"i": i})
+    assert writer.flush(timeout=2)
+    writer.add_interaction(text="t3", intent="general_reasoning", result={})
+    writer.close()
+    assert batches == [3, 1]
+    assert [row["text"] for row in store.recent_interactions(10)] == ["t0", "t1", "t2", "t3"]
+    store.close()
+
+
+def test_memory_store_uses_wal_and_serves_threads_concurrently(tmp_path: Path) -> None:
+    store = MemoryStore(AppConfig(sqlite_path=tmp_path / "memory.db", sqlite_max_readers=2))
+    assert store.db.journal_mode() == "wal"
+    errors: list[BaseException] = []
+
+    def writer() -> None:
+        for i in range(50):
+            store.add_interaction(text=f"w{i}", intent="general_reasoning", result={"i": i})
+        store.set_preference("last_tone", "calm")
+
+    def reader() -> None:
+        try:
+            for _ in range(50):
+                rows = store.recent_interactions(5)
+                assert len(rows) <= 5
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer), *(threading.Thread(target=reader) for _ in range(4))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert 1 <= len(store.db._opened) <= 2
+    assert [row["text"] for row in store.recent_interactions(2)] == ["w48", "w49"]
+    assert store.get_preference("last_tone") == "calm"
+    store.close()
+
+
+def test_sqlite_readers_are_query_only_and_tuned(tmp_path: Path) -> None:
+    db = SQLiteConnectionManager(tmp_path / "tuned.db", SQLiteTuning(synchronous="off", mmap_size_bytes=1 << 20))
+    with db.write() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    with db.read() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1 << 20
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO t VALUES (1)")
+    db.close()
+    with pytest.raises(ValueError):
+        SQLiteConnectionManager(tmp_path / "bad.db", SQLiteTuning(journal_mode="wal; DROP TABLE t"))
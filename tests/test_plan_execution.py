@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from jarvis_assistant.contracts.results import ReasoningResult, ResultStatus
+from jarvis_assistant.core.config import AppConfig
+from jarvis_assistant.core.container import ServiceContainer
+from jarvis_assistant.infrastructure.deadline import Deadline
+from jarvis_assistant.plugins.base import PluginBase, PluginMetadata
+
+
+class _SleepyPlugin(PluginBase):
+    def __init__(self, name: str, delay: float, success: bool = True) -> None:
+        self.metadata = PluginMetadata(name=name, version="0", description="test")
+        self.delay = delay
+        self.success = success
+        self.contexts: list[dict[str, Any]] = []
+
+    def initialize(self) -> None:
+        pass
+
+    def can_handle(self, command: str) -> bool:
+        return True
+
+    def handle(self, command: str, context: dict[str, Any]) -> dict[str, Any]:
+        self.contexts.append(context)
+        time.sleep(self.delay)
+        return {"success": self.success, "message": f"{self.metadata.name}:{command}"}
+
+
+def _plan(*steps: dict[str, Any]) -> ReasoningResult:
+    return ReasoningResult(status=ResultStatus.SUCCESS, confidence=0.9, plan_name="test", steps=list(steps))
+
+
+def test_independent_steps_run_concurrently_and_dependents_get_upstream() -> None:
+    container = ServiceContainer(AppConfig())
+    slow_a, slow_b, after = _SleepyPlugin("a", 0.2), _SleepyPlugin("b", 0.2), _SleepyPlugin("c", 0.0)
+    container.executor.plugin_registry.update({"a": slow_a, "b": slow_b, "c": after})
+
+    started = time.perf_counter()
+    result = container.executor.execute_plan(
+        _plan(
+            {"id": "a", "type": "plugin", "name": "a", "payload": "1"},
+            {"id": "b", "type": "plugin", "name": "b", "payload": "2"},
+            {"id": "c", "type": "plugin", "name": "c", "payload": "3", "depends_on": ["a", "b"]},
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    assert result.status == ResultStatus.SUCCESS
+    assert elapsed < 0.35
+    assert [step["id"] for step in result.metadata["steps"]] == ["a", "b", "c"]
+    assert after.contexts[0]["step"]["upstream"]["a"]["message"] == "a:1"
+    container.shutdown()
+
+
+def test_failed_step_gives_partial_status_and_skips_dependents() -> None:
+    container = ServiceContainer(AppConfig())
+    container.executor.plugin_registry.update(
+        {"ok": _SleepyPlugin("ok", 0.0), "bad": _SleepyPlugin("bad", 0.0, success=False)}
+    )
+
+    result = container.executor.execute_plan(
+        _plan(
+            {"type": "plugin", "name": "ok", "payload": "x"},
+            {"type": "plugin", "name": "bad", "payload": "y"},
+            {"type": "plugin", "name": "ok", "payload": "z", "depends_on": [1]},
+        )
+    )
+
+    assert result.status == ResultStatus.PARTIAL
+    assert result.error is not None and result.error.details["failed_steps"] == ["1", "2"]
+    assert result.metadata["steps"][2]["error"] == "UPSTREAM_FAILED"
+    cyclic = container.executor.execute_plan(
+        _plan(
+            {"id": "x", "type": "response", "message": "x", "depends_on": ["y"]},
+            {"id": "y", "type": "response", "message": "y", "depends_on": ["x"]},
+        )
+    )
+    assert cyclic.error is not None and cyclic.error.code == "INVALID_PLAN"
+    container.shutdown()
+
+
+def test_plan_with_duplicate_step_ids_is_rejected() -> None:
+    container = ServiceContainer(AppConfig())
+    plugin = _SleepyPlugin("p", 0.0)
+    container.executor.plugin_registry["p"] = plugin
+
+    result = container.executor.execute_plan(
+        _plan(
+            {"id": "x", "type": "plugin", "name": "p", "payload": "first"},
+            {"id": "x", "type": "plugin", "name": "p", "payload": "second"},
+        )
+    )
+
+    assert result.status == ResultStatus.FAILED
+    assert result.error is not None and result.error.code == "INVALID_PLAN"
+    assert "x" in result.error.message
+    assert plugin.contexts == []
+    container.shutdown()
+
+
+def test_deadline_reports_running_steps_as_in_progress_and_skips_queued_ones() -> None:
+    container = ServiceContainer(AppConfig())
+    container.executor.max_parallel_steps = 1
+    running, queued = _SleepyPlugin("running", 0.3), _SleepyPlugin("queued", 0.0)
+    container.executor.plugin_registry.update({"running": running, "queued": queued})
+
+    result = container.executor.execute_plan(
+        _plan(
+            {"id": "a", "type": "plugin", "name": "running", "payload": "1"},
+            {"id": "b", "type": "plugin", "name": "queued", "payload": "2"},
+        ),
+        deadline=Deadline.after(0.1),
+    )
+
+    steps = {step["id"]: step for step in result.metadata["steps"]}
+    assert (steps["a"]["status"], steps["a"]["error"]) == ("timeout", "STEP_IN_PROGRESS")
+    assert (steps["b"]["status"], steps["b"]["error"]) == ("cancelled", "DEADLINE_EXCEEDED")
+    time.sleep(0.3)
+    assert len(running.contexts) == 1 and queued.contexts == []
+    container.shutdown()
+
+
+def test_compound_command_becomes_one_parallel_plan() -> None:
+    container = ServiceContainer(AppConfig())
+    assistant = container.build_assistant()
+
+    analysis = assistant.analyze("close editor and remind me at 5")
+    response = asyncio.run(assistant.handle_text("close editor and remind me at 5"))
+
+    assert analysis.compiled_plan is not None
+    assert [step["type"] for step in analysis.compiled_plan.steps] == ["system", "plugin"]
+    assert response.metadata["status"] == "success"
+    assert len(response.metadata["steps"]) == 2
+    container.shutdown()
+
+
+def test_reminder_clause_keeps_the_text_after_it() -> None:
+    container = ServiceContainer(AppConfig())
+    assistant = container.build_assistant()
+
+    analysis = assistant.analyze("remind me to open notes and close editor")
+
+    assert analysis.compiled_plan is not None
+    assert analysis.compiled_plan.steps == [
+        {"type": "plugin", "name": "smart_reminders", "payload": "remind me to open notes and close editor"}
+    ]
+    container.shutdown()
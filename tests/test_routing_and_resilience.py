@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from jarvis_assistant.ai.local_models import DEFAULT_LOCAL_MODELS, LocalModelManager, SimulatedLocalBackend
+from jarvis_assistant.cloud.client import CloudResponse
 from jarvis_assistant.cloud.model_router import ModelRouter
+from jarvis_assistant.cloud.semantic_cache import SemanticCache
 from jarvis_assistant.core.config import AppConfig
-from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker
+from jarvis_assistant.infrastructure.circuit_breaker import CircuitBreaker, CircuitPhase
+from jarvis_assistant.infrastructure.deadline import Deadline
+from jarvis_assistant.infrastructure.metrics import MetricsCollector
 
 
 def test_circuit_breaker_fallback_to_local() -> None:
@@ -20,5 +28,389 @@ def test_streaming_response_chunks() -> None:
     config = AppConfig()
     circuit = CircuitBreaker()
     router = ModelRouter(config=config, circuit_breaker=circuit, logger=__import__("logging").getLogger("test"))
-    chunks = asyncio.run(router.stream_generate("hello world", route="local"))
+
+    async def collect() -> list[str]:
+        return [delta async for delta in router.stream_generate("hello world", route="local")]
+
+    chunks = asyncio.run(collect())
     assert len(chunks) >= 2
+    assert "".join(chunks) == "[Local reasoning] hello world"
+
+
+def test_cloud_stream_yields_deltas_incrementally() -> None:
+    config = AppConfig()
+    circuit = CircuitBreaker()
+    router = ModelRouter(config=config, circuit_breaker=circuit, logger=logging.getLogger("test"))
+    prompt = " ".join(f"w{i}" for i in range(200))
+
+    async def run() -> tuple[str, str]:
+        stream = router.stream_generate(prompt, route="cloud")
+        first = await stream.__anext__()
+        rest = "".join([delta async for delta in stream])
+        return first, rest
+
+    first, rest = asyncio.run(run())
+    assert first == "[Cloud:openai]"
+    assert first + rest == f"[Cloud:openai] {prompt}"
+    assert router.cloud_client.total_cost_usd > 0
+
+
+def test_cloud_stream_failure_falls_back_and_trips_circuit() -> None:
+    config = AppConfig()
+    circuit = CircuitBreaker(failure_threshold=1, cooldown_seconds=60)
+    router = ModelRouter(config=config, circuit_breaker=circuit, logger=logging.getLogger("test"))
+
+    async def broken_stream(prompt: str, provider: str):
+        raise RuntimeError("provider down")
+        yield ""  # pragma: no cover
+
+    router.cloud_client._simulate_stream = broken_stream  # type: ignore[method-assign]
+
+    async def collect() -> str:
+        return "".join([delta async for delta in router.stream_generate("hello", route="cloud")])
+
+    assert asyncio.run(collect()) == "[Local reasoning] hello"
+    assert circuit.state().is_open
+
+
+def test_cloud_stream_close_cancels_provider() -> None:
+    config = AppConfig()
+    circuit = CircuitBreaker()
+    client = ModelRouter(config=config, circuit_breaker=circuit, logger=logging.getLogger("test")).cloud_client
+    client.stream_buffer_size = 2
+    produced: list[str] = []
+
+    async def endless(prompt: str, provider: str):
+        while True:
+            produced.append("x")
+            yield "x"
+            await asyncio.sleep(0)
+
+    client._simulate_stream = endless  # type: ignore[method-assign]
+
+    async def run() -> None:
+        stream = client.stream_complete("hi", provider="openai")
+        await stream.__anext__()
+        await asyncio.sleep(0.01)
+        await stream.aclose()
+        count = len(produced)
+        await asyncio.sleep(0.01)
+        assert len(produced) == count
+
+    asyncio.run(run())
+    assert len(produced) <= client.stream_buffer_size + 3
+    assert client.total_cost_usd == 0.0
+
+
+def test_cloud_stream_stops_at_the_deadline_without_tripping_the_circuit() -> None:
+    config = AppConfig(cloud_min_budget_seconds=0.0)
+    circuit = CircuitBreaker(failure_threshold=1, cooldown_seconds=60)
+    router = ModelRouter(config=config, circuit_breaker=circuit, logger=logging.getLogger("test"))
+
+    async def stalls_after(first: list[str], prompt: str, provider: str):
+        for delta in first:
+            yield delta
+        await asyncio.sleep(10)
+        yield "never"  # pragma: no cover
+
+    async def collect(first: list[str]) -> str:
+        router.cloud_client._simulate_stream = lambda p, v: stalls_after(first, p, v)  # type: ignore[method-assign]
+        stream = router.stream_generate("hello", route="cloud", deadline=Deadline.after(0.1))
+        return "".join([delta async for delta in stream])
+
+    assert asyncio.run(collect(["partial"])) == "partial"
+    assert asyncio.run(collect([])) == "[Local reasoning] hello"
+    assert not circuit.state().is_open
+
+
+def test_cloud_stream_is_served_from_the_semantic_cache() -> None:
+    config = AppConfig()
+    cache = SemanticCache(max_entries=8, ttl_seconds=60)
+    router = ModelRouter(
+        config=config, circuit_breaker=CircuitBreaker(), logger=logging.getLogger("test"), semantic_cache=cache
+    )
+
+    async def collect() -> list[list[str]]:
+        return [[delta async for delta in router.stream_generate("hello there", route="cloud")] for _ in range(2)]
+
+    first, second = asyncio.run(collect())
+    assert "".join(first) == "[Cloud:openai] hello there"
+    assert second == ["[Cloud:openai] hello there"]
+    assert router.cloud_client.limiter.remaining() == config.cloud_rate_limit_per_minute - 1
+
+
+def test_concurrent_cloud_generate_uses_one_rate_limit_slot() -> None:
+    config = AppConfig()
+    router = ModelRouter(config=config, circuit_breaker=CircuitBreaker(), logger=logging.getLogger("test"))
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(router.generate("same prompt", route="cloud") for _ in range(5)))
+
+    outputs = asyncio.run(run())
+    assert set(outputs) == {"[Cloud:openai] same prompt"}
+    assert router.cloud_client.limiter.remaining() == config.cloud_rate_limit_per_minute - 1
+
+
+def test_nearly_spent_deadline_uses_local_generation() -> None:
+    config = AppConfig(cloud_min_budget_seconds=1.0)
+    circuit = CircuitBreaker()
+    router = ModelRouter(config=config, circuit_breaker=circuit, logger=logging.getLogger("test"))
+    output = asyncio.run(router.generate("hello", route="cloud", deadline=Deadline.after(0.5)))
+    assert output.startswith("[Local reasoning]")
+    assert router.cloud_client.limiter.remaining() == config.cloud_rate_limit_per_minute
+
+
+def test_budget_timeout_does_not_trip_circuit() -> None:
+    config = AppConfig(cloud_min_budget_seconds=0.0)
+    circuit = CircuitBreaker(failure_threshold=1)
+    router = ModelRouter(config=config, circuit_breaker=circuit, logger=logging.getLogger("test"))
+    output = asyncio.run(router.generate("hello", route="cloud", deadline=Deadline.after(0.01)))
+    assert output.startswith("[Local reasoning]")
+    assert not circuit.state().is_open
+
+
+class _FailingLocalBackend(SimulatedLocalBackend):
+    def generate(self, model: str, prompt: str) -> str:
+        raise RuntimeError("local server down")
+
+
+def _local_models(backend: SimulatedLocalBackend | None = None) -> LocalModelManager:
+    return LocalModelManager(
+        backend or SimulatedLocalBackend(load_seconds_per_gb=0.0, generate_seconds=0.0),
+        DEFAULT_LOCAL_MODELS,
+        tier="small",
+        ram_budget_gb=4.0,
+        logger=logging.getLogger("test"),
+        available_ram=lambda: 64.0,
+    )
+
+
+def _slow_cloud_router(
+    config: AppConfig, delay: float, local_models: LocalModelManager | None = None
+) -> tuple[ModelRouter, MetricsCollector, list[str]]:
+    metrics = MetricsCollector()
+    circuit = CircuitBreaker()
+    router = ModelRouter(
+        config=config,
+        circuit_breaker=circuit,
+        logger=logging.getLogger("test"),
+        metrics=metrics,
+        local_models=local_models or _local_models(),
+    )
+    events: list[str] = []
+
+    async def slow_request(prompt: str, provider: str) -> CloudResponse:
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        return CloudResponse(text=f"[Cloud:{provider}] {prompt}", cost_usd=0.0)
+
+    router.cloud_client._simulate_request = slow_request  # type: ignore[method-assign]
+    return router, metrics, events
+
+
+def test_hedged_generate_returns_local_answer_when_cloud_is_slow() -> None:
+    config = AppConfig(hedge_enabled=True, hedge_delay_seconds=0.01)
+    router, metrics, events = _slow_cloud_router(config, delay=5.0)
+    output = asyncio.run(router.generate("hello", route="cloud", complexity=0.9))
+    counters = metrics.counters()
+    assert output == "[Local:jarvis-small] hello"
+    assert events == ["cancelled"]
+    assert counters["hedge.launched"] == 1
+    assert counters["hedge.wins.local"] == 1
+    assert counters["hedge.wasted.cloud"] == 1
+
+
+def test_hedged_generate_skips_local_when_cloud_answers_within_delay() -> None:
+    config = AppConfig(hedge_enabled=True, hedge_delay_seconds=1.0)
+    router, metrics, _ = _slow_cloud_router(config, delay=0.01)
+    output = asyncio.run(router.generate("hello", route="cloud", complexity=0.9))
+    assert output == "[Cloud:openai] hello"
+    assert "hedge.launched" not in metrics.counters()
+
+
+def test_hedged_generate_starts_local_immediately_for_simple_prompts() -> None:
+    config = AppConfig(hedge_enabled=True, hedge_delay_seconds=5.0, hedge_immediate_complexity=0.3)
+    router, metrics, _ = _slow_cloud_router(config, delay=5.0)
+
+    async def run() -> tuple[str, float]:
+        started = asyncio.get_running_loop().time()
+        output = await router.generate("hi", route="cloud", complexity=0.1)
+        return output, asyncio.get_running_loop().time() - started
+
+    output, elapsed = asyncio.run(run())
+    assert output == "[Local:jarvis-small] hi"
+    assert elapsed < 1.0
+    assert metrics.counters()["hedge.wins.local"] == 1
+
+
+def test_hedge_never_answers_with_the_local_placeholder() -> None:
+    config = AppConfig(hedge_enabled=True, hedge_delay_seconds=0.0)
+    router, metrics, _ = _slow_cloud_router(config, delay=0.05, local_models=_local_models(_FailingLocalBackend()))
+    assert asyncio.run(router.generate("hello", route="cloud", complexity=0.9)) == "[Cloud:openai] hello"
+    assert metrics.counters()["hedge.wins.cloud"] == 1
+
+    router, metrics, _ = _slow_cloud_router(config, delay=0.05)
+    router.local_models = None
+    assert asyncio.run(router.generate("hello", route="cloud", complexity=0.9)) == "[Cloud:openai] hello"
+    assert "hedge.launched" not in metrics.counters()
+
+
+def test_cancelling_before_the_hedge_starts_cancels_the_cloud_call() -> None:
+    config = AppConfig(hedge_enabled=True, hedge_delay_seconds=5.0)
+    router, _, events = _slow_cloud_router(config, delay=5.0)
+
+    async def run() -> list[str]:
+        hedge = asyncio.create_task(router._hedged_generate("hello", None, 0.9, ("hello", "")))
+        await asyncio.sleep(0.02)
+        hedge.cancel()
+        await asyncio.gather(hedge, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return list(events)
+
+    assert asyncio.run(run()) == ["cancelled"]
+
+
+def test_coalesced_generation_never_inherits_a_smaller_budget_or_other_complexity() -> None:
+    config = AppConfig(cloud_min_budget_seconds=0.0)
+    router, _, _ = _slow_cloud_router(config, delay=0.1)
+
+    async def run() -> list[str]:
+        short = asyncio.create_task(router.generate("q", route="cloud", deadline=Deadline.after(0.05), complexity=0.9))
+        await asyncio.sleep(0)
+        calls = [
+            router.generate("q", route="cloud", deadline=Deadline.after(0.03), complexity=0.9),
+            router.generate("q", route="cloud", deadline=Deadline.after(5.0), complexity=0.9),
+            router.generate("q", route="cloud", deadline=Deadline.after(5.0), complexity=0.9),
+            router.generate("q", route="cloud", deadline=Deadline.after(5.0), complexity=0.2),
+        ]
+        tasks = [asyncio.create_task(call) for call in calls]
+        await asyncio.sleep(0.01)
+        assert router._inflight.in_flight() == 2
+        return await asyncio.gather(short, *tasks)
+
+    short, joined, long, long_joined, other = asyncio.run(run())
+    assert short == joined == "[Local:jarvis-small] q"
+    assert long == long_joined == other == "[Cloud:openai] q"
+    assert router.cloud_client.limiter.remaining() == config.cloud_rate_limit_per_minute - 3
+
+
+def test_semantic_cache_serves_paraphrased_prompts_without_cloud_call() -> None:
+    metrics = MetricsCollector()
+    cache = SemanticCache(max_entries=8, ttl_seconds=60, threshold=0.9, metrics=metrics)
+    router = ModelRouter(
+        config=AppConfig(), circuit_breaker=CircuitBreaker(), logger=logging.getLogger("test"), semantic_cache=cache
+    )
+
+    async def run() -> tuple[str, str, str]:
+        first = await router.generate("weather today?", route="cloud")
+        second = await router.generate("today's weather", route="cloud")
+        third = await router.generate("explain classical computing", route="cloud")
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    counters = metrics.counters()
+    assert second == first
+    assert third == "[Cloud:openai] explain classical computing"
+    assert router.cloud_client.limiter.remaining() == router.config.cloud_rate_limit_per_minute - 2
+    assert counters["semantic_cache.hits"] == 1
+    assert counters["semantic_cache.saved_cost_usd"] > 0
+    assert metrics.snapshot()["semantic_cache.lookup"]["count"] == 3
+
+
+def test_semantic_cache_tells_apart_prompts_differing_in_numbers_or_negation() -> None:
+    cache = SemanticCache(max_entries=8, ttl_seconds=60, threshold=0.9)
+    cache.put("what is 2 plus 2", "4", 0.001)
+    cache.put("convert 5 km to miles", "3.1 miles", 0.001)
+    cache.put("should I buy the stock", "yes", 0.001)
+
+    assert cache.get("what is 3 plus 3") is None
+    assert cache.get("convert 9 km to miles") is None
+    assert cache.get("should I not buy the stock") is None
+    assert cache.get("should I buy the stock") == "yes"
+    assert cache.get("what is 2 plus 2?") == "4"
+    assert cache.get("km to miles: convert 5") == "3.1 miles"
+
+
+def test_semantic_cache_tells_apart_prompts_with_swapped_relation_sides() -> None:
+    cache = SemanticCache(max_entries=8, ttl_seconds=60, threshold=0.9)
+    cache.put("convert celsius to fahrenheit", "F = C * 9/5 + 32", 0.001)
+    cache.put("is python faster than java", "usually not", 0.001)
+
+    assert cache.get("convert fahrenheit to celsius") is None
+    assert cache.get("is java faster than python") is None
+    assert cache.get("please convert celsius to fahrenheit") == "F = C * 9/5 + 32"
+    assert cache.get("is python faster than java?") == "usually not"
+
+
+def test_semantic_cache_expires_and_evicts_entries() -> None:
+    cache = SemanticCache(max_entries=1, ttl_seconds=60)
+    cache.put("weather today", "sunny", 0.001)
+    cache.put("explain quantum computing", "qubits", 0.002)
+    assert len(cache) == 1
+    assert cache.get("weather today") is None
+    assert cache.get("explain quantum computing") == "qubits"
+
+    expiring = SemanticCache(max_entries=4, ttl_seconds=0.001)
+    expiring.put("weather today", "sunny", 0.001)
+    time.sleep(0.01)
+    assert expiring.get("weather today") is None
+    assert len(expiring) == 0
+
+
+def test_half_open_circuit_admits_limited_probes_across_threads() -> None:
+    circuit = CircuitBreaker(failure_threshold=1, cooldown_seconds=0.01, half_open_probes=2)
+    circuit.record_failure()
+    assert not circuit.allow_request()
+    time.sleep(0.02)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        admitted = list(pool.map(lambda _: circuit.allow_request(), range(16)))
+
+    assert admitted.count(True) == 2
+    circuit.record_success()
+    assert circuit.state().phase is CircuitPhase.HALF_OPEN
+    circuit.record_success()
+    assert circuit.state().phase is CircuitPhase.CLOSED
+
+
+def test_failed_probe_reopens_circuit() -> None:
+    circuit = CircuitBreaker(failure_threshold=1, cooldown_seconds=0.01)
+    circuit.record_failure()
+    time.sleep(0.02)
+    assert circuit.allow_request()
+    circuit.record_failure()
+    state = circuit.state()
+    assert state.is_open
+    assert state.trip_reason == "probe_failed"
+
+
+def test_circuit_trips_on_error_rate_and_latency() -> None:
+    flaky = CircuitBreaker(failure_threshold=100, error_rate_threshold=0.5, min_window_requests=4)
+    for _ in range(2):
+        flaky.record_success(0.01)
+        flaky.record_failure(0.01)
+    assert flaky.state().trip_reason == "error_rate"
+
+    slow = CircuitBreaker(latency_threshold_seconds=0.1, min_window_requests=3)
+    slow.record_success(0.5)
+    slow.record_success(0.5)
+    assert not slow.state().is_open
+    slow.record_success(0.5)
+    assert slow.state().trip_reason == "latency"
+
+
+def test_router_routes_around_open_provider() -> None:
+    config = AppConfig(cloud_fallback_providers=("anthropic",))
+    circuit = CircuitBreaker(failure_threshold=1, cooldown_seconds=60)
+    router = ModelRouter(config=config, circuit_breaker=circuit, logger=logging.getLogger("test"))
+    circuit.record_failure()
+
+    assert asyncio.run(router.generate("hello", route="cloud")) == "[Cloud:anthropic] hello"
+    assert not router.circuit_state().is_open
+    router.breakers.breaker("anthropic").record_failure()
+    router.breakers.breaker("anthropic").record_failure()
+    router.breakers.breaker("anthropic").record_failure()
+    assert router.circuit_state().is_open